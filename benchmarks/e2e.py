@@ -0,0 +1,182 @@
+"""End-to-end benchmark of `App.start` against a local fake PyPI and python.org.
+
+Every measurement runs in a fresh interpreter so peak RSS and descriptor counts
+are not shared between scenarios::
+
+    python -m benchmarks.e2e --latency 0.02 --jitter 0.01 --repeat 5
+    python -m benchmarks.e2e --update-baseline
+
+The ``cold`` scenario renders with an empty tree cache, ``warm`` with a cache
+already holding the project. Results are compared with the stored baseline and
+the exit code is non-zero on regressions beyond ``--tolerance``. Runs failing
+on injected errors (``--failure-rate``) are timed up to the failure.
+"""
+import argparse
+import asyncio
+import json
+import os
+import pathlib
+import resource
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Dict, List, Tuple
+
+import httpx
+
+from benchmarks.fake_index import FakeIndex
+from vspy.core import App, ProjectSpec
+from vspy.core.api import default_config_path
+from vspy.core.cache import TreeCache
+from vspy.core.clients import AsyncClient
+
+BASELINE = pathlib.Path(__file__).parent.joinpath("baselines", "e2e.json")
+SCENARIOS = ("cold", "warm")
+_COMPARED = ("wall_time", "peak_rss_kb", "peak_fds", "requests")
+
+
+def _open_fds() -> int:
+    try:
+        return len(os.listdir("/proc/self/fd"))
+    except FileNotFoundError:
+        return -1
+
+
+async def _sample_fds(peak: List[int]) -> None:
+    while True:
+        peak[0] = max(peak[0], _open_fds())
+        await asyncio.sleep(0.001)
+
+
+async def _generate(
+    index: FakeIndex, cache: TreeCache, target: pathlib.Path
+) -> Tuple[float, bool]:
+    start = time.perf_counter()
+    try:
+        async with AsyncClient(index.transport()) as client:
+            app = App(
+                ProjectSpec("bench", target=str(target)),
+                default_config_path(),
+                client=client,
+                cache=cache,
+            )
+            await app.start()
+    except (httpx.HTTPError, RuntimeError):
+        # An injected failure; closing the client with sibling requests still
+        # in flight raises a RuntimeError from the connection pool instead.
+        return time.perf_counter() - start, True
+    return time.perf_counter() - start, False
+
+
+async def _measure(args: argparse.Namespace) -> Dict[str, float]:
+    root = pathlib.Path(args.workdir)
+    cache = TreeCache(root.joinpath("cache"))
+    with FakeIndex(args.latency, args.jitter, args.failure_rate) as index:
+        if args.child == "warm":
+            warmup = root.joinpath("warmup")
+            warmup.mkdir()
+            await _generate(index, cache, warmup)
+            index.requests.clear()
+        target = root.joinpath("target")
+        target.mkdir()
+        peak = [_open_fds()]
+        sampler = asyncio.ensure_future(_sample_fds(peak))
+        try:
+            wall_time, failed = await _generate(index, cache, target)
+        finally:
+            sampler.cancel()
+        return {
+            "wall_time": wall_time,
+            "peak_rss_kb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+            "peak_fds": peak[0],
+            "requests": sum(index.requests.values()),
+            "failed": float(failed),
+        }
+
+
+def _run_child(scenario: str, args: argparse.Namespace) -> Dict[str, float]:
+    with tempfile.TemporaryDirectory() as workdir:
+        out = subprocess.run(
+            [
+                sys.executable,
+                "-m",
+                "benchmarks.e2e",
+                "--child",
+                scenario,
+                "--workdir",
+                workdir,
+                "--latency",
+                str(args.latency),
+                "--jitter",
+                str(args.jitter),
+                "--failure-rate",
+                str(args.failure_rate),
+            ],
+            check=True,
+            stdout=subprocess.PIPE,
+        )
+        return json.loads(out.stdout)
+
+
+def _compare(results: Dict[str, Dict[str, float]], tolerance: float) -> List[str]:
+    if not BASELINE.exists():
+        return []
+    baseline = json.loads(BASELINE.read_text(encoding="utf-8"))
+    regressions = []
+    for scenario, values in results.items():
+        for key in _COMPARED:
+            base = baseline.get(scenario, {}).get(key)
+            if base and values[key] > base * (1 + tolerance):
+                regressions.append(
+                    f"{scenario}.{key}: {values[key]:.4g} > baseline {base:.4g}"
+                )
+    return regressions
+
+
+def _parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--jitter", type=float, default=0.0)
+    parser.add_argument("--failure-rate", type=float, default=0.0)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--tolerance", type=float, default=0.5)
+    parser.add_argument("--update-baseline", action="store_true")
+    parser.add_argument("--child", choices=SCENARIOS, help=argparse.SUPPRESS)
+    parser.add_argument("--workdir", help=argparse.SUPPRESS)
+    return parser
+
+
+def main() -> None:
+    args = _parser().parse_args()
+    if args.child:
+        print(json.dumps(asyncio.run(_measure(args))))
+        return
+    results = {}
+    for scenario in SCENARIOS:
+        runs = [_run_child(scenario, args) for _ in range(args.repeat)]
+        results[scenario] = {
+            key: statistics.median(run[key] for run in runs) for key in _COMPARED
+        }
+        failed = sum(run["failed"] for run in runs)
+        print(
+            f"{scenario:>5}: {results[scenario]['wall_time'] * 1e3:8.1f} ms  "
+            f"rss {results[scenario]['peak_rss_kb'] / 1024:6.1f} MiB  "
+            f"fds {results[scenario]['peak_fds']:4.0f}  "
+            f"requests {results[scenario]['requests']:3.0f}"
+            + (f"  failed {failed:.0f}/{len(runs)}" if failed else "")
+        )
+    if args.update_baseline:
+        BASELINE.write_text(
+            json.dumps(results, indent=2, sort_keys=True) + "\n", encoding="utf-8"
+        )
+        return
+    regressions = _compare(results, args.tolerance)
+    for regression in regressions:
+        print(f"regression {regression}")
+    sys.exit(1 if regressions else 0)
+
+
+if __name__ == "__main__":
+    main()
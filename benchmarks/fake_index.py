@@ -0,0 +1,176 @@
+"""Local stand-in for PyPI and python.org with latency and failure injection."""
+import asyncio
+import json
+import random
+import threading
+from collections import Counter
+from typing import Optional, Set
+
+import httpx
+
+_PY_VERSIONS = ("3.12", "3.11", "3.10", "3.9", "3.8", "2.7")
+
+
+def pypi_json(package: str, releases: int = 150) -> bytes:
+    """A PyPI json response of realistic size for `package`."""
+    versions = [f"{major}.{minor}.0" for major in range(1, 16) for minor in range(10)]
+    versions = versions[:releases]
+    return json.dumps(
+        {
+            "info": {
+                "name": package,
+                "version": versions[-1],
+                "summary": f"The {package} package",
+                "description": "lorem ipsum dolor sit amet " * 400,
+                "classifiers": [
+                    f"Programming Language :: Python :: {v}" for v in _PY_VERSIONS
+                ],
+                "requires_dist": [f"dependency-{i}>=1.0" for i in range(10)],
+            },
+            "releases": {
+                version: [
+                    {
+                        "filename": f"{package}-{version}-py3-none-any.whl",
+                        "digests": {"sha256": "0" * 64},
+                        "size": 123456,
+                        "upload_time": "2022-01-01T00:00:00",
+                    }
+                ]
+                for version in versions
+            },
+        }
+    ).encode("utf-8")
+
+
+def python_downloads_html() -> bytes:
+    """A python.org downloads page with the active release widget."""
+    rows = "".join(
+        f'<li><span class="release-version">{version}</span>'
+        '<span class="release-status">security</span>'
+        '<span class="release-start">2020-10-05</span>'
+        '<span class="release-end">2025-10</span></li>'
+        for version in _PY_VERSIONS
+    )
+    padding = "<div class='filler'><p>" + "release notes " * 20 + "</p></div>"
+    return (
+        "<html><body>"
+        + padding * 300
+        + '<div class="row active-release-list-widget">'
+        + '<ol class="list-row-container menu">'
+        + rows
+        + "</ol></div>"
+        + padding * 300
+        + "</body></html>"
+    ).encode("utf-8")
+
+
+class FakeIndex:
+    """Serves PyPI json and the python.org downloads page on a local port.
+
+    Runs its own event loop in a daemon thread so it does not compete with
+    the measured loop. Every response is delayed by `latency` plus a uniform
+    `jitter`, and fails with a 503 with probability `failure_rate`.
+    """
+
+    def __init__(
+        self,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        failure_rate: float = 0.0,
+        seed: int = 0,
+    ) -> None:
+        self.latency = latency
+        self.jitter = jitter
+        self.failure_rate = failure_rate
+        self.requests: "Counter[str]" = Counter()
+        self.port = 0
+        self._random = random.Random(seed)
+        self._html = python_downloads_html()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._ready = threading.Event()
+        self._writers: Set[asyncio.StreamWriter] = set()
+
+    def __enter__(self) -> "FakeIndex":
+        self._thread = threading.Thread(target=self._serve, daemon=True)
+        self._thread.start()
+        self._ready.wait()
+        return self
+
+    def __exit__(self, *_: object) -> None:
+        assert self._loop is not None
+        asyncio.run_coroutine_threadsafe(self._shutdown(), self._loop).result()
+        self._thread.join()
+
+    def transport(self) -> httpx.AsyncBaseTransport:
+        """A transport sending every request to this server instead."""
+        return _RedirectTransport(self.port)
+
+    def _serve(self) -> None:
+        self._loop = asyncio.new_event_loop()
+        self._server = self._loop.run_until_complete(
+            asyncio.start_server(self._handle, "127.0.0.1", 0)
+        )
+        self.port = self._server.sockets[0].getsockname()[1]
+        self._ready.set()
+        self._loop.run_forever()
+        self._loop.close()
+
+    async def _shutdown(self) -> None:
+        self._server.close()
+        for writer in self._writers:
+            writer.close()
+        handlers = [
+            task for task in asyncio.all_tasks() if task is not asyncio.current_task()
+        ]
+        await asyncio.gather(*handlers, return_exceptions=True)
+        asyncio.get_running_loop().call_soon(asyncio.get_running_loop().stop)
+
+    async def _handle(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        self._writers.add(writer)
+        try:
+            while True:
+                request = await reader.readline()
+                if not request:
+                    break
+                while (await reader.readline()).strip():
+                    pass
+                path = request.split()[1].decode("utf-8")
+                self.requests[path] += 1
+                await asyncio.sleep(self.latency + self._random.uniform(0, self.jitter))
+                status, body, kind = self._respond(path)
+                writer.write(
+                    f"HTTP/1.1 {status}\r\nContent-Type: {kind}\r\n"
+                    f"Content-Length: {len(body)}\r\n\r\n".encode("utf-8") + body
+                )
+                await writer.drain()
+        except ConnectionError:
+            pass  # The client gave up on the connection, e.g. after a failure.
+        finally:
+            self._writers.discard(writer)
+            writer.close()
+
+    def _respond(self, path: str):
+        if self._random.random() < self.failure_rate:
+            return "503 Service Unavailable", b"unavailable", "text/plain"
+        if path.startswith("/pypi/") and path.endswith("/json"):
+            return "200 OK", pypi_json(path.split("/")[2]), "application/json"
+        if path == "/downloads/":
+            return "200 OK", self._html, "text/html"
+        return "404 Not Found", b"not found", "text/plain"
+
+
+class _RedirectTransport(httpx.AsyncBaseTransport):
+    def __init__(self, port: int) -> None:
+        self._port = port
+        self._inner = httpx.AsyncHTTPTransport()
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        request.url = request.url.copy_with(
+            scheme="http", host="127.0.0.1", port=self._port
+        )
+        return await self._inner.handle_async_request(request)
+
+    async def aclose(self) -> None:
+        await self._inner.aclose()
@@ -0,0 +1,66 @@
+"""Memory held by the resolved jobs of a pack, before and after `JobTable`.
+
+Run with ``python -m benchmarks.job_table [jobs]``.
+"""
+import pathlib
+import sys
+import tracemalloc
+from typing import Callable, List
+
+from vspy.core.file_io import FileWriteJob
+from vspy.core.resources import path_from_root
+from vspy.core.table import JobTable
+
+_TARGET = pathlib.Path("/tmp/monorepo")
+
+
+def _rows(jobs: int) -> List[tuple]:
+    return [
+        (
+            f"vspy/resources/templates/==template{i % 14}==",
+            f"packages/pkg{i // 20}/src/pkg{i // 20}/module{i % 20}.py",
+            i % 2 == 0,
+            None,
+        )
+        for i in range(jobs)
+    ]
+
+
+def _objects(rows: List[tuple]) -> object:
+    """Jobs as `FileWriteJob`s next to the json jobs of a render context."""
+    jobs = [
+        FileWriteJob(path_from_root(src), _TARGET.joinpath(dst), is_template)
+        for src, dst, is_template, _ in rows
+    ]
+    context = [
+        {"src": src, "dst": dst, "is_template": is_template}
+        for src, dst, is_template, _ in rows
+    ]
+    return jobs, context
+
+
+def _table(rows: List[tuple]) -> object:
+    return JobTable(rows)
+
+
+def _measure(build: Callable[[List[tuple]], object], rows: List[tuple]) -> int:
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    kept = build(rows)
+    size = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    del kept
+    return size
+
+
+def main(jobs: int) -> None:
+    rows = _rows(jobs)
+    objects = _measure(_objects, rows)
+    table = _measure(_table, rows)
+    print(f" objects: {objects / 2**20:8.2f} MiB for {jobs} jobs")
+    print(f"   table: {table / 2**20:8.2f} MiB for {jobs} jobs")
+    print(f"   ratio: {objects / table:.1f}x")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
@@ -0,0 +1,280 @@
+"""Micro-benchmarks of the template, I/O and argument hot paths.
+
+Every stage runs against synthetic template packs, a config of `size` jobs
+cycling through the packaged resources, to show how it scales with the size
+of the pack::
+
+    python -m benchmarks.micro
+    python -m benchmarks.micro --sizes 27,1000 --filter template --json out.json
+
+The default sizes go up to 100k jobs, which takes the better part of an hour
+with three repeats; pass smaller `--sizes` for a quick look.
+"""
+import argparse
+import asyncio
+import json
+import pathlib
+import statistics
+import tempfile
+import time
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, Awaitable, Callable, Dict, List, Optional
+
+from vspy.core import discovery
+from vspy.core.args import Arguments
+from vspy.core.file_io import (
+    FileWriteJob,
+    process_file_write_job,
+    process_file_write_stream,
+    read_file,
+    read_json_file,
+    template_from_string,
+)
+from vspy.core.project import VersionContext
+from vspy.core.resources import path_from_root
+from vspy.core.writers import DURABILITY, WRITERS, ThreadWriter, writing
+
+if TYPE_CHECKING:
+    from vspy.core.type_hints import TemplateArgs
+
+SIZES = (27, 1_000, 10_000, 100_000)
+
+_ARGS: "TemplateArgs" = {
+    "name": "bench",
+    "description": "A benchmark project",
+    "repository": "https://example.com/bench",
+    "author": "Bench",
+    "email": "bench@example.com",
+    "keywords": "a b c",
+    "dependencies": {"pytest": "7.1.3", "mypy": "0.971", "black": "22.8.0"},
+    "py_versions": ["3.7", "3.8", "3.9", "3.10"],
+}
+_ARGV = ["-n", "bench", "--skip", "--description", "x", "--keywords", "a,b,c"]
+
+
+class Pack:
+    """A synthetic template pack of `size` jobs in `root`."""
+
+    def __init__(self, root: pathlib.Path, size: int) -> None:
+        self.root = root
+        self.size = size
+        self.config = root.joinpath("data.json")
+        resources = [
+            (path, folder == "templates")
+            for folder in ("static", "templates")
+            for path in sorted(path_from_root("vspy", "resources", folder).iterdir())
+        ]
+        cycle = [resources[i % len(resources)] for i in range(size)]
+        self.jobs = [
+            FileWriteJob(source, pathlib.Path(f"{i // 1000}/{i}"), is_template)
+            for i, (source, is_template) in enumerate(cycle)
+        ]
+        entries = [
+            {
+                "src": job.source.as_posix(),
+                "dst": job.destination.as_posix(),
+                "is_template": job.is_template,
+                "path_is_template": False,
+            }
+            for job in self.jobs
+        ]
+        self.config.write_text(
+            json.dumps({"dev-dependencies": ["pytest"], "jobs": entries}),
+            encoding="utf-8",
+        )
+        self.sources: Dict[pathlib.Path, str] = {}
+        self.versions = [f"{i % 4}.{i * 7 % 13}.{i * 31 % 101}" for i in range(size)]
+
+    async def load_sources(self) -> None:
+        """Read every distinct source once, so rendering is timed alone."""
+        for job in self.jobs:
+            if job.source not in self.sources:
+                self.sources[job.source] = await read_file(job.source)
+
+    @property
+    def tree(self) -> pathlib.Path:
+        """A directory tree of `size` files, 100 to a folder."""
+        return self.root.joinpath("tree")
+
+    @property
+    def index_dir(self) -> pathlib.Path:
+        """Where tree indexes of the pack are kept."""
+        return self.root.joinpath("index")
+
+    def output(self, name: str) -> List[FileWriteJob]:
+        """The jobs with destinations in a fresh output folder `name`."""
+        out = self.root.joinpath(name)
+        out.mkdir()
+        return [
+            FileWriteJob(job.source, out.joinpath(job.destination), job.is_template)
+            for job in self.jobs
+        ]
+
+
+async def _template_from_string(pack: Pack) -> int:
+    templates = [pack.sources[job.source] for job in pack.jobs if job.is_template]
+    for source in templates:
+        await template_from_string(source, _ARGS)
+    return len(templates)
+
+
+async def _process_stream(jobs: List[FileWriteJob]) -> int:
+    await process_file_write_stream(jobs, args=_ARGS)
+    return len(jobs)
+
+
+async def _process_static(pack: Pack) -> int:
+    return await _process_stream(
+        [job for job in pack.output("static") if not job.is_template]
+    )
+
+
+async def _process_template(pack: Pack) -> int:
+    return await _process_stream(
+        [job for job in pack.output("template") if job.is_template]
+    )
+
+
+def _written_with(backend: str) -> Callable[[Pack], Awaitable[int]]:
+    async def _run(pack: Pack) -> int:
+        with writing(WRITERS[backend]()):
+            return await _process_stream(pack.output(f"write-{backend}"))
+
+    return _run
+
+
+def _durable(durability: str) -> Callable[[Pack], Awaitable[int]]:
+    async def _run(pack: Pack) -> int:
+        jobs = [
+            job for job in pack.output(f"durable-{durability}") if not job.is_template
+        ]
+        with writing(ThreadWriter(durability)):
+            await _process_stream(jobs)
+        return len(jobs)
+
+    return _run
+
+
+async def _process_single(pack: Pack) -> int:
+    jobs = pack.output("single")
+    for job in jobs:
+        await process_file_write_job(job, _ARGS)
+    return len(jobs)
+
+
+async def _read_json_file(pack: Pack) -> int:
+    await read_json_file(pack.config)
+    return pack.size
+
+
+async def _version_comparator(pack: Pack) -> int:
+    sorted(pack.versions, key=VersionContext._version_comparator)
+    return len(pack.versions)
+
+
+async def _make_tree(pack: Pack) -> None:
+    for i in range(pack.size):
+        folder = pack.tree.joinpath(str(i // 100))
+        folder.mkdir(parents=True, exist_ok=True)
+        folder.joinpath(str(i)).touch()
+    discovery.clear()
+
+
+async def _index_tree(pack: Pack) -> None:
+    await _make_tree(pack)
+    await discovery.discover(pack.tree, pack.index_dir)
+    discovery.clear()
+
+
+async def _discover(pack: Pack) -> int:
+    return len(await discovery.discover(pack.tree, pack.index_dir))
+
+
+async def _arguments_parse(_pack: Pack) -> int:
+    for _ in range(1000):
+        Arguments.parse(_ARGV)
+    return 1000
+
+
+@dataclass
+class Benchmark:
+    """A timed stage, `run` returns how many items it processed."""
+
+    name: str
+    run: Callable[[Pack], Awaitable[int]]
+    scaled: bool = True
+    setup: Optional[Callable[[Pack], Awaitable[None]]] = None
+
+
+BENCHMARKS = (
+    Benchmark("template_from_string", _template_from_string),
+    Benchmark("process_job.static", _process_static),
+    Benchmark("process_job.template", _process_template),
+    Benchmark("process_job.sequential", _process_single),
+    *(Benchmark(f"write.{backend}", _written_with(backend)) for backend in WRITERS),
+    *(Benchmark(f"durability.{mode}", _durable(mode)) for mode in DURABILITY),
+    Benchmark("read_json_file", _read_json_file),
+    Benchmark("version_comparator", _version_comparator),
+    Benchmark("discover.scan", _discover, setup=_make_tree),
+    Benchmark("discover.index", _discover, setup=_index_tree),
+    Benchmark("Arguments.parse", _arguments_parse, scaled=False),
+)
+
+
+async def _time(benchmark: Benchmark, size: int, repeat: int) -> Dict[str, Any]:
+    timings, items = [], 0
+    for _ in range(repeat):
+        with tempfile.TemporaryDirectory() as root:
+            pack = Pack(pathlib.Path(root), size)
+            await pack.load_sources()
+            if benchmark.setup is not None:
+                await benchmark.setup(pack)
+            start = time.perf_counter()
+            items = await benchmark.run(pack)
+            timings.append(time.perf_counter() - start)
+    median = statistics.median(timings)
+    return {
+        "benchmark": benchmark.name,
+        "size": size,
+        "items": items,
+        "seconds": median,
+        "us_per_item": median / max(items, 1) * 1e6,
+    }
+
+
+async def run(
+    sizes: List[int], repeat: int = 3, pattern: Optional[str] = None
+) -> List[Dict[str, Any]]:
+    """Time every benchmark matching `pattern` for each pack size."""
+    results = []
+    for benchmark in BENCHMARKS:
+        if pattern and pattern not in benchmark.name:
+            continue
+        for size in sizes if benchmark.scaled else sizes[:1]:
+            result = await _time(benchmark, size, repeat)
+            print(
+                f"{result['benchmark']:<24} {size:>7} jobs "
+                f"{result['seconds'] * 1e3:>10.2f} ms "
+                f"{result['us_per_item']:>10.2f} us/item"
+            )
+            results.append(result)
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", default=",".join(map(str, SIZES)))
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--filter", help="Only run benchmarks containing this.")
+    parser.add_argument("--json", help="Write the results to this file.")
+    args = parser.parse_args()
+    sizes = [int(size) for size in args.sizes.split(",")]
+    results = asyncio.run(run(sizes, args.repeat, args.filter))
+    if args.json:
+        pathlib.Path(args.json).write_text(
+            json.dumps(results, indent=2) + "\n", encoding="utf-8"
+        )
+
+
+if __name__ == "__main__":
+    main()
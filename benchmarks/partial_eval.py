@@ -0,0 +1,65 @@
+"""Compare full and partially evaluated rendering of the packaged templates.
+
+Run with ``python -m benchmarks.partial_eval [projects]``.
+"""
+import asyncio
+import sys
+import time
+from typing import List
+
+from vspy.core.file_io import FileWriteJob, read_file, template_from_string
+from vspy.core.partial import PartialRenderer
+from vspy.core.resources import path_from_root
+
+_SHARED = {
+    "dependencies": {
+        "pytest": "7.1.3",
+        "pytest-timeout": "2.1.0",
+        "pylint": "2.15.2",
+        "flake8": "5.0.4",
+        "flake8-isort": "4.2.0",
+        "flake8-bugbear": "22.8.23",
+        "mypy": "0.971",
+        "black": "22.8.0",
+        "tox": "3.26.0",
+    },
+    "py_versions": ["3.7", "3.8", "3.9", "3.10"],
+}
+_FIELDS = ("author", "description", "email", "keywords", "name", "repository")
+
+
+def _project(i: int) -> dict:
+    return {field: f"{field}{i}" for field in _FIELDS}
+
+
+async def _full(jobs: List[FileWriteJob], projects: int) -> None:
+    for i in range(projects):
+        args = {**_SHARED, **_project(i)}
+        for job in jobs:
+            await template_from_string(await read_file(job.source), args)
+
+
+async def _partial(jobs: List[FileWriteJob], projects: int) -> None:
+    renderer = PartialRenderer(_SHARED, _FIELDS)
+    for i in range(projects):
+        args = {**_SHARED, **_project(i)}
+        for job in jobs:
+            await renderer.render(job, args)
+
+
+async def _main(projects: int) -> None:
+    jobs = [
+        FileWriteJob(path, path, True)
+        for path in sorted(path_from_root("vspy", "resources", "templates").iterdir())
+    ]
+    timings = {}
+    for name, run in (("full", _full), ("partial", _partial)):
+        start = time.perf_counter()
+        await run(jobs, projects)
+        timings[name] = time.perf_counter() - start
+        print(f"{name:>8}: {timings[name]:.3f}s for {projects} projects")
+    print(f" speedup: {timings['full'] / timings['partial']:.1f}x")
+
+
+if __name__ == "__main__":
+    asyncio.run(_main(int(sys.argv[1]) if len(sys.argv) > 1 else 1000))
@@ -0,0 +1,93 @@
+"""Build vspy and its dependencies into a single self-contained zipapp.
+
+    python scripts/build_zipapp.py [--output dist/vspy.pyz]
+
+The archive bundles the pure python dependencies, byte-compiled, along with
+the template pack compiled to python modules, so neither site-packages
+nor jinja2's compiler are touched at startup. Run it isolated from the
+environment with ``python -I -S dist/vspy.pyz``.
+"""
+import argparse
+import compileall
+import pathlib
+import shutil
+import subprocess
+import sys
+import tempfile
+import zipapp
+
+_ROOT = pathlib.Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(_ROOT))
+
+from vspy.core import precompiled  # noqa: E402 pylint: disable=wrong-import-position
+
+_INTERPRETER = "/usr/bin/env python3"
+
+
+def _install_dependencies(staging: pathlib.Path) -> None:
+    subprocess.run(
+        [
+            sys.executable,
+            "-m",
+            "pip",
+            "install",
+            "--quiet",
+            "--no-compile",
+            "--target",
+            str(staging),
+            "--requirement",
+            str(_ROOT.joinpath("requirements.txt")),
+        ],
+        check=True,
+    )
+    for extension in (*staging.rglob("*.so"), *staging.rglob("*.pyd")):
+        # Extension modules can not be imported from a zip archive, every
+        # dependency used by vspy has a pure python fallback.
+        extension.unlink()
+    for metadata in staging.glob("*.dist-info"):
+        shutil.rmtree(metadata)
+    shutil.rmtree(staging.joinpath("bin"), ignore_errors=True)
+
+
+def _copy_vspy(staging: pathlib.Path) -> None:
+    shutil.copytree(
+        _ROOT.joinpath("vspy"),
+        staging.joinpath("vspy"),
+        ignore=shutil.ignore_patterns("__pycache__", "*.pyc"),
+    )
+    precompiled.compile_pack(
+        _ROOT,
+        _ROOT.joinpath("vspy", "resources", "data.json"),
+        staging.joinpath(*precompiled.PACKAGE.split(".")),
+    )
+
+
+def build(output: pathlib.Path, interpreter: str = _INTERPRETER) -> pathlib.Path:
+    """Build the zipapp at `output`."""
+    with tempfile.TemporaryDirectory() as tmp:
+        staging = pathlib.Path(tmp)
+        _install_dependencies(staging)
+        _copy_vspy(staging)
+        # zipimport only picks up byte code stored next to the source.
+        compileall.compile_dir(str(staging), quiet=1, legacy=True)
+        output.parent.mkdir(parents=True, exist_ok=True)
+        zipapp.create_archive(
+            staging,
+            output,
+            interpreter=interpreter,
+            main="vspy.main:main",
+            compressed=True,
+        )
+    return output
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--output", default=str(_ROOT.joinpath("dist", "vspy.pyz")))
+    parser.add_argument("--interpreter", default=_INTERPRETER)
+    args = parser.parse_args()
+    print(build(pathlib.Path(args.output), args.interpreter))
+
+
+if __name__ == "__main__":
+    main()
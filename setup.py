@@ -3,6 +3,9 @@ import os
 import sys
 
 from setuptools import find_packages, setup
+from setuptools.command.build_py import build_py
+
+_ROOT = os.path.dirname(os.path.abspath(__file__))
 
 _MIN_PY_VERSION = (3, 7)
 
@@ -26,6 +29,30 @@ def check_min_py_version():
         )
 
 
+class BuildPyWithTemplates(build_py):
+    """Precompile the template pack into the vspy._compiled package."""
+
+    def run(self):
+        super().run()
+        if self.dry_run:
+            return
+        try:
+            import pathlib
+
+            sys.path.insert(0, _ROOT)
+            from vspy.core import precompiled
+        except ImportError as exc:
+            # vspy falls back to compiling the templates at runtime.
+            print(f"Skipping template precompilation: {exc}")
+            return
+        root = pathlib.Path(_ROOT)
+        precompiled.compile_pack(
+            root,
+            root.joinpath("vspy", "resources", "data.json"),
+            pathlib.Path(self.build_lib, *precompiled.PACKAGE.split(".")),
+        )
+
+
 def main():
     check_min_py_version()
     setup(
@@ -47,6 +74,7 @@ def main():
         long_description_content_type="text/x-rst",
         long_description=read("README.rst"),
         install_requires=read("requirements.txt").splitlines(),
+        extras_require={"zst": ["zstandard"]},
         python_requires=">=3.7",
         classifiers=[
             "Programming Language :: Python :: 3",
@@ -59,6 +87,7 @@ def main():
             "Development Status :: 3 - Alpha",
         ],
         entry_points={"console_scripts": ["vspy=vspy.main:main"]},
+        cmdclass={"build_py": BuildPyWithTemplates},
     )
 
 
@@ -0,0 +1,125 @@
+import asyncio
+import json
+import pathlib
+
+import pytest
+from pytest_httpx import HTTPXMock
+
+from tests.testutils.helpers import TempFile, mock_urls
+from vspy.core import (
+    ProjectSpec,
+    VersionContext,
+    generate,
+    generate_batch,
+    generate_in_memory,
+    resolve_context,
+)
+from vspy.core.clients import AsyncClient
+from vspy.core.file_io import read_file
+
+
+@pytest.mark.asyncio
+async def test_resolve_context(httpx_mock: HTTPXMock):
+    version_map = await mock_urls(httpx_mock)
+    async with AsyncClient() as client:
+        context = await resolve_context(client=client)
+    assert context.dependencies == version_map
+    assert tuple(context.py_versions) == ("3.7", "3.8", "3.9", "3.10")
+
+
+@pytest.mark.asyncio
+async def test_generations_share_requests(httpx_mock: HTTPXMock):
+    await mock_urls(httpx_mock)
+    with TempFile(0) as (dir_, _):
+        root = pathlib.Path(dir_)
+        await asyncio.gather(
+            *(
+                generate(ProjectSpec(f"proj{i}"), root.joinpath(f"proj{i}"))
+                for i in (1, 2)
+            )
+        )
+    urls = [str(request.url) for request in httpx_mock.get_requests()]
+    assert sorted(urls) == sorted(set(urls))
+
+
+@pytest.mark.asyncio
+async def test_generate_concurrently_with_context():
+    context = VersionContext({"tox": "1.2.3"}, ["3.8", "3.9"])
+    with TempFile(0) as (dir_, _):
+        root = pathlib.Path(dir_)
+        targets = await asyncio.gather(
+            *(
+                generate(
+                    ProjectSpec(f"proj{i}"), root.joinpath(f"proj{i}"), context=context
+                )
+                for i in range(3)
+            )
+        )
+        for i, target in enumerate(targets):
+            assert target.joinpath(f"proj{i}", "__init__.py").is_file()
+            tox = await read_file(target.joinpath("tox.ini"))
+            assert tox.startswith("[tox]\nminversion = 1.2.3\n")
+            assert f"pylint proj{i}\n" in tox
+
+
+@pytest.mark.asyncio
+async def test_generate_in_memory_matches_disk():
+    context = VersionContext({"tox": "1.2.3"}, ["3.8", "3.9"])
+    with TempFile(0) as (dir_, _):
+        spec = ProjectSpec("proj", str(pathlib.Path(dir_, "mem")))
+        tree = await generate_in_memory(spec, context=context)
+        assert not pathlib.Path(dir_, "mem").exists()
+        target = await generate(spec, pathlib.Path(dir_, "disk"), context=context)
+        on_disk = {
+            path.relative_to(target).as_posix(): path.read_bytes()
+            for path in target.rglob("*")
+            if path.is_file()
+        }
+    assert {
+        path: data.replace(b"\r\n", b"\n") for path, data in on_disk.items()
+    } == dict(tree)
+    assert tree.text("tox.ini").startswith("[tox]\nminversion = 1.2.3\n")
+
+
+@pytest.mark.asyncio
+async def test_generate_nonempty_target():
+    with TempFile(1) as (dir_, _):
+        with pytest.raises(ValueError):
+            await generate(ProjectSpec("proj"), dir_, context=VersionContext({}, []))
+
+
+@pytest.mark.asyncio
+async def test_generate_fan_out():
+    context = VersionContext({}, [])
+    with TempFile(2) as (dir_, (src, config)):
+        src.write_text('"""{{ pkg }} of {{ name }}."""\n')
+        job = {"src": str(src), "is_template": True, "path_is_template": True}
+        fan_out = {"over": "packages", "as": "pkg"}
+        config.write_text(
+            json.dumps(
+                {
+                    "dev-dependencies": [],
+                    "jobs": [
+                        {**job, "dst": "{{name}}.py"},
+                        {**job, "dst": "src/{{pkg}}/__init__.py", "fan_out": fan_out},
+                    ],
+                }
+            )
+        )
+        specs = [ProjectSpec(f"mono{i}", packages=("a", "b")) for i in range(2)]
+        targets = await generate_batch(
+            specs, pathlib.Path(dir_, "out"), context=context, config_path=config
+        )
+        for i, target in enumerate(targets):
+            assert sorted(
+                path.relative_to(target).as_posix() for path in target.rglob("*.py")
+            ) == [f"mono{i}.py", "src/a/__init__.py", "src/b/__init__.py"]
+            init = await read_file(target.joinpath("src", "b", "__init__.py"))
+            assert init == f'"""b of mono{i}."""\n'
+
+
+def test_project_spec_invalid_name():
+    with pytest.raises(ValueError):
+        ProjectSpec("a/b")
+    with pytest.raises(ValueError):
+        ProjectSpec("a", packages=("b/c",))
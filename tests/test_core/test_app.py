@@ -8,7 +8,8 @@ from pytest_httpx import HTTPXMock
 from tests.testutils.helpers import TempFile, compare_against_static, mock_urls
 from tests.testutils.mocks import MockArguments
 from vspy.core import App
-from vspy.core.file_io import path_from_root, read_file
+from vspy.core.file_io import read_file
+from vspy.core.resources import path_from_root
 from vspy.core.utils import is_empty_folder
 
 
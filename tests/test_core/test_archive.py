@@ -0,0 +1,93 @@
+import io
+import pathlib
+import sys
+import tarfile
+import zipfile
+
+import pytest
+
+from tests.testutils.helpers import TempFile
+from vspy.core.archive import ArchiveWriter
+from vspy.core.file_io import FileWriteJob, process_file_write_stream
+from vspy.core.writers import writing
+
+
+def _members(archive_format: str, data: bytes) -> dict:
+    if archive_format == "zip":
+        with zipfile.ZipFile(io.BytesIO(data)) as archive:
+            return {name: archive.read(name) for name in archive.namelist()}
+    with tarfile.open(fileobj=io.BytesIO(data)) as tar:
+        return {m.name: tar.extractfile(m).read() for m in tar.getmembers()}
+
+
+async def _generate(src: pathlib.Path, root: pathlib.Path, order: range) -> None:
+    jobs = [
+        FileWriteJob(src, root.joinpath("pkg", f"{i}.py"), True, {"i": str(i)})
+        for i in order
+    ]
+    await process_file_write_stream(jobs, args={"name": "x"})
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("archive_format", ["tar", "zip"])
+async def test_archive_is_deterministic(archive_format):
+    with TempFile(1) as (dir_, (src,)):
+        src.write_text("{{ name }} {{ i }}\n")
+        root = pathlib.Path(dir_, "proj")
+        outputs = []
+        for order in (range(20), range(19, -1, -1)):
+            output = pathlib.Path(dir_, f"{len(outputs)}.{archive_format}")
+            with writing(ArchiveWriter(root, str(output), archive_format)):
+                await _generate(src, root, order)
+            outputs.append(output.read_bytes())
+        assert not root.exists()
+    assert outputs[0] == outputs[1]
+    members = _members(archive_format, outputs[0])
+    assert list(members) == sorted(f"pkg/{i}.py" for i in range(20))
+    assert members["pkg/7.py"] == b"x 7\n"
+
+
+@pytest.mark.asyncio
+async def test_archive_zst():
+    zstandard = pytest.importorskip("zstandard")
+    with TempFile(1) as (dir_, (src,)):
+        src.write_text("{{ name }} {{ i }}")
+        output = pathlib.Path(dir_, "out.tar.zst")
+        with writing(ArchiveWriter(pathlib.Path(dir_), str(output), "tar.zst")):
+            await _generate(src, pathlib.Path(dir_), range(3))
+        data = zstandard.ZstdDecompressor().stream_reader(output.read_bytes()).read()
+    assert _members("tar", data)["pkg/2.py"] == b"x 2"
+
+
+@pytest.mark.asyncio
+async def test_archive_to_stdout(capsysbinary):
+    with TempFile(1) as (dir_, (src,)):
+        src.write_text("{{ name }} {{ i }}")
+        with writing(ArchiveWriter(pathlib.Path("-"), "-", "tar")):
+            await _generate(src, pathlib.Path("-"), range(2))
+            context = pathlib.Path(dir_, "ctx", "context.json")
+            await process_file_write_stream(
+                [FileWriteJob(src, context, True, {"i": "0"})], args={"name": "c"}
+            )
+        assert context.read_text() == "c 0"
+    members = _members("tar", capsysbinary.readouterr().out)
+    assert members == {"pkg/0.py": b"x 0", "pkg/1.py": b"x 1"}
+
+
+@pytest.mark.asyncio
+async def test_archive_discarded_on_error():
+    with TempFile(0) as (dir_, _):
+        output = pathlib.Path(dir_, "out.zip")
+        with pytest.raises(RuntimeError):
+            with writing(ArchiveWriter(pathlib.Path(dir_), str(output), "zip")) as w:
+                await w.write(pathlib.Path(dir_, "a"), "a")
+                raise RuntimeError()
+        assert not output.exists()
+
+
+def test_archive_formats(monkeypatch):
+    with pytest.raises(ValueError):
+        ArchiveWriter(pathlib.Path("."), "-", "rar")
+    monkeypatch.setitem(sys.modules, "zstandard", None)
+    with pytest.raises(ValueError):
+        ArchiveWriter(pathlib.Path("."), "-", "tar.zst")
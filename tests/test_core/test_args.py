@@ -36,6 +36,16 @@ def test_arguments_skip():
         args = Arguments.parse()
         assert args.name == "name"
         assert args.target == "."
+        assert args.packages == ()
+        assert args.write_backend == "aiofiles"
+        assert args.output_format == "dir"
+
+
+def test_arguments_packages():
+    with MockArgs("-s", "-n", "name", "--packages", "core, api,,cli"):
+        args = Arguments.parse()
+        assert args.packages == ("core", "api", "cli")
+        assert args.spec.packages == ("core", "api", "cli")
 
 
 def test_arguments_invalid_name():
@@ -93,3 +103,10 @@ def test_arguments_prompt_msg():
             mock_out.input
             == "Enter project name: Remaining fields can be empty\nEnter project description: Enter repository: Enter author: Enter email: Enter keywords: "
         )
+
+
+def test_arguments_context_skips_prompts():
+    with MockArgs("--context", "ctx.json", "--emit-context", "out.json"):
+        args = Arguments.parse()
+        assert args.context == "ctx.json"
+        assert args.emit_context == "out.json"
@@ -0,0 +1,124 @@
+import os
+import pathlib
+import stat
+
+import pytest
+
+from tests.testutils.helpers import TempFile
+from vspy.core import RenderContext, replay, writers
+from vspy.core.cache import TreeCache
+from vspy.core.writers import SyncWriter, writing
+
+
+def _context(src_tmpl: pathlib.Path, src_static: pathlib.Path) -> RenderContext:
+    src_tmpl.write_text("__{{name}}__")
+    src_static.write_text("static")
+    return RenderContext(
+        {"name": "proj"},
+        [
+            {"src": src_tmpl.as_posix(), "dst": "a/tmpl.txt", "is_template": True},
+            {"src": src_static.as_posix(), "dst": "static.txt", "is_template": False},
+        ],
+    )
+
+
+@pytest.mark.asyncio
+async def test_cache_miss_then_hit():
+    with TempFile(2) as (dir_, (src_tmpl, src_static)):
+        root = pathlib.Path(dir_)
+        ctx = _context(src_tmpl, src_static)
+        cache = TreeCache(root.joinpath("cache"))
+        key = await cache.key(ctx)
+        assert not await cache.materialize(key, root.joinpath("unused"))
+
+        first = await replay(ctx, root.joinpath("first"), cache)
+        assert root.joinpath("cache", key, "a", "tmpl.txt").is_file()
+        assert await cache.key(ctx) == key
+
+        second = await replay(ctx, root.joinpath("second"), cache)
+        for target in (first, second):
+            assert target.joinpath("a", "tmpl.txt").read_text() == "__proj__"
+            assert target.joinpath("static.txt").read_text() == "static"
+
+
+@pytest.mark.asyncio
+async def test_cache_hit_is_durable(monkeypatch):
+    monkeypatch.setattr(writers, "_libc_syncfs", lambda: None)
+    synced = []
+    monkeypatch.setattr(writers, "fsync_path", synced.append)
+    with TempFile(2) as (dir_, (src_tmpl, src_static)):
+        root = pathlib.Path(dir_)
+        ctx = _context(src_tmpl, src_static)
+        cache = TreeCache(root.joinpath("cache"))
+        await replay(ctx, root.joinpath("first"), cache)
+        with writing(SyncWriter("batch")):
+            second = await replay(ctx, root.joinpath("second"), cache)
+    assert {second.joinpath("a", "tmpl.txt"), second.joinpath("static.txt")} <= set(
+        synced
+    )
+
+
+@pytest.mark.asyncio
+async def test_cache_key_changes_with_source():
+    with TempFile(2) as (dir_, (src_tmpl, src_static)):
+        ctx = _context(src_tmpl, src_static)
+        cache = TreeCache(pathlib.Path(dir_, "cache"))
+        key = await cache.key(ctx)
+        src_static.write_text("changed")
+        assert await cache.key(ctx) != key
+
+
+@pytest.mark.asyncio
+async def test_cache_key_changes_with_included_template():
+    with TempFile(3) as (dir_, (src_tmpl, src_static, part)):
+        ctx = _context(src_tmpl, src_static)
+        src_tmpl.write_text(f'{{% include "{part.as_posix()}" %}}')
+        part.write_text("{{ name }}")
+        cache = TreeCache(pathlib.Path(dir_, "cache"))
+        key = await cache.key(ctx)
+        part.write_text("{{ name }}!")
+        assert await cache.key(ctx) != key
+
+
+@pytest.mark.asyncio
+async def test_cache_hardlink():
+    with TempFile(2) as (dir_, (src_tmpl, src_static)):
+        root = pathlib.Path(dir_)
+        ctx = _context(src_tmpl, src_static)
+        cache = TreeCache(root.joinpath("cache"), hardlink=True)
+        await replay(ctx, root.joinpath("first"), cache)
+        second = await replay(ctx, root.joinpath("second"), cache)
+        cached = root.joinpath("cache", await cache.key(ctx), "static.txt")
+        linked = second.joinpath("static.txt")
+        assert os.path.samefile(cached, linked)
+        assert not cached.stat().st_mode & (stat.S_IWUSR | stat.S_IWGRP | stat.S_IWOTH)
+
+
+@pytest.mark.asyncio
+async def test_cache_hardlink_after_copy_is_not_writable():
+    with TempFile(2) as (dir_, (src_tmpl, src_static)):
+        root = pathlib.Path(dir_)
+        ctx = _context(src_tmpl, src_static)
+        await replay(ctx, root.joinpath("first"), TreeCache(root.joinpath("cache")))
+        linked = await replay(
+            ctx, root.joinpath("second"), TreeCache(root.joinpath("cache"), True)
+        )
+        mode = linked.joinpath("static.txt").stat().st_mode
+        assert not mode & (stat.S_IWUSR | stat.S_IWGRP | stat.S_IWOTH)
+        third = await replay(
+            ctx, root.joinpath("third"), TreeCache(root.joinpath("cache"))
+        )
+        assert third.joinpath("static.txt").read_text() == "static"
+
+
+@pytest.mark.asyncio
+async def test_cache_copies_writable_entries():
+    with TempFile(2) as (dir_, (src_tmpl, src_static)):
+        root = pathlib.Path(dir_)
+        ctx = _context(src_tmpl, src_static)
+        cache = TreeCache(root.joinpath("cache"), hardlink=True)
+        cached = root.joinpath("cache", await cache.key(ctx), "static.txt")
+        cached.parent.mkdir(parents=True)
+        cached.write_text("static")
+        target = await replay(ctx, root.joinpath("first"), cache)
+        assert not os.path.samefile(cached, target.joinpath("static.txt"))
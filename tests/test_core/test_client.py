@@ -1,6 +1,7 @@
 import asyncio
 import operator
 
+import httpx
 import pytest
 from httpx import HTTPStatusError
 from pytest_httpx import HTTPXMock
@@ -38,6 +39,31 @@ async def test_async_client_get_status_error(httpx_mock: HTTPXMock):
         _ = await AsyncClient().get_json("https://www.foo.is")
 
 
+@pytest.mark.asyncio
+async def test_async_client_coalesces(httpx_mock: HTTPXMock):
+    httpx_mock.add_response(url="https://www.foo.is", content='{"a": "b"}')
+    client = AsyncClient()
+    first, second = await asyncio.gather(
+        client.get_json("https://www.foo.is"), client.get_json("https://www.foo.is")
+    )
+    assert first == second == {"a": "b"}
+    assert first is not second
+    await client.get("https://www.foo.is")
+    assert len(httpx_mock.get_requests()) == 2
+    assert (client.stats.sent, client.stats.coalesced) == (2, 1)
+
+
+@pytest.mark.asyncio
+async def test_async_client_coalesced_errors(httpx_mock: HTTPXMock):
+    httpx_mock.add_response(url="https://www.foo.is", status_code=404)
+    client = AsyncClient()
+    results = await asyncio.gather(
+        *(client.get("https://www.foo.is") for _ in range(3)), return_exceptions=True
+    )
+    assert all(isinstance(res, HTTPStatusError) for res in results)
+    assert len(httpx_mock.get_requests()) == 1
+
+
 @pytest.mark.asyncio
 async def test_async_pypi_request(httpx_mock: HTTPXMock):
     packages = [("vspy", "0.1.0"), ("numpy", "33.2.6"), ("flask", "13.0.15")]
@@ -75,3 +101,10 @@ async def test_python_all_reqs(httpx_mock: HTTPXMock):
     assert set(pys) == set(f"3.{x}" for x in range(7, 11))
     assert pcks["mypck"] == "0.0.1"
     assert pcks["mypck2"] == "19.7.3"
+
+
+@pytest.mark.asyncio
+async def test_async_client_custom_transport():
+    transport = httpx.MockTransport(lambda request: httpx.Response(200, text="xyz"))
+    async with AsyncClient(transport) as client:
+        assert await client.get("https://www.foo.is") == "xyz"
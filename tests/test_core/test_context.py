@@ -0,0 +1,75 @@
+import pathlib
+
+import pytest
+from pytest_httpx import HTTPXMock
+
+from tests.testutils.helpers import TempFile, mock_urls
+from tests.testutils.mocks import MockArguments
+from vspy.core import App, RenderContext, replay
+from vspy.core.api import default_config_path
+
+
+def _tree(root: pathlib.Path):
+    return {
+        path.relative_to(root).as_posix(): path.read_bytes()
+        for path in root.rglob("*")
+        if path.is_file()
+    }
+
+
+@pytest.mark.asyncio
+async def test_emit_and_replay_context(httpx_mock: HTTPXMock):
+    await mock_urls(httpx_mock)
+    with TempFile(0) as (dir_, _):
+        root = pathlib.Path(dir_)
+        ctx_file = root.joinpath("ctx.json")
+        original = root.joinpath("original")
+        original.mkdir()
+        app = App(
+            MockArguments(str(original), "mylib", author="me"),
+            default_config_path(),
+            emit_context=ctx_file,
+        )
+        await app.start()
+
+        ctx = await RenderContext.read(ctx_file)
+        assert ctx.args["name"] == "mylib"
+        assert tuple(ctx.args["py_versions"]) == ("3.7", "3.8", "3.9", "3.10")
+        assert {"src", "dst", "is_template"} == set(ctx.jobs[0])
+        assert any(job["dst"] == "mylib/__init__.py" for job in ctx.jobs)
+        assert ctx.dumps() == ctx_file.read_text(encoding="utf-8")
+
+        first = await replay(ctx_file, root.joinpath("first"))
+        second = await replay(ctx, root.joinpath("second"))
+        assert _tree(original) == _tree(first) == _tree(second)
+
+
+@pytest.mark.asyncio
+async def test_read_context_bad_version():
+    with TempFile(1) as (_, (file,)):
+        file.write_text('{"version": 0, "args": {}, "jobs": []}')
+        with pytest.raises(ValueError):
+            await RenderContext.read(file)
+
+
+@pytest.mark.asyncio
+async def test_read_context_changed_source():
+    with TempFile(2) as (_, (src, file)):
+        src.write_text("{{ name }}")
+        job = {"src": str(src), "dst": "a.txt", "is_template": True}
+        await RenderContext({"name": "x"}, [job]).write(file)
+        assert (await RenderContext.read(file)).digest is not None
+        src.write_text("{{ name }}!")
+        with pytest.raises(ValueError):
+            await RenderContext.read(file)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("dst", ["../a.txt", "/tmp/a.txt", "C:/a.txt", "b/../../a"])
+async def test_read_context_destination_outside_target(dst):
+    with TempFile(2) as (_, (src, file)):
+        src.write_text("x")
+        job = {"src": str(src), "dst": dst, "is_template": False}
+        await RenderContext({}, [job]).write(file)
+        with pytest.raises(ValueError):
+            await RenderContext.read(file)
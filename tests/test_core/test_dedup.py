@@ -0,0 +1,61 @@
+import asyncio
+import os
+import pathlib
+
+import pytest
+
+from tests.testutils.helpers import TempFile
+from vspy.core import ProjectSpec, VersionContext, generate, writers
+from vspy.core.dedup import BlobStore
+from vspy.core.writers import SyncWriter, writing
+
+
+@pytest.mark.asyncio
+async def test_blob_store_hardlinks_identical_outputs():
+    context = VersionContext({"tox": "1.2.3"}, ["3.8", "3.9"])
+    with TempFile(0) as (dir_, _):
+        root = pathlib.Path(dir_)
+        store = BlobStore(root.joinpath("blobs"))
+        first, second = await asyncio.gather(
+            *(
+                generate(
+                    ProjectSpec(name), root.joinpath(name), context=context, store=store
+                )
+                for name in ("proj1", "proj2")
+            )
+        )
+        assert os.path.samefile(first.joinpath("LICENSE"), second.joinpath("LICENSE"))
+        assert not os.path.samefile(
+            first.joinpath("setup.py"), second.joinpath("setup.py")
+        )
+        assert not list(first.glob(".*.*[0-9a-f]"))
+        assert "proj2" in second.joinpath("setup.py").read_text(encoding="utf-8")
+
+
+@pytest.mark.asyncio
+async def test_blob_store_reflink_or_copy():
+    with TempFile(0) as (dir_, _):
+        root = pathlib.Path(dir_)
+        store = BlobStore(root.joinpath("blobs"), "reflink")
+        files = [root.joinpath("a", "x.txt"), root.joinpath("b", "x.txt")]
+        await asyncio.gather(*(store.place(file, "content") for file in files))
+        assert not os.path.samefile(*files)
+        files[0].write_text("changed")
+        assert files[1].read_text() == "content"
+
+
+@pytest.mark.asyncio
+async def test_blob_store_places_durably(monkeypatch):
+    synced = []
+    monkeypatch.setattr(writers, "fsync_path", synced.append)
+    with TempFile(0) as (dir_, _):
+        file = pathlib.Path(dir_, "out", "a.txt")
+        with writing(SyncWriter("file")):
+            await BlobStore(pathlib.Path(dir_, "blobs")).place(file, "a")
+        assert file.read_text() == "a"
+    assert file in synced
+
+
+def test_blob_store_invalid_mode():
+    with pytest.raises(ValueError):
+        BlobStore(pathlib.Path("."), "symlink")
@@ -0,0 +1,46 @@
+import pathlib
+
+import pytest
+
+from tests.testutils.helpers import TempFile
+from vspy.core import discovery
+from vspy.core.discovery import TreeIndex, discover
+
+
+def _tree(root: pathlib.Path) -> None:
+    root.joinpath("pkg", "sub").mkdir(parents=True)
+    for rel in ("setup.py.j2", "pkg/__init__.py", "pkg/sub/mod.py"):
+        root.joinpath(rel).write_text(rel)
+
+
+def test_tree_index_scan():
+    with TempFile(0) as (dir_, _):
+        root = pathlib.Path(dir_)
+        _tree(root)
+        index = TreeIndex.scan(root)
+        assert index.files == ("pkg/__init__.py", "pkg/sub/mod.py", "setup.py.j2")
+        assert [rel for rel, _ in index.dirs] == ["", "pkg", "pkg/sub"]
+        assert index.is_current(root)
+        assert TreeIndex.loads(index.dumps()) == index
+        root.joinpath("pkg", "sub", "new.py").write_text("")
+        assert not index.is_current(root)
+
+
+@pytest.mark.asyncio
+async def test_discover_cached_on_disk(monkeypatch):
+    discovery.clear()
+    with TempFile(0) as (dir_, _):
+        root, cache_dir = pathlib.Path(dir_, "tree"), pathlib.Path(dir_, "cache")
+        _tree(root)
+        files = await discover(root, cache_dir)
+        assert len(list(cache_dir.glob("*.index"))) == 1
+        discovery.clear()
+
+        def _fail(_root):
+            raise AssertionError("tree walked again")
+
+        monkeypatch.setattr(TreeIndex, "scan", _fail)
+        assert await discover(root, cache_dir) == files
+        root.joinpath("other.py").write_text("")
+        monkeypatch.undo()
+        assert "other.py" in await discover(root, cache_dir)
@@ -4,15 +4,17 @@ import pathlib
 import pytest
 
 from tests.testutils.helpers import TempFile
+from vspy.core import resources
 from vspy.core.file_io import (
     FileWriteJob,
-    path_from_root,
     process_file_write_jobs,
+    process_file_write_stream,
     read_file,
     read_json_file,
     template_from_string,
     write_file,
 )
+from vspy.core.resources import path_from_root
 
 
 @pytest.mark.asyncio
@@ -38,6 +40,15 @@ async def test_template_from_string():
     assert tmpl_str == "__3__"
 
 
+@pytest.mark.asyncio
+async def test_read_packaged_file_only_when_zipped(monkeypatch):
+    config = path_from_root("vspy", "resources", "data.json")
+    assert resources.read_packaged(config) is None
+    monkeypatch.setattr(resources, "_ZIPPED", True)
+    assert resources.read_packaged(config) == config.read_bytes()
+    assert await read_file(config) == config.read_text(encoding="utf-8")
+
+
 def test_path_from_root():
     assert (
         pathlib.Path(__file__).as_posix()
@@ -61,3 +72,19 @@ async def test_process_file_write_jobs():
         )
         assert content1 == "__some tmpl text__"
         assert content2 == "__X__"
+
+
+@pytest.mark.asyncio
+async def test_process_file_write_stream_lazily():
+    consumed = []
+    with TempFile(1) as (dir_, (src,)):
+        src.write_text("{{ a }}")
+
+        def _jobs():
+            for i in range(600):
+                consumed.append(i)
+                yield FileWriteJob(src, pathlib.Path(dir_, f"{i}.txt"), True)
+
+        await process_file_write_stream(_jobs(), args={"a": "x"})
+        assert len(consumed) == 600
+        assert pathlib.Path(dir_, "599.txt").read_text() == "x"
@@ -0,0 +1,99 @@
+import asyncio
+import time
+
+import pytest
+from httpx import HTTPStatusError
+from pytest_httpx import HTTPXMock
+
+from vspy.core.clients import AsyncClient
+from vspy.core.limiter import Limiter, Retry, retry_after
+
+
+def test_retry_after():
+    assert retry_after("3") == 3.0
+    assert retry_after("Wed, 21 Oct 2015 07:28:00 GMT") == 0.0
+    assert retry_after("soon") is None
+    assert retry_after(None) is None
+
+
+def test_retry_delay():
+    retry = Retry(backoff=1.0, max_delay=3.0)
+    assert retry.delay(1, None) == 2.0
+    assert retry.delay(5, None) == 3.0
+    assert retry.delay(5, 0.5) == 0.5
+
+
+def test_limiter_aimd():
+    limiter = Limiter(concurrency=2, max_concurrency=4)
+    for _ in range(3):
+        limiter.succeeded()
+    assert limiter.limit == 3
+    started = time.monotonic()
+    limiter.throttled(started, 0, 0)
+    limiter.throttled(started, 0, 0)
+    assert limiter.limit == 1
+    with pytest.raises(ValueError):
+        Limiter(concurrency=0)
+
+
+@pytest.mark.asyncio
+async def test_limiter_bounds_concurrency():
+    limiter = Limiter(concurrency=3)
+    inflight, peak = 0, 0
+
+    async def request() -> None:
+        nonlocal inflight, peak
+        async with limiter.slot():
+            inflight += 1
+            peak = max(peak, inflight)
+            await asyncio.sleep(0.001)
+            inflight -= 1
+
+    await asyncio.gather(*(request() for _ in range(20)))
+    assert peak == 3
+
+
+@pytest.mark.asyncio
+async def test_limiter_woken_waiter_cancelled():
+    limiter = Limiter(concurrency=1)
+
+    async def request() -> None:
+        async with limiter.slot():
+            pass
+
+    async with limiter.slot():
+        woken = asyncio.create_task(request())
+        await asyncio.sleep(0)
+        other = asyncio.create_task(request())
+        await asyncio.sleep(0)
+    woken.cancel()
+    await asyncio.wait_for(other, 1)
+
+
+@pytest.mark.asyncio
+async def test_limiter_rate():
+    limiter = Limiter(rate=100)
+    start = time.monotonic()
+    for _ in range(5):
+        async with limiter.slot():
+            pass
+    assert time.monotonic() - start >= 0.04
+
+
+@pytest.mark.asyncio
+async def test_client_retries_throttled(httpx_mock: HTTPXMock):
+    url = "https://www.foo.is"
+    httpx_mock.add_response(url=url, status_code=429, headers={"Retry-After": "0"})
+    httpx_mock.add_response(url=url, content="ok")
+    limiter = Limiter(concurrency=4)
+    assert await AsyncClient(limiter=limiter).get(url) == "ok"
+    assert limiter.limit == 2
+
+
+@pytest.mark.asyncio
+async def test_client_gives_up_when_throttled(httpx_mock: HTTPXMock):
+    httpx_mock.add_response(url="https://www.foo.is", status_code=503)
+    client = AsyncClient(limiter=Limiter(retry=Retry(retries=2, backoff=0.001)))
+    with pytest.raises(HTTPStatusError):
+        await client.get("https://www.foo.is")
+    assert len(httpx_mock.get_requests()) == 3
@@ -0,0 +1,45 @@
+import os
+import pathlib
+
+import pytest
+
+from tests.testutils.helpers import TempFile
+from vspy.core import loader
+from vspy.core.file_io import template_from_string
+
+
+def _bump(path: pathlib.Path) -> None:
+    mtime = path.stat().st_mtime_ns + 10**9
+    os.utime(path, ns=(mtime, mtime))
+
+
+@pytest.mark.asyncio
+async def test_include_and_import_from_pack():
+    with TempFile(2) as (_, (part, macros)):
+        part.write_text("part of {{ name }}")
+        macros.write_text("{% macro tag(v) %}py{{ v.replace('.', '') }}{% endmacro %}")
+        source = (
+            f'{{% from "{macros}" import tag %}}'
+            f'{{% include "{part}" %}}, {{{{ tag("3.10") }}}}'
+        )
+        assert await template_from_string(source, {"name": "x"}) == "part of x, py310"
+
+
+@pytest.mark.asyncio
+async def test_fragment_memoised_on_inputs():
+    loader.clear()
+    with TempFile(1) as (_, (shared,)):
+        shared.write_text("{% for v in py_versions %}{{ v }};{% endfor %}")
+        source = f'{{{{ name }}}}: {{{{ fragment("{shared}") }}}}'
+        for name in ("a", "b"):
+            txt = await template_from_string(
+                source, {"name": name, "py_versions": ["3.9"]}
+            )
+            assert txt == f"{name}: 3.9;"
+        assert len(loader._fragments) == 1
+        await template_from_string(source, {"name": "a", "py_versions": ["3.10"]})
+        assert len(loader._fragments) == 2
+
+        shared.write_text("{{ name }}")
+        _bump(shared)
+        assert await template_from_string(source, {"name": "c"}) == "c: c"
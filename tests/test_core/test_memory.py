@@ -0,0 +1,35 @@
+import pathlib
+
+import pytest
+
+from tests.testutils.helpers import TempFile
+from vspy.core.memory import MemoryTree, MemoryWriter
+from vspy.core.writers import writing
+
+
+def test_memory_tree_shares_contents():
+    tree = MemoryTree()
+    tree.add("b/__init__.py", b"")
+    tree.add("a/__init__.py", b"")
+    tree.add("a/x.py", b"x = 1\n")
+    tree.add("a/y.py", b"x = 1\n")
+    assert list(tree) == ["a/__init__.py", "a/x.py", "a/y.py", "b/__init__.py"]
+    assert tree["a/y.py"] == b"x = 1\n"
+    assert tree.nbytes == 6
+    tree.add("a/x.py", b"y")
+    assert tree.text("a/x.py") == "y"
+    assert "c" not in tree
+    assert repr(tree) == "MemoryTree(4 files, 7 bytes)"
+
+
+@pytest.mark.asyncio
+async def test_memory_writer():
+    with TempFile(0) as (dir_, _):
+        root = pathlib.Path(dir_, "root")
+        with writing(MemoryWriter(root)) as writer:
+            await writer.write(root.joinpath("pkg", "a.py"), "å")
+            await writer.write(pathlib.Path(dir_, "ctx", "c.json"), "{}")
+        assert dict(writer.tree) == {"pkg/a.py": "å".encode("utf-8")}
+        assert pathlib.Path(dir_, "ctx", "c.json").read_text() == "{}"
+        writer.tree.write(root)
+        assert root.joinpath("pkg", "a.py").read_text(encoding="utf-8") == "å"
@@ -0,0 +1,89 @@
+import asyncio
+import pathlib
+
+import pytest
+from pytest_httpx import HTTPXMock
+
+from tests.testutils.helpers import TempFile, mock_urls
+from vspy.core import ProjectSpec, RenderContext, generate, metrics, replay
+
+
+@pytest.fixture
+def registry():
+    yield metrics.enable()
+    metrics.disable()
+
+
+@pytest.mark.asyncio
+async def test_metrics_generate(httpx_mock: HTTPXMock, registry: metrics.Registry):
+    version_map = await mock_urls(httpx_mock)
+    with TempFile(0) as (dir_, _):
+        await generate(ProjectSpec("proj"), dir_)
+    assert registry.value("vspy_projects_generated_total") == 1
+    assert registry.value("vspy_files_written_total") == 27
+    assert registry.value("vspy_bytes_written_total") > 35000
+    assert registry.value("vspy_version_contexts_total", origin="fetched") == 1
+    assert registry.value("vspy_http_request_seconds", host="pypi.org") == len(
+        version_map
+    )
+    assert registry.value("vspy_http_request_seconds", host="www.python.org") == 1
+    assert registry.value("vspy_template_render_seconds", template="==toxini==") == 1
+
+
+@pytest.mark.asyncio
+async def test_metrics_replay(registry: metrics.Registry):
+    with TempFile(1) as (dir_, (src,)):
+        root = pathlib.Path(dir_)
+        src.write_text("{{name}}")
+        jobs = [{"src": src.as_posix(), "dst": "name.txt", "is_template": True}]
+        await replay(RenderContext({"name": "proj"}, jobs), root.joinpath("proj"))
+        with pytest.raises(OSError):
+            await replay(root.joinpath("missing.json"), root.joinpath("other"))
+    assert registry.value("vspy_projects_generated_total") == 1
+    assert registry.value("vspy_failures_total", stage="replay") == 1
+
+
+def test_metrics_render(registry: metrics.Registry):
+    registry.inc("vspy_failures_total", stage="http")
+    registry.observe("vspy_http_request_seconds", 0.02, host="a")
+    text = registry.render()
+    assert "# TYPE vspy_failures_total counter" in text
+    assert 'vspy_failures_total{stage="http"} 1' in text
+    assert 'vspy_http_request_seconds_bucket{host="a",le="0.01"} 0' in text
+    assert 'vspy_http_request_seconds_bucket{host="a",le="0.025"} 1' in text
+    assert 'vspy_http_request_seconds_bucket{host="a",le="+Inf"} 1' in text
+    assert 'vspy_http_request_seconds_count{host="a"} 1' in text
+
+
+def test_metrics_disabled():
+    assert not metrics.enabled()
+    metrics.inc("vspy_failures_total")
+    with metrics.timer("vspy_http_request_seconds"):
+        pass
+
+
+def test_metrics_textfile(registry: metrics.Registry):
+    registry.inc("vspy_projects_generated_total", 3)
+    with TempFile(1) as (_, (file,)):
+        registry.write_textfile(file)
+        assert "vspy_projects_generated_total 3\n" in file.read_text()
+
+
+@pytest.mark.asyncio
+async def test_metrics_endpoint(registry: metrics.Registry):
+    registry.inc("vspy_projects_generated_total")
+    server = await registry.serve(port=0)
+    port = server.sockets[0].getsockname()[1]
+    try:
+        responses = {}
+        for path in ("/metrics", "/"):
+            reader, writer = await asyncio.open_connection("127.0.0.1", port)
+            writer.write(f"GET {path} HTTP/1.1\r\nHost: x\r\n\r\n".encode())
+            responses[path] = await reader.read()
+            writer.close()
+        assert responses["/metrics"].split()[1] == b"200"
+        assert responses["/metrics"].endswith(b"vspy_projects_generated_total 1\n")
+        assert responses["/"].split()[1] == b"404"
+    finally:
+        server.close()
+        await server.wait_closed()
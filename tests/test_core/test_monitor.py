@@ -0,0 +1,52 @@
+import asyncio
+import time
+
+import pytest
+
+from tests.testutils.helpers import TempFile
+from vspy.core import ProjectSpec, VersionContext, generate
+from vspy.core.monitor import LoopMonitor, labelled
+
+
+async def _blocking(label: str) -> str:
+    with labelled(label):
+        await asyncio.sleep(0)
+        time.sleep(0.03)
+    return label
+
+
+@pytest.mark.asyncio
+async def test_monitor_attributes_slow_steps():
+    monitor = LoopMonitor(interval=0.001, slow_threshold=0.02)
+
+    async def _run():
+        return await asyncio.gather(_blocking("first"), _blocking("second"))
+
+    assert await monitor.run(_run()) == ["first", "second"]
+    assert {(s.coroutine, s.label) for s in monitor.slow_steps} == {
+        ("_blocking", "first"),
+        ("_blocking", "second"),
+    }
+    assert monitor.lags and max(monitor.lags) >= 0.02
+    report = monitor.report().splitlines()
+    assert report[1].startswith("slow steps: 2 of ")
+    assert report[2].endswith("_blocking  [first]") or report[2].endswith(
+        "_blocking  [second]"
+    )
+
+
+@pytest.mark.asyncio
+async def test_monitor_restores_loop():
+    loop = asyncio.get_running_loop()
+    factory = loop.get_task_factory()
+    monitor = LoopMonitor(slow_threshold=0.0)
+    with TempFile(0) as (dir_, _):
+        spec = ProjectSpec("proj")
+        await monitor.run(generate(spec, dir_, context=VersionContext({}, ["3.9"])))
+    assert loop.get_task_factory() is factory
+    assert any(s.label.endswith("proj/main.py") for s in monitor.slow_steps)
+
+
+def test_labelled_without_monitor():
+    with labelled("x"):
+        pass
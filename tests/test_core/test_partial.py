@@ -0,0 +1,92 @@
+import pathlib
+
+import pytest
+
+from tests.testutils.helpers import TempFile
+from vspy.core import ProjectSpec, VersionContext, generate, generate_batch
+from vspy.core.file_io import FileWriteJob, read_file, template_from_string
+from vspy.core.partial import PartialRenderer, partially_evaluate
+from vspy.core.resources import path_from_root
+
+_SHARED = {
+    "dependencies": {"tox": "1.2.3", "pytest": "7.0.0"},
+    "py_versions": ["3.8", "3.9", "3.10"],
+}
+_FIELDS = ("author", "description", "email", "keywords", "name", "repository")
+_PROJECT = {
+    "author": "me",
+    "description": "desc",
+    "email": "mail",
+    "keywords": "a b",
+    "name": "proj",
+    "repository": "repo",
+}
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "template",
+    sorted(p.name for p in path_from_root("vspy", "resources", "templates").iterdir()),
+)
+async def test_residual_matches_full_render(template: str):
+    path = path_from_root("vspy", "resources", "templates", template)
+    source = await read_file(path)
+    args = {**_SHARED, **_PROJECT}
+    residual = await partially_evaluate(source, _SHARED, _FIELDS)
+    assert residual is not None
+    assert residual.render(args) == await template_from_string(source, args)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "source",
+    ["{{name|upper}}", "{% if name == 'x' %}x{% endif %}", "{{name[0]}}"],
+)
+async def test_residual_rejects_inspected_fields(source: str):
+    assert await partially_evaluate(source, _SHARED, _FIELDS) is None
+
+
+@pytest.mark.asyncio
+async def test_residual_with_other_templates():
+    with TempFile(2) as (_, (part, shared)):
+        part.write_text("{% if name == 'x' %}x{% endif %}")
+        shared.write_text("{{ py_versions[0] }}")
+        for source in (f'{{% include "{part}" %}}', f'{{{{ fragment("{part}") }}}}'):
+            assert await partially_evaluate(source, _SHARED, _FIELDS) is None
+        source = f'{{{{ name }}}} {{{{ fragment("{shared}") }}}}'
+        residual = await partially_evaluate(source, _SHARED, _FIELDS)
+        assert residual is not None
+        assert residual.render(_PROJECT) == "proj 3.8"
+
+
+@pytest.mark.asyncio
+async def test_renderer_keeps_residuals():
+    renderer = PartialRenderer(_SHARED, _FIELDS)
+    src = path_from_root("vspy", "resources", "templates", "==toxini==")
+    job = FileWriteJob(src, pathlib.Path("tox.ini"), True)
+    residual = await renderer.residual(job)
+    assert residual is not None
+    assert await renderer.residual(job) is residual
+    assert await renderer.render(job, {**_SHARED, **_PROJECT}) == residual.render(
+        {**_SHARED, **_PROJECT}
+    )
+
+
+@pytest.mark.asyncio
+async def test_generate_batch_matches_generate():
+    context = VersionContext(_SHARED["dependencies"], _SHARED["py_versions"])
+    specs = [ProjectSpec(f"proj{i}", author=f"me{i}") for i in range(3)]
+    with TempFile(0) as (dir_, _):
+        root = pathlib.Path(dir_)
+        batch = await generate_batch(specs, root.joinpath("batch"), context=context)
+        for spec, target in zip(specs, batch):
+            single = await generate(
+                spec, root.joinpath("single", spec.name), context=context
+            )
+            files = [p.relative_to(single) for p in single.rglob("*") if p.is_file()]
+            assert files
+            for file in files:
+                assert (
+                    single.joinpath(file).read_bytes()
+                    == target.joinpath(file).read_bytes()
+                )
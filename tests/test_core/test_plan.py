@@ -0,0 +1,170 @@
+import json
+import pathlib
+
+import pytest
+
+from tests.testutils.helpers import TempFile
+from vspy.core import plan
+from vspy.core.api import default_config_path
+from vspy.core.plan import JobPlan, load_plan, validate_config
+
+
+def _job(**kwargs):
+    job = {"src": "a", "dst": "b", "is_template": False, "path_is_template": False}
+    job.update(kwargs)
+    return job
+
+
+@pytest.mark.parametrize(
+    "data",
+    [
+        [],
+        {"jobs": []},
+        {"dev-dependencies": [1], "jobs": []},
+        {"dev-dependencies": [], "jobs": {}},
+        {"dev-dependencies": [], "jobs": ["a"]},
+        {"dev-dependencies": [], "jobs": [_job(dst=None)]},
+        {"dev-dependencies": [], "jobs": [_job(is_template="yes")]},
+        {"dev-dependencies": [], "jobs": [_job(fan_out="packages")]},
+        {
+            "dev-dependencies": [],
+            "jobs": [_job(fan_out={"over": "packages", "as": "a-b"})],
+        },
+        {
+            "dev-dependencies": [],
+            "jobs": [_job(fan_out={"over": "packages", "as": "pkg"})],
+        },
+        {"dev-dependencies": [], "jobs": [], "trees": {}},
+        {"dev-dependencies": [], "jobs": [], "trees": [{"src": "a", "dst": "b"}]},
+        {
+            "dev-dependencies": [],
+            "jobs": [],
+            "trees": [
+                {"src": "a", "dst": "b", "path_is_template": False, "templates": "*"}
+            ],
+        },
+    ],
+)
+def test_validate_config_rejects(data):
+    with pytest.raises(ValueError):
+        validate_config(data)
+
+
+@pytest.mark.asyncio
+async def test_plan_binds_destinations():
+    data = {
+        "dev-dependencies": ["pytest"],
+        "jobs": [
+            _job(dst="x/y.txt"),
+            _job(dst="{{name}}/main.py", path_is_template=True),
+            _job(dst="{{ name | upper }}.md", path_is_template=True),
+        ],
+    }
+    job_plan = await JobPlan.from_config(data)
+    assert job_plan.jobs[1].dst == (("", "name"), ("/main.py", None))
+    assert job_plan.jobs[2].dst_template == "{{ name | upper }}.md"
+    target = pathlib.Path("out")
+    jobs = list((await job_plan.bind({"name": "foo"})).write_jobs(target))
+    assert [job.destination for job in jobs] == [
+        target.joinpath("x/y.txt"),
+        target.joinpath("foo/main.py"),
+        target.joinpath("FOO.md"),
+    ]
+    assert JobPlan.loads(job_plan.dumps()) == job_plan
+
+
+@pytest.mark.asyncio
+async def test_plan_fans_out_over_list():
+    fan_out = {"over": "packages", "as": "pkg"}
+    data = {
+        "dev-dependencies": [],
+        "jobs": [
+            _job(dst="{{name}}/setup.py", path_is_template=True),
+            _job(dst="{{pkg}}/__init__.py", path_is_template=True, fan_out=fan_out),
+            _job(dst="tests/{{ pkg }}.py", path_is_template=True, fan_out=fan_out),
+        ],
+    }
+    job_plan = await JobPlan.from_config(data)
+    assert job_plan.jobs[1].dst == (("", "pkg"), ("/__init__.py", None))
+    assert JobPlan.loads(job_plan.dumps()) == job_plan
+    table = await job_plan.bind({"name": "mono", "packages": ["a", "b"]})
+    assert [(job["dst"], job.get("variables")) for job in table] == [
+        ("mono/setup.py", None),
+        ("a/__init__.py", {"pkg": "a"}),
+        ("b/__init__.py", {"pkg": "b"}),
+        ("tests/a.py", {"pkg": "a"}),
+        ("tests/b.py", {"pkg": "b"}),
+    ]
+    assert len(await job_plan.bind({"name": "mono", "packages": []})) == 1
+    with pytest.raises(ValueError):
+        await job_plan.bind({"name": "mono", "packages": "a"})
+
+
+@pytest.mark.asyncio
+async def test_load_plan_lists_trees():
+    with TempFile(0) as (dir_, _):
+        root = pathlib.Path(dir_)
+        tree = root.joinpath("pack")
+        tree.joinpath("docs").mkdir(parents=True)
+        for rel in ("setup.py.j2", "docs/index.md", "docs/conf.py", "LICENSE"):
+            tree.joinpath(rel).write_text("{{ name }}")
+        config = root.joinpath("data.json")
+        config.write_text(
+            json.dumps(
+                {
+                    "dev-dependencies": [],
+                    "jobs": [_job(src="a", dst="README.md")],
+                    "trees": [
+                        {
+                            "src": str(tree),
+                            "dst": "{{name}}/",
+                            "path_is_template": True,
+                            "template_suffix": ".j2",
+                            "templates": ["docs/*.md"],
+                        }
+                    ],
+                }
+            )
+        )
+        cache_dir = root.joinpath("cache")
+        job_plan = await load_plan(config, cache_dir)
+        assert len(job_plan.jobs) == 5 and not job_plan.trees
+        table = await job_plan.bind({"name": "foo"})
+        assert [(job["dst"], job["is_template"]) for job in table] == [
+            ("README.md", False),
+            ("foo/LICENSE", False),
+            ("foo/docs/conf.py", False),
+            ("foo/docs/index.md", True),
+            ("foo/setup.py", True),
+        ]
+        assert table[4]["src"] == f"{tree}/setup.py.j2"
+        assert len(list(cache_dir.glob("*.index"))) == 1
+        tree.joinpath("docs", "extra.md").write_text("")
+        assert len((await load_plan(config, cache_dir)).jobs) == 6
+
+
+@pytest.mark.asyncio
+async def test_load_plan_cached_on_disk(monkeypatch):
+    plan.clear()
+    with TempFile(0) as (dir_, _):
+        cache_dir = pathlib.Path(dir_)
+        first = await load_plan(default_config_path(), cache_dir)
+        assert len(list(cache_dir.glob("*.plan"))) == 1
+        plan.clear()
+
+        async def _fail(_data):
+            raise AssertionError("config parsed again")
+
+        monkeypatch.setattr(JobPlan, "from_config", _fail)
+        assert await load_plan(default_config_path(), cache_dir) == first
+        assert await load_plan(default_config_path()) is await load_plan(
+            default_config_path()
+        )
+
+
+@pytest.mark.asyncio
+async def test_load_plan_invalid_config():
+    with TempFile(1) as (_, files):
+        files[0].write_text(json.dumps({"jobs": []}))
+        with pytest.raises(ValueError):
+            await load_plan(files[0])
@@ -0,0 +1,63 @@
+import importlib
+import pathlib
+import sys
+
+import pytest
+
+import vspy
+from tests.testutils.helpers import TempFile
+from vspy.core import precompiled
+from vspy.core.file_io import _env, read_file, template_from_string
+from vspy.core.resources import path_from_root
+
+
+def _forget_compiled() -> None:
+    for name in [m for m in sys.modules if m.startswith(precompiled.PACKAGE)]:
+        del sys.modules[name]
+    importlib.invalidate_caches()
+
+
+@pytest.fixture
+def compiled_dir():
+    with TempFile(0) as (dir_, _):
+        # Ahead of a vspy/_compiled left in the source tree by `vspy compile`.
+        vspy.__path__.insert(0, dir_)
+        _forget_compiled()
+        try:
+            yield pathlib.Path(dir_).joinpath("_compiled")
+        finally:
+            vspy.__path__.remove(dir_)
+            _forget_compiled()
+
+
+@pytest.mark.asyncio
+async def test_precompiled_template_renders_like_source(compiled_dir):
+    source = await read_file(
+        path_from_root("vspy", "resources", "templates", "==toxini==")
+    )
+    precompiled.write(_env, [source], compiled_dir)
+    template = precompiled.load(_env, source)
+    assert template is not None
+    args = {"py_versions": ["3.9", "3.10"], "dependencies": {"tox": "3.26.0"}}
+    assert await template.render_async(**args) == await template_from_string(
+        source, args
+    )
+
+
+def test_precompiled_stale_source_misses(compiled_dir):
+    precompiled.write(_env, ["{{ name }}"], compiled_dir)
+    assert precompiled.load(_env, "{{ name }}") is not None
+    assert precompiled.load(_env, "{{ name }}!") is None
+
+
+def test_compile_pack_includes_paths_and_drops_stale(compiled_dir):
+    stale = precompiled.write(_env, ["{{ gone }}"], compiled_dir)[0]
+    modules = precompiled.compile_pack(
+        path_from_root(), path_from_root("vspy", "resources", "data.json"), compiled_dir
+    )
+    assert not stale.exists()
+    assert (
+        compiled_dir.joinpath(f"{precompiled.module_name('{{name}}/main.py')}.py")
+        in modules
+    )
+    assert precompiled.load(_env, "{{name}}/main.py") is not None
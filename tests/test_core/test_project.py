@@ -43,7 +43,7 @@ async def test_set_versions(httpx_mock: HTTPXMock):
             httpx_mock, dir_, ("mypck", "0.0.1"), ("mypck2", "19.7.3")
         )
         _args = project._args
-        assert len(_args) == 8
+        assert len(_args) == 9
         assert tuple(_args["py_versions"]) == ("3.7", "3.8", "3.9", "3.10")
         assert len(_args["dependencies"]) == 2
         assert _args["dependencies"]["mypck"] == "0.0.1"
@@ -53,6 +53,7 @@ async def test_set_versions(httpx_mock: HTTPXMock):
         assert _args["email"] == "mine"
         assert _args["keywords"] == "test, example"
         assert _args["name"] == "testproj"
+        assert _args["packages"] == []
         assert _args["repository"] == "test-repo"
 
 
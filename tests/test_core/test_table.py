@@ -0,0 +1,62 @@
+import pathlib
+
+import pytest
+
+from vspy.core import RenderContext
+from vspy.core.resources import path_from_root
+from vspy.core.table import JobTable
+
+_ROWS = [
+    ("vspy/resources/static/==main==", "proj/main.py", False, None),
+    ("vspy/resources/templates/==toxini==", "tox.ini", True, None),
+    ("/abs/src/file", "proj/sub/file", True, {"pkg": "sub"}),
+]
+
+
+def test_table_rows_round_trip():
+    table = JobTable(_ROWS)
+    assert len(table) == 3
+    assert list(table.rows()) == _ROWS
+    assert table[-1] == {
+        "src": "/abs/src/file",
+        "dst": "proj/sub/file",
+        "is_template": True,
+        "variables": {"pkg": "sub"},
+    }
+    assert table[:1] == [
+        {"src": _ROWS[0][0], "dst": "proj/main.py", "is_template": False}
+    ]
+    with pytest.raises(IndexError):
+        _ = table[3]
+    assert JobTable.from_json(list(table)) == table
+    assert table == list(table)
+
+
+def test_table_interns_segments():
+    table = JobTable(("a/b/c", f"proj/{i}", False, None) for i in range(100))
+    assert not hasattr(table, "__dict__")
+    assert len(table._segments) == 3 + 1 + 100
+
+
+def test_table_write_jobs():
+    target = pathlib.Path("target")
+    jobs = list(JobTable(_ROWS).write_jobs(target))
+    assert jobs[0].source == path_from_root("vspy", "resources", "static", "==main==")
+    assert jobs[2].source == pathlib.Path("/abs/src/file")
+    assert [job.destination for job in jobs] == list(
+        JobTable(_ROWS).destinations(target)
+    )
+    assert [job.is_template for job in jobs] == [False, True, True]
+    assert [job.variables for job in jobs] == [None, None, {"pkg": "sub"}]
+
+
+def test_table_interns_variables():
+    table = JobTable(("a", f"{i}", True, {"pkg": f"p{i % 2}"}) for i in range(10))
+    assert len(table._variables) == 1 + 2
+    assert table[3]["variables"] == {"pkg": "p1"}
+
+
+def test_render_context_converts_json_jobs():
+    ctx = RenderContext({}, [{"src": "a", "dst": "b", "is_template": False}])
+    assert isinstance(ctx.jobs, JobTable)
+    assert ctx.jobs[0]["dst"] == "b"
@@ -0,0 +1,61 @@
+import json
+import pathlib
+
+import pytest
+
+from tests.testutils.helpers import TempFile
+from vspy.core import ProjectSpec, VersionContext, generate
+from vspy.core.trace import Tracer, span, tracing
+
+
+def test_span_without_tracer():
+    with span("nothing"):
+        pass
+    tracer = Tracer()
+    with tracing(tracer):
+        with span("something", a="b"):
+            pass
+    with span("nothing"):
+        pass
+    assert [(s.name, s.args) for s in tracer.spans] == [("something", {"a": "b"})]
+
+
+@pytest.mark.asyncio
+async def test_trace_generate():
+    tracer = Tracer()
+    with TempFile(0) as (dir_, _):
+        with tracing(tracer):
+            await generate(
+                ProjectSpec("proj"), dir_, context=VersionContext({"tox": "1"}, ["3.9"])
+            )
+        names = {s.name for s in tracer.spans}
+        assert {
+            "app.config",
+            "app.versions",
+            "app.render",
+            "job",
+            "template.compile",
+            "template.render",
+            "io.mkdir",
+            "io.write",
+        } <= names
+        assert sum(s.name == "job" for s in tracer.spans) == 27
+
+        trace_file = pathlib.Path(dir_, "trace.json")
+        tracer.write(trace_file)
+        events = json.loads(trace_file.read_text())["traceEvents"]
+        assert len(events) == len(tracer.spans)
+        assert all(e["ph"] == "X" and e["dur"] >= 0 for e in events)
+
+    summary = tracer.summary().splitlines()
+    assert summary[0].split() == [
+        "span",
+        "count",
+        "total",
+        "ms",
+        "mean",
+        "ms",
+        "max",
+        "ms",
+    ]
+    assert any(line.split()[:2] == ["job", "27"] for line in summary)
@@ -1,6 +1,7 @@
 import pathlib
 import platform
 from asyncio.proactor_events import _ProactorBasePipeTransport
+from concurrent.futures import ThreadPoolExecutor
 from tempfile import TemporaryDirectory
 
 import pytest
@@ -9,7 +10,10 @@ from vspy.core.utils import (
     clean_dir,
     is_empty_folder,
     is_windows,
+    mtime_ns,
+    read_cached,
     silence_event_loop_closed,
+    write_cached,
 )
 
 
@@ -64,3 +68,31 @@ def test_silence_event_loop_closed():
     _ProactorBasePipeTransport.__del__ = mock_stuff_unwanted_exception
     silence_event_loop_closed()
     assert trans.__del__() is None
+
+
+def test_read_and_write_cached():
+    with TemporaryDirectory() as dir_:
+        file = pathlib.Path(dir_, "sub", "x.cache")
+        assert read_cached(file, bytes.decode) is None
+        write_cached(file, b"abc")
+        assert read_cached(file, bytes.decode) == "abc"
+        assert [path.name for path in file.parent.iterdir()] == ["x.cache"]
+        file.write_bytes(b"\xff")
+        assert read_cached(file, bytes.decode) is None
+
+
+def test_write_cached_from_threads():
+    with TemporaryDirectory() as dir_:
+        file = pathlib.Path(dir_, "x.cache")
+        with ThreadPoolExecutor(4) as pool:
+            for _ in pool.map(lambda i: write_cached(file, b"%d" % i), range(200)):
+                pass
+        assert [path.name for path in file.parent.iterdir()] == ["x.cache"]
+
+
+def test_mtime_ns():
+    with TemporaryDirectory() as dir_:
+        file = pathlib.Path(dir_, "x")
+        assert mtime_ns(file) == -1
+        file.write_bytes(b"")
+        assert mtime_ns(file) == file.stat().st_mtime_ns
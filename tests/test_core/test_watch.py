@@ -0,0 +1,107 @@
+import json
+import os
+import pathlib
+
+import pytest
+
+from tests.testutils.helpers import TempFile
+from vspy.core import ProjectSpec, VersionContext
+from vspy.core.watch import Watcher, template_dependencies
+
+
+def _touch(path: pathlib.Path, content: str) -> None:
+    """Write `content` with an mtime that surely differs from the last one."""
+    mtime = path.stat().st_mtime_ns if path.exists() else 0
+    path.write_text(content)
+    os.utime(path, ns=(mtime + 10**9, mtime + 10**9))
+
+
+def _config(config: pathlib.Path, *jobs: dict, trees: tuple = ()) -> None:
+    data = {"dev-dependencies": [], "jobs": list(jobs), "trees": list(trees)}
+    _touch(config, json.dumps(data))
+
+
+@pytest.mark.asyncio
+async def test_template_dependencies():
+    with TempFile(4) as (_, (main, part, leaf, shared)):
+        main.write_text(f'{{% include "{part}" %}}{{% import "{part}" as p %}}')
+        part.write_text(f'{{% include "{leaf}" %}}{{{{ fragment("{shared}") }}}}')
+        shared.write_text("{% include name %}{{ fragment(name) }}")
+        leaf.write_text("{% if %}")
+        assert await template_dependencies(main) == {part, leaf, shared}
+        assert await template_dependencies(leaf) == set()
+
+
+@pytest.mark.asyncio
+async def test_watcher_renders_changed_outputs():
+    with TempFile(3) as (dir_, (config, template, static)):
+        target = pathlib.Path(dir_, "out")
+        template.write_text("{{ name }} 1")
+        static.write_text("static 1")
+        job = {"src": str(template), "is_template": True, "path_is_template": True}
+        copy = {"src": str(static), "is_template": False, "path_is_template": False}
+        _config(config, {**job, "dst": "{{name}}.txt"}, {**copy, "dst": "s.txt"})
+        watcher = Watcher(
+            ProjectSpec("proj", str(target)), config, context=VersionContext({}, [])
+        )
+        assert len(await watcher.start()) == 2
+        assert target.joinpath("proj.txt").read_text() == "proj 1"
+        assert await watcher.update() == []
+
+        _touch(template, "{{ name }} 2")
+        assert await watcher.update() == [target.joinpath("proj.txt")]
+        assert target.joinpath("proj.txt").read_text() == "proj 2"
+
+        _config(config, {**job, "dst": "{{name}}.txt"}, {**copy, "dst": "t.txt"})
+        assert await watcher.update() == [target.joinpath("t.txt")]
+        assert not target.joinpath("s.txt").exists()
+        assert target.joinpath("t.txt").read_text() == "static 1"
+
+
+@pytest.mark.asyncio
+async def test_watcher_follows_includes():
+    with TempFile(3) as (dir_, (config, template, part)):
+        target = pathlib.Path(dir_, "out")
+        part.write_text("v1")
+        template.write_text(f'[{{% include "{part}" %}}]')
+        job = {"src": str(template), "is_template": True, "path_is_template": False}
+        _config(config, {**job, "dst": "a.txt"})
+        watcher = Watcher(
+            ProjectSpec("proj", str(target)), config, context=VersionContext({}, [])
+        )
+        await watcher.start()
+        assert target.joinpath("a.txt").read_text() == "[v1]"
+        _touch(part, "v2")
+        assert await watcher.update() == [target.joinpath("a.txt")]
+        assert target.joinpath("a.txt").read_text() == "[v2]"
+
+
+@pytest.mark.asyncio
+async def test_watcher_lists_new_tree_files():
+    with TempFile(1) as (dir_, (config,)):
+        target = pathlib.Path(dir_, "out")
+        tree = pathlib.Path(dir_, "pack")
+        tree.joinpath("sub").mkdir(parents=True)
+        tree.joinpath("a.txt").write_text("a")
+        _config(
+            config, trees=[{"src": str(tree), "dst": "t", "path_is_template": False}]
+        )
+        watcher = Watcher(
+            ProjectSpec("proj", str(target)), config, context=VersionContext({}, [])
+        )
+        assert await watcher.start() == [target.joinpath("t", "a.txt")]
+        _touch(tree.joinpath("sub", "b.txt"), "b")
+        os.utime(tree.joinpath("sub"), ns=(1, 1))  # coarse mtimes may not tick
+        assert await watcher.update() == [target.joinpath("t", "sub", "b.txt")]
+        assert target.joinpath("t", "sub", "b.txt").read_text() == "b"
+
+
+@pytest.mark.asyncio
+async def test_watcher_refuses_nonempty_target():
+    with TempFile(2) as (dir_, (config, _)):
+        _config(config)
+        spec = ProjectSpec("proj", dir_)
+        context = VersionContext({}, [])
+        with pytest.raises(ValueError):
+            await Watcher(spec, config, context=context).start()
+        assert await Watcher(spec, config, context=context, force=True).start() == []
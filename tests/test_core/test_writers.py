@@ -0,0 +1,80 @@
+import asyncio
+import pathlib
+
+import pytest
+
+from tests.testutils.helpers import TempFile
+from vspy.core import writers
+from vspy.core.file_io import FileWriteJob, process_file_write_stream, read_file
+from vspy.core.writers import WRITERS, SyncWriter, ThreadWriter, writing
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("backend", sorted(WRITERS))
+async def test_writers_write_the_same(backend):
+    with TempFile(1) as (dir_, (src,)):
+        src.write_text("{{ name }}\nå\n")
+        jobs = [
+            FileWriteJob(src, pathlib.Path(dir_, "out", f"{i}.txt"), True)
+            for i in range(300)
+        ]
+        with writing(WRITERS[backend]()) as writer:
+            assert writers.current() is writer
+            await process_file_write_stream(jobs, args={"name": "x"})
+        assert writers.current() is not writer
+        for job in jobs:
+            assert await read_file(job.destination) == "x\nå\n"
+
+
+@pytest.mark.asyncio
+async def test_thread_writer_errors():
+    writer = ThreadWriter()
+    with TempFile(0) as (dir_, _):
+        with pytest.raises(FileNotFoundError):
+            await writer.write(pathlib.Path(dir_, "missing", "file"), "")
+        await writer.write(pathlib.Path(dir_, "file"), "ok")
+        with pytest.raises(ValueError):
+            await asyncio.wait_for(writer.write(pathlib.Path(dir_, "nul\0"), ""), 5)
+        await asyncio.wait_for(writer.write(pathlib.Path(dir_, "after"), "ok"), 5)
+        assert pathlib.Path(dir_, "after").read_text() == "ok"
+    writer.close()
+    assert writer._thread is None
+
+
+@pytest.mark.asyncio
+async def test_thread_writer_restarts():
+    writer = ThreadWriter()
+    with TempFile(0) as (dir_, _):
+        await writer.write(pathlib.Path(dir_, "a"), "a")
+        writer._queue.put(None)
+        writer._thread.join()
+        await asyncio.wait_for(writer.write(pathlib.Path(dir_, "b"), "b"), 5)
+        assert pathlib.Path(dir_, "b").read_text() == "b"
+    writer.close()
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("durability,files,dirs", [("none", 0, 0), ("file", 3, 1)])
+async def test_writer_durability(monkeypatch, durability, files, dirs):
+    calls = []
+    fsync = writers.os.fsync
+    monkeypatch.setattr(writers.os, "fsync", lambda fd: calls.append(fsync(fd)))
+    with TempFile(0) as (dir_, _):
+        with writing(ThreadWriter(durability)) as writer:
+            for i in range(3):
+                await writer.write(pathlib.Path(dir_, str(i)), "x")
+    assert len(calls) == files + (dirs if writers.os.name != "nt" else 0)
+
+
+@pytest.mark.asyncio
+async def test_writer_batch_durability(monkeypatch):
+    monkeypatch.setattr(writers, "_libc_syncfs", lambda: None)
+    synced = []
+    monkeypatch.setattr(writers, "fsync_path", synced.append)
+    with TempFile(0) as (dir_, _):
+        writer = SyncWriter("batch")
+        await writer.write(pathlib.Path(dir_, "a"), "x")
+        writer.close()
+    assert pathlib.Path(dir_, "a") in synced
+    with pytest.raises(ValueError):
+        SyncWriter("always")
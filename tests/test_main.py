@@ -0,0 +1,88 @@
+import pathlib
+import subprocess
+import sys
+from typing import Dict
+
+import pytest
+
+import vspy.core
+from tests.testutils.helpers import TempFile
+from vspy.core.args import Arguments
+from vspy.main import _check_target, compile_templates
+
+# Cumulative import time of `vspy.main` measured at ~25ms, against ~310ms when
+# every subsystem was imported eagerly. Generous to absorb slow CI machines.
+_IMPORT_BUDGET_US = 120_000
+
+_DEFERRED = ("httpx", "bs4", "jinja2", "aiofiles", "mypy_extensions", "asyncio")
+
+
+def _import_times(module: str) -> Dict[str, int]:
+    """Cumulative import time in microseconds of every module `module` loads."""
+    res = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        check=True,
+        stderr=subprocess.PIPE,
+        universal_newlines=True,
+    )
+    times = {}
+    for line in res.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line.split("|")
+        times[name.strip()] = int(cumulative)
+    return times
+
+
+def test_main_import_defers_subsystems():
+    times = _import_times("vspy.main")
+    assert not [module for module in _DEFERRED if module in times]
+
+
+def test_main_import_time_budget():
+    best = min(_import_times("vspy.main")["vspy.main"] for _ in range(3))
+    assert best < _IMPORT_BUDGET_US
+
+
+def test_core_lazy_attributes():
+    assert vspy.core.App.__name__ == "App"
+    assert vspy.core.generate.__module__ == "vspy.core.api"
+    with pytest.raises(AttributeError):
+        _ = vspy.core.Nothing  # type: ignore
+
+
+def test_compile_templates(capsys):
+    with TempFile(0) as (dir_, _):
+        compile_templates(["--output", dir_])
+        compiled = list(pathlib.Path(dir_).glob("t_*.py"))
+    assert compiled
+    assert f"Compiled {len(compiled)} templates" in capsys.readouterr().out
+
+
+def test_check_target(monkeypatch):
+    with TempFile(0) as (dir_, _):
+        args = Arguments.parse(["-s", "-n", "name", "-t", dir_])
+        assert _check_target(args) is None
+        args = Arguments.parse(
+            [
+                "-s",
+                "-n",
+                "name",
+                "-t",
+                dir_,
+                "--cache-dir",
+                "c",
+                "--write-backend",
+                "sync",
+            ]
+        )
+        assert _check_target(args) is not None
+        args = Arguments.parse(
+            ["-s", "-n", "name", "-t", "-", "--output-format", "zip"]
+        )
+        assert _check_target(args) is None
+    monkeypatch.setitem(sys.modules, "zstandard", None)
+    args = Arguments.parse(
+        ["-s", "-n", "name", "-t", "-", "--output-format", "tar.zst"]
+    )
+    assert "zstandard" in _check_target(args)
@@ -8,7 +8,8 @@ from typing import Dict, List, Tuple
 from pytest_httpx import HTTPXMock
 
 from tests.testutils.mocks import py_partial_page
-from vspy.core.file_io import path_from_root, read_file, read_json_file
+from vspy.core.file_io import read_file, read_json_file
+from vspy.core.resources import path_from_root
 
 
 def get_pypi_url_and_res(
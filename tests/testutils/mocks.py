@@ -1,6 +1,6 @@
 import sys
 from io import StringIO
-from typing import Dict, Iterable, List
+from typing import Dict, Iterable, List, Tuple
 
 from vspy.core.args import Arguments
 
@@ -65,6 +65,7 @@ class MockArguments(Arguments):
         author: str = "",
         email: str = "",
         keywords: str = "",
+        packages: Tuple[str, ...] = (),
         dev_packages: Dict[str, str] = {},
         py_versions: List[str] = [],
     ) -> None:
@@ -76,6 +77,7 @@ class MockArguments(Arguments):
         self._author = author
         self._email = email
         self._keywords = keywords
+        self._packages = packages
         self.dev_packages = dev_packages
         self.py_versions = py_versions
 
@@ -111,5 +113,9 @@ class MockArguments(Arguments):
     def keywords(self) -> str:
         return self._keywords
 
+    @property
+    def packages(self) -> Tuple[str, ...]:
+        return self._packages
+
 
 py_partial_page = """<html><body><div class="row active-release-list-widget"> <h2 class="widget-title">Active Python Releases</h2> <p class="success-quote"><a href="https://devguide.python.org/#status-of-python-branches">For more information visit the Python Developer's Guide</a>.</p><div class="list-row-headings"><span class="release-version">Python version</span><span class="release-status">Maintenance status</span><span class="release-start">First released</span><span class="release-end">End of support</span><span class="release-pep">Release schedule</span></div><ol class="list-row-container menu"><li><span class="release-version">3.10</span><span class="release-status">bugfix</span><span class="release-start">2021-10-04</span><span class="release-end">2026-10</span><span class="release-pep"><a href="https://www.python.org/dev/peps/pep-0619">PEP 619</a></span></li><li><span class="release-version">3.9</span><span class="release-status">security</span><span class="release-start">2020-10-05</span><span class="release-end">2025-10</span><span class="release-pep"><a href="https://www.python.org/dev/peps/pep-0596">PEP 596</a></span></li><li><span class="release-version">3.8</span><span class="release-status">security</span><span class="release-start">2019-10-14</span><span class="release-end">2024-10</span><span class="release-pep"><a href="https://www.python.org/dev/peps/pep-0569">PEP 569</a></span></li><li><span class="release-version">3.7</span><span class="release-status">security</span><span class="release-start">2018-06-27</span><span class="release-end">2023-06-27</span><span class="release-pep"><a href="https://www.python.org/dev/peps/pep-0537">PEP 537</a></span></li><li><span class="release-version">2.7</span><span class="release-status">end-of-life</span><span class="release-start">2010-07-03</span><span class="release-end">2020-01-01</span><span class="release-pep"><a href="https://www.python.org/dev/peps/pep-0373">PEP 373</a></span></li></ol></div></body></html>"""
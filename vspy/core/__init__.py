@@ -1,3 +1,52 @@
-from .app import App
+import importlib
+from typing import TYPE_CHECKING, Any
 
-__all__ = ["App"]
+if TYPE_CHECKING:
+    from .api import (
+        generate,
+        generate_batch,
+        generate_in_memory,
+        replay,
+        resolve_context,
+    )
+    from .app import App
+    from .args import ProjectSpec
+    from .context import RenderContext
+    from .memory import MemoryTree
+    from .project import VersionContext
+
+# Submodules are imported on first access, so the command line does not pay
+# for httpx, jinja2 and friends before its arguments are parsed.
+_LAZY = {
+    "App": ".app",
+    "MemoryTree": ".memory",
+    "ProjectSpec": ".args",
+    "RenderContext": ".context",
+    "VersionContext": ".project",
+    "generate": ".api",
+    "generate_batch": ".api",
+    "generate_in_memory": ".api",
+    "replay": ".api",
+    "resolve_context": ".api",
+}
+
+__all__ = [
+    "App",
+    "MemoryTree",
+    "ProjectSpec",
+    "RenderContext",
+    "VersionContext",
+    "generate",
+    "generate_batch",
+    "generate_in_memory",
+    "replay",
+    "resolve_context",
+]
+
+
+def __getattr__(name: str) -> Any:
+    if name not in _LAZY:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(_LAZY[name], __name__), name)
+    globals()[name] = value
+    return value
@@ -0,0 +1,170 @@
+import asyncio
+import pathlib
+from dataclasses import fields, replace
+from typing import TYPE_CHECKING, Iterable, List, Optional, Union
+
+from vspy.core import metrics, writers
+from vspy.core.app import App
+from vspy.core.args import ProjectSpec
+from vspy.core.cache import TreeCache
+from vspy.core.context import RenderContext
+from vspy.core.dedup import BlobStore
+from vspy.core.memory import MemoryTree, MemoryWriter
+from vspy.core.partial import PartialRenderer
+from vspy.core.plan import load_plan
+from vspy.core.project import VersionContext
+from vspy.core.resources import path_from_root
+from vspy.core.utils import is_empty_folder
+
+if TYPE_CHECKING:
+    from vspy.core.clients import AsyncClient
+
+_PROJECT_FIELDS = tuple(
+    field.name for field in fields(ProjectSpec) if field.name != "target"
+)
+
+
+def _prepare_target(target: Union[str, pathlib.Path]) -> pathlib.Path:
+    target_path = pathlib.Path(target)
+    if not writers.current().on_disk:
+        return target_path
+    target_path.mkdir(parents=True, exist_ok=True)
+    if not is_empty_folder(str(target)):
+        raise ValueError(f"Target {target} is either not a folder or nonempty.")
+    return target_path
+
+
+def default_config_path() -> pathlib.Path:
+    """Path to the configuration shipped with the package."""
+    return path_from_root("vspy", "resources", "data.json")
+
+
+async def resolve_context(
+    config_path: Optional[pathlib.Path] = None,
+    client: Optional["AsyncClient"] = None,
+) -> VersionContext:
+    """Resolve the versions needed by a configuration.
+
+    The result can be passed to any number of `generate` calls so the
+    requests are only made once.
+    """
+    plan = await load_plan(config_path or default_config_path())
+    return await VersionContext.resolve(plan.dev_dependencies, client)
+
+
+async def generate(
+    spec: ProjectSpec,
+    target: Optional[Union[str, pathlib.Path]] = None,
+    *,
+    context: Optional[VersionContext] = None,
+    client: Optional["AsyncClient"] = None,
+    config_path: Optional[pathlib.Path] = None,
+    cache: Optional[TreeCache] = None,
+    store: Optional[BlobStore] = None,
+    renderer: Optional[PartialRenderer] = None,
+) -> pathlib.Path:
+    """Generate a project without any prompts or argument parsing.
+
+    The `target` overrides the one in `spec` and is created if missing, but
+    must otherwise be empty. Safe to await concurrently for distinct targets,
+    sharing `context`, `client`, `cache`, `store` and `renderer`.
+    """
+    if target is not None:
+        spec = replace(spec, target=str(target))
+    target_path = _prepare_target(spec.target)
+    app = App(
+        spec,
+        config_path or default_config_path(),
+        context=context,
+        client=client,
+        cache=cache,
+        store=store,
+        renderer=renderer,
+    )
+    await app.start()
+    return target_path
+
+
+async def generate_in_memory(
+    spec: ProjectSpec,
+    *,
+    context: Optional[VersionContext] = None,
+    client: Optional["AsyncClient"] = None,
+    config_path: Optional[pathlib.Path] = None,
+    renderer: Optional[PartialRenderer] = None,
+) -> MemoryTree:
+    """Generate a project into memory, nothing is written to disk.
+
+    Paths in the returned tree are relative to the project root, the target
+    of `spec` is not used.
+    """
+    writer = MemoryWriter(pathlib.Path(spec.target))
+    app = App(
+        spec,
+        config_path or default_config_path(),
+        context=context,
+        client=client,
+        renderer=renderer,
+    )
+    with writers.writing(writer):
+        await app.start()
+    return writer.tree
+
+
+async def generate_batch(
+    specs: Iterable[ProjectSpec],
+    root: Union[str, pathlib.Path],
+    *,
+    context: Optional[VersionContext] = None,
+    client: Optional["AsyncClient"] = None,
+    config_path: Optional[pathlib.Path] = None,
+    store: Optional[BlobStore] = None,
+) -> List[pathlib.Path]:
+    """Generate a project for each spec in `root`, named by the spec.
+
+    Versions are resolved once and every template is partially evaluated
+    against them once, so each project only substitutes its own fields.
+    """
+    config_path = config_path or default_config_path()
+    if context is None:
+        context = await resolve_context(config_path, client)
+    renderer = PartialRenderer(context.template_args(), _PROJECT_FIELDS)
+    root_path = pathlib.Path(root)
+    return list(
+        await asyncio.gather(
+            *(
+                generate(
+                    spec,
+                    root_path.joinpath(spec.name),
+                    context=context,
+                    config_path=config_path,
+                    store=store,
+                    renderer=renderer,
+                )
+                for spec in specs
+            )
+        )
+    )
+
+
+async def replay(
+    context: Union[RenderContext, pathlib.Path],
+    target: Union[str, pathlib.Path],
+    cache: Optional[TreeCache] = None,
+    store: Optional[BlobStore] = None,
+) -> pathlib.Path:
+    """Generate a project from a recorded render context.
+
+    Neither the configuration nor the network is touched, so the output only
+    depends on the context.
+    """
+    target_path = _prepare_target(target)
+    try:
+        if not isinstance(context, RenderContext):
+            context = await RenderContext.read(context)
+        await context.render(target_path, cache, store)
+    except Exception:
+        metrics.inc("vspy_failures_total", stage="replay")
+        raise
+    metrics.inc("vspy_projects_generated_total")
+    return target_path
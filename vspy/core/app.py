@@ -1,64 +1,78 @@
-import asyncio
 import pathlib
-from typing import TYPE_CHECKING, List
+from typing import TYPE_CHECKING, Optional, Union
 
-from vspy.core.args import Arguments
-from vspy.core.file_io import (
-    FileWriteJob,
-    path_from_root,
-    read_json_file,
-    template_from_string,
-)
-from vspy.core.project import Project
+from vspy.core import metrics
+from vspy.core.args import Arguments, ProjectSpec
+from vspy.core.cache import TreeCache
+from vspy.core.dedup import BlobStore
+from vspy.core.partial import PartialRenderer
+from vspy.core.plan import load_plan
+from vspy.core.project import Project, VersionContext
+from vspy.core.trace import span
 from vspy.core.utils import clean_dir
 
 if TYPE_CHECKING:
-    from vspy.core.type_hints import ConfigData, JobJson
+    from vspy.core.clients import AsyncClient
+    from vspy.core.type_hints import ConfigData
 
 
 class App:
     """The runnable unit of the package."""
 
-    def __init__(self, args: Arguments, config_path: pathlib.Path) -> None:
-        """Initialize the application."""
+    def __init__(
+        self,
+        args: Union[Arguments, ProjectSpec],
+        config_path: pathlib.Path,
+        *,
+        context: Optional[VersionContext] = None,
+        client: Optional["AsyncClient"] = None,
+        emit_context: Optional[pathlib.Path] = None,
+        cache: Optional[TreeCache] = None,
+        store: Optional[BlobStore] = None,
+        renderer: Optional[PartialRenderer] = None,
+        plan_dir: Optional[pathlib.Path] = None,
+    ) -> None:
+        """Initialize the application.
+
+        If `emit_context` is set, the render context is written there before
+        any file is generated. A `cache` skips rendering of identical trees, a
+        `store` links identical outputs instead of writing them and a
+        `renderer` reuses templates partially evaluated for a whole batch.
+        Parsed configs are kept in `plan_dir` if given.
+        """
+        spec = args.spec if isinstance(args, Arguments) else args
         self._cfg_path = config_path
-        self._project = Project(args)
-        self._args = args
-        self._target = pathlib.Path(args.target)
+        self._project = Project(spec, client)
+        self._context = context
+        self._emit_context = emit_context
+        # How the context is rendered, in the order RenderContext.render takes.
+        self._render_with = (cache, store, renderer)
+        self._plan_dir = plan_dir
+        self._target = pathlib.Path(spec.target)
 
     async def start(self) -> None:
         """Start the application."""
-        dev_dep, jobs = await self._get_config_data()
-        await self._project.set_versions(dev_dep)
-        await self._project.create_project(jobs)
-
-    async def _get_config_data(self) -> "ConfigData":
-        data = await read_json_file(self._cfg_path)
-        dev: List[str] = data["dev-dependencies"]
-        jobs = await self._proces_file_write_jobs(data["jobs"])
-        return dev, jobs
+        try:
+            await self._start()
+        except Exception:
+            metrics.inc("vspy_failures_total", stage="generate")
+            raise
+        metrics.inc("vspy_projects_generated_total")
 
-    async def _proces_file_write_jobs(
-        self, jobs: List["JobJson"]
-    ) -> List[FileWriteJob]:
-        return await asyncio.gather(*(self._proces_file_write_job(job) for job in jobs))
+    async def _start(self) -> None:
+        with span("app.config"):
+            dev_dep, jobs = await self._get_config_data()
+        with span("app.versions"):
+            await self._project.set_versions(dev_dep, self._context)
+        context = self._project.render_context(jobs)
+        if self._emit_context is not None:
+            await context.write(self._emit_context)
+        with span("app.render"):
+            await context.render(self._target, *self._render_with)
 
-    async def _proces_file_write_job(self, job: "JobJson") -> FileWriteJob:
-        src = job["src"]
-        dst = job["dst"]
-        is_template = job["is_template"]
-        path_is_template = job["path_is_template"]
-        assert (
-            isinstance(src, str)
-            and isinstance(dst, str)
-            and isinstance(is_template, bool)
-            and isinstance(path_is_template, bool)
-        )
-        if path_is_template:
-            dst = await template_from_string(dst, {"name": self._args.name})
-        return FileWriteJob(
-            path_from_root(src), self._target.joinpath(dst), is_template
-        )
+    async def _get_config_data(self) -> "ConfigData":
+        plan = await load_plan(self._cfg_path, self._plan_dir)
+        return list(plan.dev_dependencies), await plan.bind(self._project.template_args)
 
     def cleanup(self) -> None:
         """Remove any created files."""
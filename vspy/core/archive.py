@@ -0,0 +1,111 @@
+import io
+import os
+import pathlib
+import sys
+import tarfile
+import zipfile
+from typing import IO, Iterable, Optional, Tuple
+
+from vspy.core.memory import MemoryTree, MemoryWriter
+from vspy.core.writers import fsync_path
+
+FORMATS = ("tar", "tar.zst", "zip")
+
+# 1980-01-01, the earliest time a zip entry can hold, given to every entry.
+_MTIME = 315532800
+
+_MODE = 0o644
+
+Entries = Iterable[Tuple[str, bytes]]
+
+
+def _write_tar(stream: IO[bytes], entries: Entries) -> None:
+    with tarfile.open(fileobj=stream, mode="w|", format=tarfile.PAX_FORMAT) as tar:
+        for name, data in entries:
+            info = tarfile.TarInfo(name)
+            info.size = len(data)
+            info.mtime = _MTIME
+            info.mode = _MODE
+            tar.addfile(info, io.BytesIO(data))
+
+
+def _write_tar_zst(stream: IO[bytes], entries: Entries) -> None:
+    # pylint: disable=import-outside-toplevel,import-error
+    import zstandard
+
+    with zstandard.ZstdCompressor().stream_writer(stream, closefd=False) as zst:
+        _write_tar(zst, entries)
+
+
+def _write_zip(stream: IO[bytes], entries: Entries) -> None:
+    # Built in memory as zipfile lays out unseekable streams differently.
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED) as archive:
+        for name, data in entries:
+            info = zipfile.ZipInfo(name, date_time=(1980, 1, 1, 0, 0, 0))
+            info.create_system = 3
+            info.external_attr = (0o100000 | _MODE) << 16
+            info.compress_type = zipfile.ZIP_DEFLATED
+            archive.writestr(info, data)
+    stream.write(buffer.getbuffer())
+
+
+_ARCHIVERS = {"tar": _write_tar, "tar.zst": _write_tar_zst, "zip": _write_zip}
+
+
+def unavailable(archive_format: str) -> Optional[str]:
+    """Why `archive_format` can not be written here, if it can not."""
+    if archive_format not in _ARCHIVERS:
+        return f"Unknown archive format {archive_format}"
+    if archive_format == "tar.zst":
+        try:
+            # pylint: disable=import-outside-toplevel,import-error,unused-import
+            import zstandard  # noqa: F401
+        except ImportError:
+            return "tar.zst archives need zstandard installed, see vspy[zst]."
+    return None
+
+
+class ArchiveWriter(MemoryWriter):
+    """Rendered files collected in memory and written as one archive on close.
+
+    Entries are named by their path relative to `root` and written sorted,
+    with a fixed time, owner and mode, so the same files always give a byte
+    identical archive. It goes to `output`, or stdout when that is "-".
+    """
+
+    def __init__(
+        self,
+        root: pathlib.Path,
+        output: str,
+        archive_format: str,
+        durability: str = "none",
+    ) -> None:
+        super().__init__(root, durability)
+        reason = unavailable(archive_format)
+        if reason is not None:
+            raise ValueError(reason)
+        self._output = output
+        self._archive = _ARCHIVERS[archive_format]
+
+    def close(self) -> None:
+        """Write the archive of everything added."""
+        super().close()
+        tree, self.tree = self.tree, MemoryTree()
+        entries = tree.items()
+        if self._output == "-":
+            self._archive(sys.stdout.buffer, entries)
+            sys.stdout.buffer.flush()
+            return
+        with open(self._output, "wb") as stream:
+            self._archive(stream, entries)
+            if self._durability != "none":
+                stream.flush()
+                os.fsync(stream.fileno())
+        if self._durability != "none" and os.name != "nt":
+            fsync_path(pathlib.Path(self._output).absolute().parent)
+
+    def discard(self) -> None:
+        """Drop what was added without writing an archive."""
+        super().discard()
+        self.tree = MemoryTree()
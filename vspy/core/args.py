@@ -1,7 +1,7 @@
 import argparse
 from dataclasses import dataclass
 from enum import IntEnum
-from typing import TYPE_CHECKING, Callable, Dict, List, Optional, Union
+from typing import TYPE_CHECKING, Callable, Dict, List, Optional, Tuple, Union
 
 if TYPE_CHECKING:
     from vspy.core.type_hints import ArgMap
@@ -29,7 +29,27 @@ def _validate_project_name(name: str) -> bool:
     return bool(name) and not set(name).intersection(bad)
 
 
-class Arguments:
+@dataclass(frozen=True)
+class ProjectSpec:  # pylint: disable=too-many-instance-attributes
+    """Plain description of a project, free of any command line handling."""
+
+    name: str
+    target: str = "."
+    description: str = ""
+    repository: str = ""
+    author: str = ""
+    email: str = ""
+    keywords: str = ""
+    packages: Tuple[str, ...] = ()
+
+    def __post_init__(self) -> None:
+        if not _validate_project_name(self.name):
+            raise ValueError("Name contains invalid characters")
+        if not all(map(_validate_project_name, self.packages)):
+            raise ValueError("Package name contains invalid characters")
+
+
+class Arguments:  # pylint: disable=too-many-public-methods
     """Command line argument handler."""
 
     _REQUIRED_ARGUMENTS = {
@@ -69,11 +89,85 @@ class Arguments:
         self._populate(args)
         self._prompt_remaining()
 
+    @property
+    def spec(self) -> ProjectSpec:
+        """The parsed arguments as a project spec."""
+        return ProjectSpec(
+            name=self.name,
+            target=self.target,
+            description=self.description,
+            repository=self.repository,
+            author=self.author,
+            email=self.email,
+            keywords=self.keywords,
+            packages=self.packages,
+        )
+
     @property
     def debug(self) -> bool:
         """Run in debug mode."""
         return self._bool_args["debug"]
 
+    @property
+    def context(self) -> Optional[str]:
+        """Recorded render context to generate from."""
+        return self._str_args.get("context")
+
+    @property
+    def emit_context(self) -> Optional[str]:
+        """Path to record the render context to."""
+        return self._str_args.get("emit_context")
+
+    @property
+    def cache_dir(self) -> Optional[str]:
+        """Directory of the rendered tree cache."""
+        return self._str_args.get("cache_dir")
+
+    @property
+    def cache_hardlink(self) -> bool:
+        """Hardlink cached files into the target instead of copying."""
+        return self._bool_args.get("cache_hardlink", False)
+
+    @property
+    def dedup_dir(self) -> Optional[str]:
+        """Directory of the shared output store."""
+        return self._str_args.get("dedup_dir")
+
+    @property
+    def dedup_mode(self) -> str:
+        """How outputs are linked from the shared output store."""
+        return self._str_args.get("dedup_mode", "hardlink")
+
+    @property
+    def write_backend(self) -> str:
+        """How rendered files are written."""
+        return self._str_args.get("write_backend", "aiofiles")
+
+    @property
+    def durability(self) -> str:
+        """How written files are persisted before exiting."""
+        return self._str_args.get("durability", "none")
+
+    @property
+    def output_format(self) -> str:
+        """Whether the target is a folder or an archive, "-" being stdout."""
+        return self._str_args.get("output_format", "dir")
+
+    @property
+    def profile(self) -> Optional[str]:
+        """Path to write a chrome trace of the run to."""
+        return self._str_args.get("profile")
+
+    @property
+    def monitor_loop(self) -> bool:
+        """Report event-loop lag and slow steps."""
+        return self._bool_args.get("monitor_loop", False)
+
+    @property
+    def metrics_textfile(self) -> Optional[str]:
+        """Path to write metrics in the Prometheus text format to."""
+        return self._str_args.get("metrics_textfile")
+
     @property
     def target(self) -> str:
         """Target path."""
@@ -109,6 +203,12 @@ class Arguments:
         """Project keywords."""
         return self._str_args.get("keywords", "")
 
+    @property
+    def packages(self) -> Tuple[str, ...]:
+        """Packages that fan-out jobs are repeated for."""
+        packages = self._str_args.get("packages", "").split(",")
+        return tuple(package.strip() for package in packages if package.strip())
+
     @property
     def _skip(self) -> bool:
         return self._bool_args["skip"]
@@ -136,6 +236,8 @@ class Arguments:
             self._add(key, val)
 
     def _prompt_remaining(self) -> None:
+        if self.context:
+            return
         self._prompt_group(Arguments._REQUIRED_ARGUMENTS)
         if not self._skip:
             print("Remaining fields can be empty")
@@ -168,7 +270,7 @@ class Arguments:
             dest="debug",
             action="store_true",
             default=False,
-            help="Run in debug mode in debug mode.",
+            help="Run in debug mode, printing a timing summary of each phase.",
         )
         parser.add_argument(
             "-s",
@@ -211,6 +313,12 @@ class Arguments:
             type=str,
             help="Comma separated list of keywords describing the project.",
         )
+        parser.add_argument(
+            "--packages",
+            dest="packages",
+            type=str,
+            help="Comma separated list of packages to fan out jobs over.",
+        )
         parser.add_argument(
             "--email",
             dest="email",
@@ -223,4 +331,82 @@ class Arguments:
             type=str,
             help="The description for the project.",
         )
+        parser.add_argument(
+            "--emit-context",
+            dest="emit_context",
+            type=str,
+            help="Write the render context to this json file.",
+        )
+        parser.add_argument(
+            "--context",
+            dest="context",
+            type=str,
+            help="Generate from a render context file, skipping prompts and requests.",
+        )
+        parser.add_argument(
+            "--cache-dir",
+            dest="cache_dir",
+            type=str,
+            help="Reuse identical rendered trees from this cache directory.",
+        )
+        parser.add_argument(
+            "--cache-hardlink",
+            dest="cache_hardlink",
+            default=False,
+            action="store_true",
+            help="Hardlink cached files (made read-only) instead of copying.",
+        )
+        parser.add_argument(
+            "--dedup-dir",
+            dest="dedup_dir",
+            type=str,
+            help="Store identical outputs once in this directory and link them.",
+        )
+        parser.add_argument(
+            "--dedup-mode",
+            dest="dedup_mode",
+            default="hardlink",
+            choices=("hardlink", "reflink"),
+            help="Link outputs from the dedup directory with hardlinks or reflinks.",
+        )
+        parser.add_argument(
+            "--write-backend",
+            dest="write_backend",
+            default="aiofiles",
+            choices=("aiofiles", "thread", "sync"),
+            help="Write files through aiofiles, one batching thread or in the loop.",
+        )
+        parser.add_argument(
+            "--durability",
+            dest="durability",
+            default="none",
+            choices=("none", "batch", "file"),
+            help="Persist the tree once at the end, or fsync every file.",
+        )
+        parser.add_argument(
+            "--output-format",
+            dest="output_format",
+            default="dir",
+            choices=("dir", "tar", "tar.zst", "zip"),
+            help="Write the target folder or stream an archive to it, - for stdout.",
+        )
+        parser.add_argument(
+            "--profile",
+            dest="profile",
+            type=str,
+            help="Write a Chrome trace (Perfetto compatible) of the run to this file.",
+        )
+        parser.add_argument(
+            "--monitor-loop",
+            dest="monitor_loop",
+            default=False,
+            action="store_true",
+            help="Report event-loop lag and steps that blocked the loop.",
+        )
+        parser.add_argument(
+            "--metrics-textfile",
+            dest="metrics_textfile",
+            type=str,
+            help="Write Prometheus metrics of the run to this textfile collector file.",
+        )
         return parser
@@ -0,0 +1,103 @@
+import asyncio
+import hashlib
+import os
+import pathlib
+import shutil
+import stat
+import uuid
+from dataclasses import replace
+from typing import TYPE_CHECKING, Iterable, List, Optional
+
+from vspy.core import writers
+
+if TYPE_CHECKING:
+    from vspy.core.context import RenderContext
+
+_WRITABLE = stat.S_IWUSR | stat.S_IWGRP | stat.S_IWOTH
+
+
+class TreeCache:
+    """Content addressed store of rendered project trees.
+
+    A tree is keyed by a digest of the render context and the content of every
+    source file it reads, so a hit is guaranteed to equal a fresh render.
+    Cached files are always read-only. With `hardlink` set they are linked
+    into targets, otherwise they are copied with the kernel's fast copy path.
+    """
+
+    def __init__(self, root: pathlib.Path, hardlink: bool = False) -> None:
+        self._root = root
+        self._hardlink = hardlink
+
+    async def key(self, context: "RenderContext") -> str:
+        """Digest of everything that affects the rendered output."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, self._key, context)
+
+    async def materialize(self, key: str, target: pathlib.Path) -> bool:
+        """Populate `target` from the cache, returns whether it was a hit.
+
+        The placed files are persisted by the current writer.
+        """
+        loop = asyncio.get_running_loop()
+        placed = await loop.run_in_executor(None, self._materialize, key, target)
+        if placed is None:
+            return False
+        await writers.current().track(placed)
+        return True
+
+    async def store(
+        self, key: str, target: pathlib.Path, files: Iterable[pathlib.Path]
+    ) -> None:
+        """Add rendered `files` from `target` to the cache under `key`."""
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(None, self._store, key, target, list(files))
+
+    def _key(self, context: "RenderContext") -> str:
+        if context.digest is None:
+            context = replace(context, digest=context.sources_digest())
+        return hashlib.sha256(context.dumps().encode("utf-8")).hexdigest()
+
+    def _materialize(
+        self, key: str, target: pathlib.Path
+    ) -> Optional[List[pathlib.Path]]:
+        tree = self._root.joinpath(key)
+        if not tree.is_dir():
+            return None
+        placed = []
+        for dir_path, _, file_names in os.walk(tree):
+            rel = pathlib.Path(dir_path).relative_to(tree)
+            target.joinpath(rel).mkdir(parents=True, exist_ok=True)
+            for file_name in file_names:
+                dst = target.joinpath(rel, file_name)
+                self._place(pathlib.Path(dir_path, file_name), dst)
+                placed.append(dst)
+        return placed
+
+    def _place(self, src: pathlib.Path, dst: pathlib.Path) -> None:
+        # Entries left writable by older versions are copied, not shared.
+        if self._hardlink and not src.stat().st_mode & _WRITABLE:
+            try:
+                os.link(src, dst)
+                return
+            except OSError:
+                pass
+        shutil.copyfile(src, dst)
+
+    def _store(
+        self, key: str, target: pathlib.Path, files: Iterable[pathlib.Path]
+    ) -> None:
+        tree = self._root.joinpath(key)
+        if tree.is_dir():
+            return
+        tmp = self._root.joinpath(f".tmp-{uuid.uuid4().hex}")
+        tmp.mkdir(parents=True)
+        for file in files:
+            dst = tmp.joinpath(file.relative_to(target))
+            dst.parent.mkdir(parents=True, exist_ok=True)
+            shutil.copyfile(file, dst)
+            dst.chmod(stat.S_IRUSR | stat.S_IRGRP | stat.S_IROTH)
+        try:
+            os.replace(tmp, tree)
+        except OSError:
+            shutil.rmtree(tmp, ignore_errors=True)
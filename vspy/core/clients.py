@@ -1,19 +1,114 @@
 import asyncio
-from typing import Awaitable, Dict, Iterable, List, Tuple
+from dataclasses import dataclass
+from types import TracebackType
+from typing import Awaitable, Dict, Iterable, List, Optional, Tuple, Type
 
 import httpx
-from bs4 import BeautifulSoup
 
+from vspy.core import metrics
+from vspy.core.limiter import THROTTLED, Limiter, retry_after
+from vspy.core.trace import span
+
+# Requests in flight by url, shared by every client so that generations
+# each making their own client still share them. Futures belong to a loop.
+_flights: Dict[
+    Tuple[asyncio.AbstractEventLoop, str], "asyncio.Future[httpx.Response]"
+] = {}
+
+
+@dataclass
+class RequestStats:
+    """Requests sent by a client, and those served by one already in flight."""
+
+    sent: int = 0
+    coalesced: int = 0
 
-class AsyncClient:
-    """Async client to make multiple requests."""
 
-    def __init__(self) -> None:
-        self._client = httpx.AsyncClient()
+def _land(
+    key: Tuple[asyncio.AbstractEventLoop, str],
+    flight: "asyncio.Future[httpx.Response]",
+) -> None:
+    if _flights.get(key) is flight:
+        del _flights[key]
+    if not flight.cancelled():
+        flight.exception()  # retrieved, even if every caller was cancelled
+
+
+class AsyncClient:
+    """Async client to make multiple requests.
+
+    Concurrent requests for the same url share a single request in flight,
+    whichever client of the process made it.
+    """
+
+    def __init__(
+        self,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+        limiter: Optional[Limiter] = None,
+    ) -> None:
+        """Initialize the client, `transport` replaces httpx's network transport.
+
+        Every request goes through `limiter`, by default one adapting its
+        concurrency to the servers with no rate cap.
+        """
+        self._client = httpx.AsyncClient(transport=transport)
+        self._limiter = limiter or Limiter()
+        self.stats = RequestStats()
+
+    async def __aenter__(self) -> "AsyncClient":
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc_value: Optional[BaseException],
+        traceback: Optional[TracebackType],
+    ) -> None:
+        await self.aclose()
+
+    async def aclose(self) -> None:
+        """Close the underlying connection pool."""
+        await self._client.aclose()
+
+    async def _send(self, url: str, host: str) -> httpx.Response:
+        attempt = 0
+        while True:
+            async with self._limiter.slot() as started:
+                with span("http.get", url=url), metrics.timer(
+                    "vspy_http_request_seconds", host=host
+                ):
+                    res = await self._client.get(url)
+            if res.status_code not in THROTTLED:
+                self._limiter.succeeded()
+                return res
+            metrics.inc("vspy_http_throttled_total", host=host)
+            if attempt >= self._limiter.retry.retries:
+                return res
+            delay = retry_after(res.headers.get("Retry-After"))
+            self._limiter.throttled(started, delay, attempt)
+            attempt += 1
 
     async def _get(self, url: str) -> httpx.Response:
-        res = await self._client.get(url)
-        res.raise_for_status()
+        key = (asyncio.get_running_loop(), url)
+        flight = _flights.get(key)
+        if flight is None:
+            flight = _flights[key] = asyncio.ensure_future(self._fetch(url))
+            flight.add_done_callback(lambda done: _land(key, done))
+            self.stats.sent += 1
+        else:
+            self.stats.coalesced += 1
+            metrics.inc("vspy_http_coalesced_total", host=httpx.URL(url).host)
+        # A cancelled caller leaves the request to the others waiting on it.
+        return await asyncio.shield(flight)
+
+    async def _fetch(self, url: str) -> httpx.Response:
+        host = httpx.URL(url).host
+        try:
+            res = await self._send(url, host)
+            res.raise_for_status()
+        except httpx.HTTPError:
+            metrics.inc("vspy_failures_total", stage="http", host=host)
+            raise
         return res
 
     async def get_json(self, url: str) -> dict:
@@ -53,15 +148,17 @@ class PythonVersionClient:
 
     async def active_python3_version(self) -> List[str]:
         """Get the current active python versions."""
-        soup = BeautifulSoup(
-            await self._client.get("https://www.python.org/downloads/"), "html.parser"
-        )
+        page = await self._client.get("https://www.python.org/downloads/")
+        from bs4 import BeautifulSoup  # pylint: disable=import-outside-toplevel
+
+        with span("html.parse"):
+            soup = BeautifulSoup(page, "html.parser")
         return [
-            span.text
-            for span in soup.select(
+            release.text
+            for release in soup.select(
                 "div.row.active-release-list-widget > ol > li > span.release-version"
             )
-            if span.text and not span.text.startswith("2")
+            if release.text and not release.text.startswith("2")
         ]
 
     def active_python3_version_task(self) -> Awaitable[List[str]]:
@@ -70,10 +167,16 @@ class PythonVersionClient:
 
 
 async def fetch_all_requests_data(
-    packages: Iterable[str],
+    packages: Iterable[str], client: Optional[AsyncClient] = None
 ) -> Tuple[Dict[str, str], List[str]]:
-    """Perform all the client calls."""
-    client = AsyncClient()
+    """Perform all the client calls.
+
+    A shared `client` is left open, otherwise a temporary one is created and
+    closed once the requests are done.
+    """
+    if client is None:
+        async with AsyncClient() as own_client:
+            return await fetch_all_requests_data(packages, own_client)
     pypi_cli = PyPiClient(client)
     py_cli = PythonVersionClient(client)
     res = await asyncio.gather(
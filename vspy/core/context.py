@@ -0,0 +1,156 @@
+import asyncio
+import hashlib
+import json
+import pathlib
+from dataclasses import dataclass, replace
+from typing import TYPE_CHECKING, Optional, Sequence
+
+from vspy import __version__
+from vspy.core import metrics
+from vspy.core.file_io import process_file_write_stream, read_json_file, write_file
+from vspy.core.loader import dependencies
+from vspy.core.resources import path_from_root, read_bytes
+from vspy.core.table import JobTable
+
+if TYPE_CHECKING:
+    from vspy.core.cache import TreeCache
+    from vspy.core.dedup import BlobStore
+    from vspy.core.partial import PartialRenderer
+    from vspy.core.type_hints import JobJson, TemplateArgs
+
+_CONTEXT_VERSION = 2
+
+
+def _within_target(dst: str) -> bool:
+    """Whether the destination `dst` stays inside the target it is joined to."""
+    windows = pathlib.PureWindowsPath(dst)
+    return not (
+        windows.drive
+        or windows.root
+        or pathlib.PurePosixPath(dst).is_absolute()
+        or ".." in windows.parts
+    )
+
+
+@dataclass(frozen=True)
+class RenderContext:
+    """The exact input of a render: template arguments and resolved jobs.
+
+    Sources are stored relative to the package root and destinations relative
+    to the target, so a recorded context can be replayed into any folder. The
+    jobs are kept in a `JobTable`, plain json jobs are converted on creation.
+    A written context holds the `digest` of its sources, and is refused once
+    they or vspy have changed, as the output would no longer be the same.
+    """
+
+    args: "TemplateArgs"
+    jobs: Sequence["JobJson"]
+    digest: Optional[str] = None
+
+    def __post_init__(self) -> None:
+        object.__setattr__(self, "jobs", JobTable.from_json(self.jobs))
+
+    @classmethod
+    async def read(cls, path: pathlib.Path) -> "RenderContext":
+        """Read a context previously written by `write`.
+
+        Raises `ValueError` if a destination is outside the target, or the
+        sources no longer match the digest.
+        """
+        data = await read_json_file(path)
+        if data.get("version") != _CONTEXT_VERSION:
+            raise ValueError(f"Unsupported context version in {path}")
+        for job in data["jobs"]:
+            if not _within_target(str(job["dst"])):
+                raise ValueError(f"Destination {job['dst']} in {path} is not relative")
+        context = cls(data["args"], data["jobs"], data.get("digest"))
+        if context.digest is None or context.digest != await context._sources_digest():
+            raise ValueError(f"Templates or vspy changed since {path} was recorded")
+        return context
+
+    async def write(self, path: pathlib.Path) -> None:
+        """Write the context as deterministic json, along with its digest."""
+        await write_file(path, (await self.pinned()).dumps())
+
+    async def pinned(self) -> "RenderContext":
+        """The context with the digest of its sources."""
+        if self.digest is not None:
+            return self
+        return replace(self, digest=await self._sources_digest())
+
+    def sources_digest(self) -> str:
+        """Digest of the vspy version and the content of every source.
+
+        Templates a source includes, imports or renders as a fragment count
+        as sources too, a missing one as empty.
+        """
+        files = {}
+        sources = set()
+        for src, _, is_template, _ in self._table.rows():
+            if src not in sources:
+                sources.add(src)
+                path = files[src] = path_from_root(src)
+                if is_template:
+                    files.update((dep.as_posix(), dep) for dep in dependencies(path))
+        digest = hashlib.sha256(__version__.encode("utf-8"))
+        for name in sorted(files):
+            digest.update(f"\x00{name}\x00".encode("utf-8"))
+            try:
+                digest.update(read_bytes(files[name]))
+            except OSError:
+                if name in sources:
+                    raise
+        return digest.hexdigest()
+
+    def dumps(self) -> str:
+        """Serialize the context, identical input gives identical output."""
+        data = {"version": _CONTEXT_VERSION, "args": self.args, "jobs": list(self.jobs)}
+        if self.digest is not None:
+            data["digest"] = self.digest
+        return json.dumps(data, indent=2, sort_keys=True) + "\n"
+
+    async def render(
+        self,
+        target: pathlib.Path,
+        cache: Optional["TreeCache"] = None,
+        store: Optional["BlobStore"] = None,
+        renderer: Optional["PartialRenderer"] = None,
+    ) -> None:
+        """Render the context into `target`, no prompts or requests are made.
+
+        With a `cache`, a previously rendered identical tree is reused instead.
+        Outputs are written through `store` and rendered by `renderer` when
+        given.
+        """
+        if cache is None:
+            await self._render(target, store, renderer)
+            return
+        key = await cache.key(self)
+        if await cache.materialize(key, target):
+            metrics.inc("vspy_cache_requests_total", result="hit")
+        else:
+            metrics.inc("vspy_cache_requests_total", result="miss")
+            await self._render(target, store, renderer)
+            await cache.store(key, target, self._table.destinations(target))
+
+    async def _sources_digest(self) -> str:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, self.sources_digest)
+
+    @property
+    def _table(self) -> JobTable:
+        assert isinstance(self.jobs, JobTable)
+        return self.jobs
+
+    async def _render(
+        self,
+        target: pathlib.Path,
+        store: Optional["BlobStore"],
+        renderer: Optional["PartialRenderer"],
+    ) -> None:
+        await process_file_write_stream(
+            self._table.write_jobs(target),
+            args=dict(self.args),
+            store=store,
+            renderer=renderer,
+        )
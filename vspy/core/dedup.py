@@ -0,0 +1,91 @@
+import asyncio
+import errno
+import hashlib
+import os
+import pathlib
+import shutil
+import stat
+import sys
+import uuid
+from dataclasses import dataclass
+from typing import ClassVar, Tuple
+
+from vspy.core import writers
+
+_FICLONE = 0x40049409
+_READ_ONLY = stat.S_IRUSR | stat.S_IRGRP | stat.S_IROTH
+
+
+def _reflink(src: pathlib.Path, dst: pathlib.Path) -> None:
+    """Copy-on-write clone of `src`, raises `OSError` where unsupported."""
+    if not sys.platform.startswith("linux"):
+        raise OSError(errno.EOPNOTSUPP, "reflinks are only supported on linux")
+    import fcntl  # pylint: disable=import-outside-toplevel
+
+    with open(src, "rb") as src_file, open(dst, "wb") as dst_file:
+        try:
+            fcntl.ioctl(dst_file.fileno(), _FICLONE, src_file.fileno())
+        except OSError:
+            dst_file.close()
+            dst.unlink()
+            raise
+
+
+@dataclass(frozen=True)
+class BlobStore:
+    """Store identical outputs once and link them into each project.
+
+    Blobs are addressed by the sha256 of their content and made read-only, so
+    writing through a hardlinked output fails instead of silently changing
+    every project sharing it. The `reflink` mode clones blobs copy-on-write,
+    which keeps outputs independently writable. Either mode falls back to a
+    plain copy across filesystems or when the link limit is reached.
+    """
+
+    MODES: ClassVar[Tuple[str, ...]] = ("hardlink", "reflink")
+
+    root: pathlib.Path
+    mode: str = "hardlink"
+
+    def __post_init__(self) -> None:
+        if self.mode not in BlobStore.MODES:
+            raise ValueError(f"Unknown dedup mode {self.mode}")
+
+    async def place(self, file: pathlib.Path, content: str) -> None:
+        """Write `content` to `file` through the store.
+
+        The file is persisted by the current writer.
+        """
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(None, self._place, file, content.encode("utf-8"))
+        await writers.current().track([file])
+
+    def _place(self, file: pathlib.Path, data: bytes) -> None:
+        blob = self._blob(data)
+        file.parent.mkdir(parents=True, exist_ok=True)
+        tmp = file.with_name(f".{file.name}.{uuid.uuid4().hex}")
+        try:
+            if self.mode == "reflink":
+                _reflink(blob, tmp)
+            else:
+                os.link(blob, tmp)
+        except OSError:
+            shutil.copyfile(blob, tmp)
+        os.replace(tmp, file)
+        if tmp.exists():  # renaming onto a link to the same blob is a no-op
+            tmp.unlink()
+
+    def _blob(self, data: bytes) -> pathlib.Path:
+        digest = hashlib.sha256(data).hexdigest()
+        blob = self.root.joinpath(digest[:2], digest[2:])
+        try:
+            if blob.stat().st_size == len(data):
+                return blob
+        except FileNotFoundError:
+            pass
+        blob.parent.mkdir(parents=True, exist_ok=True)
+        tmp = blob.with_name(f".tmp-{uuid.uuid4().hex}")
+        tmp.write_bytes(data)
+        tmp.chmod(_READ_ONLY)
+        os.replace(tmp, blob)
+        return blob
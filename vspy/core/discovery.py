@@ -0,0 +1,118 @@
+import asyncio
+import hashlib
+import marshal
+import os
+import pathlib
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+from vspy.core.utils import read_cached, write_cached
+
+_INDEX_VERSION = 1
+
+_indexes: Dict[str, "TreeIndex"] = {}
+
+
+@dataclass(frozen=True)
+class TreeIndex:
+    """Files of a directory tree along with the mtime of every directory.
+
+    Adding, removing or renaming an entry changes the mtime of its directory,
+    so the index is current as long as every directory stat matches, without
+    listing any of them again.
+    """
+
+    dirs: Tuple[Tuple[str, int], ...]
+    files: Tuple[str, ...]
+
+    @classmethod
+    def scan(cls, root: pathlib.Path) -> "TreeIndex":
+        """Walk `root` once, files are posix paths relative to it in order."""
+        dirs: List[Tuple[str, int]] = []
+        files: List[str] = []
+        pending = [""]
+        while pending:
+            rel = pending.pop()
+            path = root.joinpath(rel) if rel else root
+            dirs.append((rel, os.stat(path).st_mtime_ns))
+            with os.scandir(path) as entries:
+                for entry in entries:
+                    name = f"{rel}/{entry.name}" if rel else entry.name
+                    if entry.is_dir():
+                        pending.append(name)
+                    else:
+                        files.append(name)
+        return cls(tuple(sorted(dirs)), tuple(sorted(files)))
+
+    def is_current(self, root: pathlib.Path) -> bool:
+        """Whether no directory of the tree has changed since the scan."""
+        try:
+            return all(
+                os.stat(root.joinpath(rel) if rel else root).st_mtime_ns == mtime
+                for rel, mtime in self.dirs
+            )
+        except OSError:
+            return False
+
+    def dumps(self) -> bytes:
+        """The index as marshal data, for `loads` on the same python version."""
+        return marshal.dumps((_INDEX_VERSION, self.dirs, self.files))
+
+    @classmethod
+    def loads(cls, data: bytes) -> "TreeIndex":
+        """Index from the data of `dumps`, `ValueError` for another version."""
+        version, dirs, files = marshal.loads(data)
+        if version != _INDEX_VERSION:
+            raise ValueError("Unsupported index version")
+        return cls(tuple(map(tuple, dirs)), tuple(files))
+
+
+def _index_file(key: str, cache_dir: pathlib.Path) -> pathlib.Path:
+    digest = hashlib.sha256(f"{_INDEX_VERSION}\x00{key}".encode()).hexdigest()
+    return cache_dir.joinpath(f"{digest}.index")
+
+
+def _discover(root: pathlib.Path, cache_dir: Optional[pathlib.Path]) -> TreeIndex:
+    key = str(root.resolve())
+    index = _indexes.get(key)
+    if index is None and cache_dir is not None:
+        index = read_cached(_index_file(key, cache_dir), TreeIndex.loads)
+    if index is None or not index.is_current(root):
+        index = TreeIndex.scan(root)
+        if cache_dir is not None:
+            write_cached(_index_file(key, cache_dir), index.dumps())
+    _indexes[key] = index
+    return index
+
+
+async def discover(
+    root: pathlib.Path, cache_dir: Optional[pathlib.Path] = None
+) -> Tuple[str, ...]:
+    """Files in the tree at `root`, relative to it.
+
+    The tree is only walked again once one of its directories has changed.
+    Indexes are kept for the life of the process and, with a `cache_dir`, on
+    disk keyed by the root.
+    """
+    index = await asyncio.get_running_loop().run_in_executor(
+        None, _discover, root, cache_dir
+    )
+    return index.files
+
+
+async def directories(
+    root: pathlib.Path, cache_dir: Optional[pathlib.Path] = None
+) -> Tuple[pathlib.Path, ...]:
+    """Every directory of the tree at `root`, the root included.
+
+    A file added to or removed from the tree changes the mtime of one of them.
+    """
+    index = await asyncio.get_running_loop().run_in_executor(
+        None, _discover, root, cache_dir
+    )
+    return tuple(root.joinpath(rel) if rel else root for rel, _ in index.dirs)
+
+
+def clear() -> None:
+    """Forget the indexes kept in memory."""
+    _indexes.clear()
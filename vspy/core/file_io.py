@@ -1,38 +1,58 @@
 import asyncio
+import itertools
 import json
 import pathlib
 from dataclasses import dataclass
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Dict, Iterable, Optional
 
 import aiofiles
-from jinja2 import BaseLoader, Environment
+from jinja2 import Template
+
+from vspy.core import metrics, precompiled, writers
+from vspy.core.monitor import labelled
+from vspy.core.resources import read_packaged
+from vspy.core.trace import span
 
 if TYPE_CHECKING:
-    from vspy.core.type_hints import TemplateArgs
+    from vspy.core.dedup import BlobStore
+    from vspy.core.partial import PartialRenderer
+    from vspy.core.type_hints import JobVariables, TemplateArgs
+
+_env = precompiled.environment()
 
-_env = Environment(loader=BaseLoader(), enable_async=True, keep_trailing_newline=True)
+_templates: Dict[str, Template] = {}
 
-_ROOT_DIR = pathlib.Path(__file__).parent.parent.parent
+_STREAM_BATCH = 256
 
 
 @dataclass
 class FileWriteJob:
-    """A job unit for processing a template file."""
+    """A job unit for processing a template file.
+
+    The `variables` of a fan-out job are added to the template arguments.
+    """
 
     source: pathlib.Path
     destination: pathlib.Path
     is_template: bool = False
+    variables: Optional["JobVariables"] = None
 
 
 async def write_file(file: pathlib.Path, content: str) -> None:
-    """Asynchronous file writing."""
-    file.parent.mkdir(exist_ok=True)
-    async with aiofiles.open(file.as_posix(), "w", encoding="utf-8") as file_ctx:
-        await file_ctx.write(content)
+    """Asynchronous file writing, through the current `writers.Writer`."""
+    writer = writers.current()
+    if writer.on_disk:
+        with span("io.mkdir", path=file.parent.as_posix()):
+            file.parent.mkdir(parents=True, exist_ok=True)
+    with span("io.write", path=file.as_posix()):
+        await writer.write(file, content)
 
 
 async def read_file(file: pathlib.Path) -> str:
-    """Asynchronous file reading."""
+    """Asynchronous file reading, files within a zipapp are read from memory."""
+    data = read_packaged(file)
+    if data is not None:
+        return data.decode("utf-8")
     async with aiofiles.open(file.as_posix(), "r", encoding="utf-8") as file_ctx:
         return await file_ctx.read()
 
@@ -46,24 +66,76 @@ async def read_json_file(file: pathlib.Path) -> dict:
 
 async def template_from_string(string: str, variables: "TemplateArgs") -> str:
     """Jinja2 wrapper for string templating."""
-    return await _env.from_string(string).render_async(**variables)
-
-
-async def process_file_write_job(job: FileWriteJob, args: "TemplateArgs") -> None:
-    """Process a single file write job."""
-    txt = await read_file(job.source)
-    if job.is_template:
-        txt = await template_from_string(txt, args)
-    await write_file(job.destination, txt)
-
-
-async def process_file_write_jobs(*jobs: FileWriteJob, args: "TemplateArgs") -> None:
+    with span("template.compile"):
+        template = _templates.get(string)
+        if template is None:
+            template = precompiled.load(_env, string) or _env.from_string(string)
+            _templates[string] = template
+    with span("template.render"):
+        return await template.render_async(**variables)
+
+
+async def process_file_write_job(
+    job: FileWriteJob,
+    args: "TemplateArgs",
+    store: Optional["BlobStore"] = None,
+    renderer: Optional["PartialRenderer"] = None,
+) -> None:
+    """Process a single file write job, deduplicated through `store` if given."""
+    dst = job.destination.as_posix()
+    if job.variables:
+        args = {**args, **job.variables}
+    with span("job", src=job.source.name, dst=dst), labelled(dst):
+        if renderer is None:
+            txt = await read_file(job.source)
+            if job.is_template:
+                with metrics.timer(
+                    "vspy_template_render_seconds", template=job.source.name
+                ):
+                    txt = await template_from_string(txt, args)
+        else:
+            with metrics.timer(
+                "vspy_template_render_seconds", template=job.source.name
+            ):
+                txt = await renderer.render(job, args)
+        if store is None:
+            await write_file(job.destination, txt)
+        else:
+            await store.place(job.destination, txt)
+        if metrics.enabled():
+            metrics.inc("vspy_files_written_total")
+            metrics.inc("vspy_bytes_written_total", len(txt.encode("utf-8")))
+
+
+async def process_file_write_jobs(
+    *jobs: FileWriteJob,
+    args: "TemplateArgs",
+    store: Optional["BlobStore"] = None,
+    renderer: Optional["PartialRenderer"] = None,
+) -> None:
     """Process multiple file write jobs."""
     await asyncio.gather(
-        *(asyncio.create_task(process_file_write_job(job, args)) for job in jobs)
+        *(
+            asyncio.create_task(process_file_write_job(job, args, store, renderer))
+            for job in jobs
+        )
     )
 
 
-def path_from_root(*args: str) -> pathlib.Path:
-    """Get file relative to project root."""
-    return _ROOT_DIR.joinpath(*args)
+async def process_file_write_stream(
+    jobs: Iterable[FileWriteJob],
+    args: "TemplateArgs",
+    store: Optional["BlobStore"] = None,
+    renderer: Optional["PartialRenderer"] = None,
+) -> None:
+    """Process jobs in bounded batches, consuming `jobs` lazily.
+
+    Only a batch of jobs, and of open files, is alive at any time however
+    large the pack is.
+    """
+    iterator = iter(jobs)
+    while True:
+        batch = list(itertools.islice(iterator, _STREAM_BATCH))
+        if not batch:
+            return
+        await process_file_write_jobs(*batch, args=args, store=store, renderer=renderer)
@@ -0,0 +1,152 @@
+import asyncio
+import email.utils
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from typing import AsyncIterator, Deque, Optional
+
+# Statuses a server answers with when it wants fewer requests.
+THROTTLED = frozenset((429, 503))
+
+
+def retry_after(value: Optional[str]) -> Optional[float]:
+    """Seconds to wait given a `Retry-After` header, in seconds or as a date."""
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        date = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, date.timestamp() - time.time())
+
+
+@dataclass(frozen=True)
+class Retry:
+    """How often a throttled request is retried, and how long it pauses first."""
+
+    retries: int = 3
+    backoff: float = 0.5
+    max_delay: float = 60.0
+
+    def delay(self, attempt: int, requested: Optional[float]) -> float:
+        """The delay `requested` by the server, or an exponential backoff."""
+        if requested is None:
+            requested = self.backoff * 2**attempt
+        return min(requested, self.max_delay)
+
+
+class _Pacer:
+    """Start times of requests, paused on throttling and spaced by a rate."""
+
+    def __init__(self, rate: Optional[float]) -> None:
+        self._rate = rate
+        self._next = 0.0
+        self._resume_at = 0.0
+
+    def pause(self, until: float) -> None:
+        """Start no request before `until`."""
+        self._resume_at = max(self._resume_at, until)
+
+    async def wait(self) -> float:
+        """Wait for a request to be allowed, returns its start time."""
+        while True:
+            now = time.monotonic()
+            start = max(now, self._resume_at)
+            if self._rate is not None:
+                start = max(start, self._next)
+                self._next = start + 1 / self._rate
+            if start > now:
+                await asyncio.sleep(start - now)
+            if self._resume_at <= time.monotonic():
+                return start
+
+
+class Limiter:
+    """Concurrency and rate limits shared by every request of a client.
+
+    The number of requests in flight adapts to the server: it grows by one
+    for each window of successful requests and halves when the server
+    throttles, at most once per window. A throttled request pauses every
+    request for as long as `retry` says. With a `rate`, requests are also
+    spaced to at most that many per second.
+    """
+
+    def __init__(
+        self,
+        concurrency: int = 16,
+        max_concurrency: int = 64,
+        rate: Optional[float] = None,
+        retry: Retry = Retry(),
+    ) -> None:
+        if not 1 <= concurrency <= max_concurrency:
+            raise ValueError("Concurrency must be within 1 and max_concurrency")
+        if rate is not None and rate <= 0:
+            raise ValueError("Rate must be positive")
+        self.retry = retry
+        self._limit = float(concurrency)
+        self._max = max_concurrency
+        self._pacer = _Pacer(rate)
+        self._inflight = 0
+        self._waiters: Deque["asyncio.Future[None]"] = deque()
+        self._decreased_at = 0.0
+
+    @property
+    def limit(self) -> int:
+        """Requests currently allowed in flight."""
+        return int(self._limit)
+
+    @asynccontextmanager
+    async def slot(self) -> AsyncIterator[float]:
+        """Hold a request slot, yielding the time the request may start."""
+        await self._acquire()
+        try:
+            yield await self._pacer.wait()
+        finally:
+            self._inflight -= 1
+            self._wake()
+
+    def succeeded(self) -> None:
+        """Additive increase, a whole slot once `limit` requests succeed."""
+        if self._limit < self._max:
+            self._limit = min(self._max, self._limit + 1 / self._limit)
+            self._wake()
+
+    def throttled(self, started: float, delay: Optional[float], attempt: int) -> None:
+        """Multiplicative decrease and a pause of every request.
+
+        Requests started before the last decrease were sent at the old limit,
+        so their throttling does not decrease it again.
+        """
+        now = time.monotonic()
+        if started >= self._decreased_at:
+            self._limit = max(1.0, self._limit / 2)
+            self._decreased_at = now
+        self._pacer.pause(now + self.retry.delay(attempt, delay))
+
+    async def _acquire(self) -> None:
+        while self._inflight >= self.limit:
+            waiter = asyncio.get_running_loop().create_future()
+            self._waiters.append(waiter)
+            try:
+                await waiter
+            except asyncio.CancelledError:
+                if waiter.done() and not waiter.cancelled():
+                    # Woken then cancelled, hand the slot on.
+                    self._wake()
+                raise
+            finally:
+                if waiter in self._waiters:
+                    self._waiters.remove(waiter)
+        self._inflight += 1
+
+    def _wake(self) -> None:
+        free = self.limit - self._inflight
+        while free > 0 and self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                free -= 1
@@ -0,0 +1,153 @@
+import json
+import pathlib
+from typing import Callable, Dict, Iterator, List, Optional, Set, Tuple
+
+from jinja2 import (
+    BaseLoader,
+    Environment,
+    TemplateNotFound,
+    TemplateSyntaxError,
+    meta,
+    nodes,
+    pass_context,
+)
+from jinja2.runtime import Context
+
+from vspy.core.resources import path_from_root, read_bytes
+from vspy.core.utils import mtime_ns
+
+# Fragments are memoised for every distinct set of inputs seen, dropped all
+# at once past this many so a long batch or watch session stays bounded.
+_FRAGMENT_LIMIT = 4096
+
+_fragments: Dict[Tuple[str, str], str] = {}
+
+_inputs: Dict[str, Tuple[Callable[[], bool], Optional[Tuple[str, ...]]]] = {}
+
+_parser = Environment()
+
+
+class PackLoader(BaseLoader):
+    """Load included and imported templates by their path from the package root.
+
+    Names are the paths used as sources in a config, absolute paths included,
+    and templates are reloaded once their file changes.
+    """
+
+    def get_source(
+        self, environment: Environment, template: str
+    ) -> Tuple[str, Optional[str], Callable[[], bool]]:
+        path = path_from_root(template)
+        mtime = mtime_ns(path)
+        try:
+            source = read_bytes(path).decode("utf-8")
+        except OSError as exc:
+            raise TemplateNotFound(template) from exc
+        return source, path.as_posix(), lambda: mtime_ns(path) == mtime
+
+
+def referenced(ast: nodes.Template) -> Iterator[Optional[str]]:
+    """Templates included, imported, extended or rendered as fragments by `ast`.
+
+    Names only known while rendering are given as `None`.
+    """
+    yield from meta.find_referenced_templates(ast)
+    for call in ast.find_all(nodes.Call):
+        if isinstance(call.node, nodes.Name) and call.node.name == "fragment":
+            name = call.args[0] if call.args else None
+            if isinstance(name, nodes.Const) and isinstance(name.value, str):
+                yield name.value
+            else:
+                yield None
+
+
+def dependencies(source: pathlib.Path) -> Set[pathlib.Path]:
+    """Templates used by the template at `source`, recursively.
+
+    Names computed while rendering can not be known and are not followed,
+    nor are templates that can not be read or parsed.
+    """
+    found: Set[pathlib.Path] = set()
+    pending = [source]
+    while pending:
+        try:
+            ast = _parser.parse(read_bytes(pending.pop()).decode("utf-8"))
+        except (OSError, UnicodeDecodeError, TemplateSyntaxError):
+            continue
+        for name in referenced(ast):
+            path = path_from_root(name) if name is not None else None
+            if path is not None and path not in found:
+                found.add(path)
+                pending.append(path)
+    found.discard(source)
+    return found
+
+
+def _template_inputs(
+    env: Environment, name: str
+) -> Tuple[Callable[[], bool], Optional[Tuple[str, ...]]]:
+    """Variables read by template `name` and all it includes, if knowable.
+
+    Given along with a check that none of those templates has changed since.
+    """
+    assert env.loader is not None
+    inputs: Optional[Set[str]] = set()
+    checks: List[Callable[[], bool]] = []
+    pending, seen = [name], {name}
+    while pending:
+        source, _, uptodate = env.loader.get_source(env, pending.pop())
+        if uptodate is not None:
+            checks.append(uptodate)
+        ast = env.parse(source)
+        if inputs is not None:
+            inputs.update(meta.find_undeclared_variables(ast).difference(env.globals))
+        for included in referenced(ast):
+            if included is None:
+                inputs = None
+            elif included not in seen:
+                seen.add(included)
+                pending.append(included)
+    return (
+        lambda: all(check() for check in checks),
+        None if inputs is None else tuple(sorted(inputs)),
+    )
+
+
+def template_inputs(env: Environment, name: str) -> Optional[Tuple[str, ...]]:
+    """Variables read by template `name` and all it uses, `None` if unknowable."""
+    known = _inputs.get(name)
+    if known is None or not known[0]():
+        # An edited fragment may be memoised under the same inputs.
+        _fragments.clear()
+        known = _inputs[name] = _template_inputs(env, name)
+    return known[1]
+
+
+@pass_context
+async def fragment(context: Context, name: str) -> str:
+    """Template `name` rendered with the variables of the calling template.
+
+    The output is memoised on the values of the variables the fragment reads,
+    so a block only using the shared context is rendered once per batch and
+    one using project fields once per project, rather than once per file.
+    """
+    env = context.environment
+    inputs = template_inputs(env, name)
+    if inputs is None:
+        return await env.get_template(name).render_async(context.get_all())
+    values = json.dumps(
+        [context.get(key) for key in inputs], sort_keys=True, default=repr
+    )
+    txt = _fragments.get((name, values))
+    if txt is None:
+        txt = await env.get_template(name).render_async(context.get_all())
+        if len(_fragments) >= _FRAGMENT_LIMIT:
+            _fragments.clear()
+        _fragments[(name, values)] = txt
+    return txt
+
+
+def clear() -> None:
+    """Forget the memoised fragments."""
+    _fragments.clear()
+    _inputs.clear()
@@ -0,0 +1,99 @@
+import hashlib
+import pathlib
+from typing import Dict, Iterator, Mapping, Tuple
+
+from vspy.core.writers import AiofilesWriter, Writer
+
+
+class MemoryTree(Mapping[str, bytes]):
+    """Files of a generated project, by posix path relative to its root.
+
+    Contents are appended to a single buffer, identical contents only once,
+    so a project costs little more than its distinct bytes. Paths iterate
+    sorted whatever order the files were rendered in.
+    """
+
+    __slots__ = ("_data", "_spans", "_offsets")
+
+    def __init__(self) -> None:
+        self._data = bytearray()
+        self._spans: Dict[str, Tuple[int, int]] = {}
+        self._offsets: Dict[bytes, int] = {}
+
+    def add(self, path: str, content: bytes) -> None:
+        """Hold `content` as the file at `path`, replacing any before."""
+        digest = hashlib.sha256(content).digest()
+        offset = self._offsets.get(digest)
+        if offset is None:
+            offset = self._offsets[digest] = len(self._data)
+            self._data += content
+        self._spans[path] = (offset, len(content))
+
+    def __getitem__(self, path: str) -> bytes:
+        offset, size = self._spans[path]
+        end = offset + size
+        return bytes(self._data[offset:end])
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(sorted(self._spans))
+
+    def __len__(self) -> int:
+        return len(self._spans)
+
+    def __repr__(self) -> str:
+        return f"MemoryTree({len(self)} files, {self.nbytes} bytes)"
+
+    @property
+    def nbytes(self) -> int:
+        """Size of the stored contents, shared ones counted once."""
+        return len(self._data)
+
+    def text(self, path: str) -> str:
+        """The file at `path` as text."""
+        return self[path].decode("utf-8")
+
+    def write(self, target: pathlib.Path) -> None:
+        """Write every file under `target`."""
+        for path in self:
+            file = target.joinpath(path)
+            file.parent.mkdir(parents=True, exist_ok=True)
+            file.write_bytes(self[path])
+
+
+class MemoryWriter(Writer):
+    """Files under `root` kept in `tree` rather than written.
+
+    Files outside `root`, such as an emitted context, are written to disk.
+    """
+
+    on_disk = False
+
+    def __init__(self, root: pathlib.Path, durability: str = "none") -> None:
+        super().__init__(durability)
+        self._root = root
+        self.tree = MemoryTree()
+        self._disk = AiofilesWriter(durability)
+
+    async def write(self, file: pathlib.Path, content: str) -> None:
+        """Add `content` to the tree, or write it if outside the root.
+
+        Nothing is kept to persist on close, the disk writer does so itself.
+        """
+        await self._write(file, content, False)
+
+    async def _write(self, file: pathlib.Path, content: str, fsync: bool) -> None:
+        try:
+            path = file.relative_to(self._root).as_posix()
+        except ValueError:
+            file.parent.mkdir(parents=True, exist_ok=True)
+            await self._disk.write(file, content)
+            return
+        self.tree.add(path, content.encode("utf-8"))
+
+    def close(self) -> None:
+        """Persist what was written to disk, the tree is left as is."""
+        self._disk.close()
+
+    def discard(self) -> None:
+        """Release the disk writer after a failed run."""
+        self._disk.discard()
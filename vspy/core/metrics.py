@@ -0,0 +1,171 @@
+import asyncio
+import bisect
+import os
+import pathlib
+import time
+import uuid
+from contextlib import contextmanager, nullcontext
+from dataclasses import dataclass, field
+from typing import ContextManager, Dict, Iterator, List, Optional, Tuple
+
+_NULL_TIMER: ContextManager[None] = nullcontext()
+
+_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+METRICS = {
+    "vspy_projects_generated_total": ("counter", "Projects generated."),
+    "vspy_files_written_total": ("counter", "Files written."),
+    "vspy_bytes_written_total": ("counter", "Bytes of file content written."),
+    "vspy_template_render_seconds": ("histogram", "Render time per template."),
+    "vspy_http_request_seconds": ("histogram", "HTTP request latency per host."),
+    "vspy_http_throttled_total": ("counter", "HTTP responses asking to slow down."),
+    "vspy_http_coalesced_total": ("counter", "HTTP requests joined to one in flight."),
+    "vspy_cache_requests_total": ("counter", "Rendered tree cache lookups."),
+    "vspy_version_contexts_total": ("counter", "Version contexts by origin."),
+    "vspy_failures_total": ("counter", "Failures by stage."),
+}
+
+_Labels = Tuple[Tuple[str, str], ...]
+
+
+def _format_labels(labels: _Labels, extra: str = "") -> str:
+    parts = [f'{key}="{val}"' for key, val in labels]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+@dataclass
+class _Histogram:
+    """Observation counts per bucket of one series, and their sum."""
+
+    counts: List[int] = field(default_factory=lambda: [0] * (len(_BUCKETS) + 1))
+    total: float = 0.0
+
+    def observe(self, value: float) -> None:
+        """Count `value` in the first bucket it does not exceed."""
+        self.counts[bisect.bisect_left(_BUCKETS, value)] += 1
+        self.total += value
+
+
+class Registry:
+    """Counters and histograms in the Prometheus text exposition format."""
+
+    def __init__(self) -> None:
+        self._counters: Dict[str, Dict[_Labels, float]] = {}
+        self._histograms: Dict[str, Dict[_Labels, _Histogram]] = {}
+
+    def inc(self, name: str, amount: float = 1.0, **labels: str) -> None:
+        """Increase counter `name`."""
+        series = self._counters.setdefault(name, {})
+        key = tuple(sorted(labels.items()))
+        series[key] = series.get(key, 0.0) + amount
+
+    def observe(self, name: str, value: float, **labels: str) -> None:
+        """Add an observation to histogram `name`."""
+        series = self._histograms.setdefault(name, {})
+        key = tuple(sorted(labels.items()))
+        series.setdefault(key, _Histogram()).observe(value)
+
+    def value(self, name: str, **labels: str) -> float:
+        """Current value of a counter, or observation count of a histogram."""
+        key = tuple(sorted(labels.items()))
+        if name in self._histograms:
+            return float(sum(self._histograms[name][key].counts))
+        return self._counters.get(name, {}).get(key, 0.0)
+
+    def render(self) -> str:
+        """Exposition format of every recorded metric."""
+        lines: List[str] = []
+        for name in sorted(set(self._counters) | set(self._histograms)):
+            kind, doc = METRICS.get(name, ("untyped", ""))
+            lines.append(f"# HELP {name} {doc}")
+            lines.append(f"# TYPE {name} {kind}")
+            for labels, count in sorted(self._counters.get(name, {}).items()):
+                lines.append(f"{name}{_format_labels(labels)} {count:g}")
+            for labels, hist in sorted(self._histograms.get(name, {}).items()):
+                cumulative = 0
+                for bound, count in zip((*_BUCKETS, "+Inf"), hist.counts):
+                    cumulative += count
+                    bucket = _format_labels(labels, f'le="{bound}"')
+                    lines.append(f"{name}_bucket{bucket} {cumulative}")
+                lines.append(f"{name}_sum{_format_labels(labels)} {hist.total:g}")
+                lines.append(f"{name}_count{_format_labels(labels)} {cumulative}")
+        return "\n".join(lines) + "\n"
+
+    def write_textfile(self, path: pathlib.Path) -> None:
+        """Atomically write the metrics for the node exporter textfile collector."""
+        tmp = path.with_name(f".{path.name}.{uuid.uuid4().hex}")
+        tmp.write_text(self.render(), encoding="utf-8")
+        os.replace(tmp, path)
+
+    async def serve(
+        self, host: str = "127.0.0.1", port: int = 9464
+    ) -> asyncio.AbstractServer:
+        """Serve the metrics over HTTP on `/metrics`."""
+
+        async def _handle(
+            reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+        ) -> None:
+            request = await reader.readline()
+            while (await reader.readline()).strip():
+                pass
+            parts = request.split()
+            if len(parts) > 1 and parts[1] == b"/metrics":
+                body = self.render().encode("utf-8")
+                status = b"200 OK"
+            else:
+                body, status = b"Not Found\n", b"404 Not Found"
+            writer.write(
+                b"HTTP/1.1 " + status + b"\r\n"
+                b"Content-Type: text/plain; version=0.0.4\r\n"
+                b"Content-Length: " + str(len(body)).encode() + b"\r\n"
+                b"Connection: close\r\n\r\n" + body
+            )
+            await writer.drain()
+            writer.close()
+
+        return await asyncio.start_server(_handle, host, port)
+
+
+_registry: Optional[Registry] = None
+
+
+def enable(registry: Optional[Registry] = None) -> Registry:
+    """Start recording into `registry`, a new one if not given."""
+    global _registry  # pylint: disable=global-statement,invalid-name
+    _registry = registry or Registry()
+    return _registry
+
+
+def disable() -> None:
+    """Stop recording metrics."""
+    global _registry  # pylint: disable=global-statement,invalid-name
+    _registry = None
+
+
+def enabled() -> bool:
+    """Whether metrics are being recorded."""
+    return _registry is not None
+
+
+def inc(name: str, amount: float = 1.0, **labels: str) -> None:
+    """Increase a counter if metrics are enabled."""
+    if _registry is not None:
+        _registry.inc(name, amount, **labels)
+
+
+def timer(name: str, **labels: str) -> ContextManager[None]:
+    """Observe the duration of the enclosed block if metrics are enabled."""
+    if _registry is None:
+        return _NULL_TIMER
+    return _timer(_registry, name, labels)
+
+
+@contextmanager
+def _timer(registry: Registry, name: str, labels: Dict[str, str]) -> Iterator[None]:
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        registry.observe(name, time.perf_counter() - start, **labels)
@@ -0,0 +1,132 @@
+import asyncio
+import time
+from collections.abc import Coroutine
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Any, Awaitable, Generator, Iterator, List, TypeVar
+
+_T = TypeVar("_T")
+
+_label: "ContextVar[str]" = ContextVar("vspy_monitor_label", default="")
+_active: "ContextVar[bool]" = ContextVar("vspy_monitor_active", default=False)
+
+
+@contextmanager
+def labelled(label: str) -> Iterator[None]:
+    """Attribute slow steps of the current task to `label` while monitored."""
+    if not _active.get():
+        yield
+        return
+    token = _label.set(label)
+    try:
+        yield
+    finally:
+        _label.reset(token)
+
+
+@dataclass
+class SlowStep:
+    """A single step of a task that held the event loop for too long."""
+
+    coroutine: str
+    label: str
+    duration: float
+
+
+class _TimedCoroutine(Coroutine):
+    """Wraps a task's coroutine to time every step the loop runs it for."""
+
+    def __init__(self, coro: Any, monitor: "LoopMonitor") -> None:
+        self._coro = coro
+        self._monitor = monitor
+        self._name: str = getattr(coro, "__qualname__", repr(coro))
+
+    def send(self, value: Any) -> Any:
+        label, start = _label.get(), time.perf_counter()
+        try:
+            return self._coro.send(value)
+        finally:
+            duration = time.perf_counter() - start
+            self._monitor.record(self._name, _label.get() or label, duration)
+
+    def throw(self, *args: Any) -> Any:
+        label, start = _label.get(), time.perf_counter()
+        try:
+            return self._coro.throw(*args)
+        finally:
+            duration = time.perf_counter() - start
+            self._monitor.record(self._name, _label.get() or label, duration)
+
+    def close(self) -> None:
+        self._coro.close()
+
+    def __await__(self) -> Generator[Any, None, Any]:
+        return self._coro.__await__()  # type: ignore
+
+
+class LoopMonitor:
+    """Opt-in diagnostic of event-loop health.
+
+    Lag is measured by a heartbeat that sleeps for `interval` and records how
+    late it wakes up. Every task created while monitoring has each step timed;
+    steps longer than `slow_threshold` are kept with the coroutine and the
+    label (see `labelled`) they ran under, pointing at blocking calls.
+    """
+
+    def __init__(self, interval: float = 0.005, slow_threshold: float = 0.01) -> None:
+        self._interval = interval
+        self._slow_threshold = slow_threshold
+        self.lags: List[float] = []
+        self.slow_steps: List[SlowStep] = []
+        self.steps = 0
+
+    async def run(self, awaitable: Awaitable[_T]) -> _T:
+        """Await `awaitable` in a monitored task."""
+        loop = asyncio.get_running_loop()
+        heartbeat = asyncio.ensure_future(self._heartbeat(), loop=loop)
+        previous_factory = loop.get_task_factory()
+        loop.set_task_factory(self._task_factory)
+        token = _active.set(True)
+        try:
+            return await asyncio.ensure_future(awaitable, loop=loop)
+        finally:
+            heartbeat.cancel()
+            _active.reset(token)
+            loop.set_task_factory(previous_factory)
+
+    def record(self, coroutine: str, label: str, duration: float) -> None:
+        """Record a step of `coroutine` that took `duration` seconds."""
+        self.steps += 1
+        if duration >= self._slow_threshold:
+            self.slow_steps.append(SlowStep(coroutine, label, duration))
+
+    def report(self) -> str:
+        """Lag statistics followed by the slowest steps."""
+        max_lag = max(self.lags, default=0.0)
+        mean_lag = sum(self.lags) / len(self.lags) if self.lags else 0.0
+        rows = [
+            f"loop lag: mean {mean_lag * 1e3:.2f} ms, max {max_lag * 1e3:.2f} ms "
+            f"over {len(self.lags)} samples",
+            f"slow steps: {len(self.slow_steps)} of {self.steps} "
+            f"(>= {self._slow_threshold * 1e3:.1f} ms)",
+        ]
+        for step in sorted(self.slow_steps, key=lambda s: s.duration, reverse=True):
+            rows.append(
+                f"{step.duration * 1e3:>10.2f} ms  {step.coroutine}"
+                + (f"  [{step.label}]" if step.label else "")
+            )
+        return "\n".join(rows)
+
+    def _task_factory(
+        self, loop: asyncio.AbstractEventLoop, coro: Any, **kwargs: Any
+    ) -> "asyncio.Task[Any]":
+        if isinstance(coro, _TimedCoroutine):
+            return asyncio.Task(coro, loop=loop, **kwargs)
+        return asyncio.Task(_TimedCoroutine(coro, self), loop=loop, **kwargs)
+
+    async def _heartbeat(self) -> None:
+        while True:
+            start = time.perf_counter()
+            await asyncio.sleep(self._interval)
+            self.lags.append(max(0.0, time.perf_counter() - start - self._interval))
@@ -0,0 +1,139 @@
+import re
+from typing import TYPE_CHECKING, Dict, List, Optional, Sequence, Tuple
+
+from jinja2 import TemplateNotFound, TemplateSyntaxError, nodes
+
+from vspy.core import precompiled
+from vspy.core.file_io import FileWriteJob, read_file, template_from_string
+from vspy.core.loader import referenced, template_inputs
+
+if TYPE_CHECKING:
+    from vspy.core.type_hints import TemplateArgs
+
+_SALTS = ("a", "bb")
+
+_env = precompiled.environment()
+
+
+def _sentinel(salt: str, index: int) -> str:
+    return f"\x00{salt}{index}\x00"
+
+
+class ResidualTemplate:
+    """What is left of a template once the shared context is substituted.
+
+    Rendering it only splices the per project fields between literal chunks.
+    """
+
+    def __init__(self, chunks: Sequence[Tuple[str, Optional[str]]]) -> None:
+        self._chunks = chunks
+
+    @property
+    def chunks(self) -> Sequence[Tuple[str, Optional[str]]]:
+        """Literal text, each followed by the field substituted after it."""
+        return self._chunks
+
+    def render(self, args: "TemplateArgs") -> str:
+        """Substitute the per project fields."""
+        return "".join(
+            literal if field is None else literal + str(args[field])
+            for literal, field in self._chunks
+        )
+
+
+def _shared_only(name: Optional[str], fields: Sequence[str]) -> bool:
+    """Whether the template `name` and all it uses read none of the fields."""
+    if name is None:
+        return False
+    try:
+        inputs = template_inputs(_env, name)
+    except (TemplateNotFound, TemplateSyntaxError):
+        return False
+    return inputs is not None and not set(inputs).intersection(fields)
+
+
+def _fields_only_output(source: str, fields: Sequence[str]) -> bool:
+    tree = _env.parse(source)
+    if not all(_shared_only(name, fields) for name in referenced(tree)):
+        return False
+    outputs = {
+        id(node)
+        for output in tree.find_all(nodes.Output)
+        for node in output.nodes
+        if isinstance(node, nodes.Name)
+    }
+    return all(
+        id(node) in outputs for node in tree.find_all(nodes.Name) if node.name in fields
+    )
+
+
+async def partially_evaluate(
+    source: str, shared: "TemplateArgs", fields: Sequence[str]
+) -> Optional[ResidualTemplate]:
+    """Evaluate `source` against the `shared` context only.
+
+    Templates using a field anywhere but directly in `{{ field }}`, or using
+    another template that reads a field, can not be split and give `None`, so
+    the caller can render them in full. Otherwise every field is replaced by
+    a sentinel, twice with different sentinels, and both renders must split
+    into identical chunks around the sentinels.
+    """
+    if not _fields_only_output(source, fields):
+        return None
+    splits: List[List[str]] = []
+    for salt in _SALTS:
+        sentinels = {field: _sentinel(salt, i) for i, field in enumerate(fields)}
+        txt = await template_from_string(source, {**shared, **sentinels})
+        parts: List[str] = re.split(f"\x00{salt}(\\d+)\x00", txt)
+        splits.append(parts)
+    if splits[0] != splits[1] or any("\x00" in part for part in splits[0]):
+        return None
+    parts = splits[0]
+    chunks: List[Tuple[str, Optional[str]]] = [
+        (parts[i], fields[int(parts[i + 1])]) for i in range(0, len(parts) - 1, 2)
+    ]
+    chunks.append((parts[-1], None))
+    return ResidualTemplate(chunks)
+
+
+class PartialRenderer:
+    """Render jobs of many projects sharing one context.
+
+    Sources are read, and templates partially evaluated, once per renderer,
+    leaving only the per project `fields` to substitute for each project.
+    Fan-out jobs are rendered in full from the compiled template.
+    """
+
+    def __init__(self, shared: "TemplateArgs", fields: Sequence[str]) -> None:
+        self._shared = shared
+        self._fields = fields
+        self._sources: Dict[str, str] = {}
+        self._residuals: Dict[str, Optional[ResidualTemplate]] = {}
+
+    async def render(self, job: FileWriteJob, args: "TemplateArgs") -> str:
+        """Content of the job's output for a project with `args`."""
+        txt = await self._source(job)
+        if not job.is_template:
+            return txt
+        residual = None if job.variables else await self.residual(job)
+        if residual is None:
+            return await template_from_string(txt, args)
+        return residual.render(args)
+
+    async def residual(self, job: FileWriteJob) -> Optional[ResidualTemplate]:
+        """The job's template evaluated against the shared context.
+
+        `None` when it has to be rendered in full, see `partially_evaluate`.
+        """
+        key = job.source.as_posix()
+        if key not in self._residuals:
+            self._residuals[key] = await partially_evaluate(
+                await self._source(job), self._shared, self._fields
+            )
+        return self._residuals[key]
+
+    async def _source(self, job: FileWriteJob) -> str:
+        key = job.source.as_posix()
+        if key not in self._sources:
+            self._sources[key] = await read_file(job.source)
+        return self._sources[key]
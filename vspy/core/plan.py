@@ -0,0 +1,302 @@
+import asyncio
+import fnmatch
+import hashlib
+import json
+import marshal
+import pathlib
+import sys
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from vspy import __version__
+from vspy.core.discovery import discover
+from vspy.core.file_io import template_from_string
+from vspy.core.partial import ResidualTemplate, partially_evaluate
+from vspy.core.resources import path_from_root, read_bytes
+from vspy.core.table import JobTable
+from vspy.core.utils import read_cached, write_cached
+
+if TYPE_CHECKING:
+    from vspy.core.type_hints import JobVariables, TemplateArgs
+
+_PLAN_VERSION = 3
+
+_JOB_SCHEMA = {"src": str, "dst": str, "is_template": bool, "path_is_template": bool}
+
+_TREE_SCHEMA = {"src": str, "dst": str, "path_is_template": bool}
+
+_PATH_FIELDS = ("name",)
+
+_plans: Dict[str, "JobPlan"] = {}
+
+Chunks = Tuple[Tuple[str, Optional[str]], ...]
+
+
+def validate_config(data: Any) -> None:
+    """Raise a `ValueError` on the first violation of the config schema."""
+    if not isinstance(data, dict):
+        raise ValueError("Config must be an object")
+    dev = data.get("dev-dependencies")
+    if not isinstance(dev, list) or not all(isinstance(dep, str) for dep in dev):
+        raise ValueError("Config 'dev-dependencies' must be a list of strings")
+    jobs = data.get("jobs")
+    if not isinstance(jobs, list):
+        raise ValueError("Config 'jobs' must be a list")
+    for i, job in enumerate(jobs):
+        if not isinstance(job, dict):
+            raise ValueError(f"Config job {i} must be an object")
+        for key, kind in _JOB_SCHEMA.items():
+            if not isinstance(job.get(key), kind):
+                raise ValueError(f"Config job {i} needs '{key}' of {kind.__name__}")
+        if "fan_out" in job:
+            _validate_fan_out(i, job)
+    trees = data.get("trees", [])
+    if not isinstance(trees, list):
+        raise ValueError("Config 'trees' must be a list")
+    for i, tree in enumerate(trees):
+        _validate_tree(i, tree)
+
+
+def _validate_fan_out(i: int, job: Dict[str, Any]) -> None:
+    fan_out = job["fan_out"]
+    if not isinstance(fan_out, dict) or not isinstance(fan_out.get("over"), str):
+        raise ValueError(f"Config job {i} needs 'fan_out' with 'over' of str")
+    variable = fan_out.get("as")
+    if not isinstance(variable, str) or not variable.isidentifier():
+        raise ValueError(f"Config job {i} needs 'fan_out' with 'as' of identifier")
+    if not job["path_is_template"]:
+        raise ValueError(f"Config job {i} fans out so 'path_is_template' must be set")
+
+
+def _validate_tree(i: int, tree: Any) -> None:
+    if not isinstance(tree, dict):
+        raise ValueError(f"Config tree {i} must be an object")
+    for key, kind in _TREE_SCHEMA.items():
+        if not isinstance(tree.get(key), kind):
+            raise ValueError(f"Config tree {i} needs '{key}' of {kind.__name__}")
+    if not isinstance(tree.get("template_suffix", ""), str):
+        raise ValueError(f"Config tree {i} needs 'template_suffix' of str")
+    globs = tree.get("templates", [])
+    if not isinstance(globs, list) or not all(isinstance(glob, str) for glob in globs):
+        raise ValueError(f"Config tree {i} needs 'templates' of a list of strings")
+
+
+async def _split_dst(
+    dst: str, path_is_template: bool, fields: Tuple[str, ...] = _PATH_FIELDS
+) -> Tuple[Chunks, Optional[str]]:
+    """Chunks of a destination, or its template if it can not be split."""
+    if not path_is_template:
+        return ((dst, None),), None
+    residual = await partially_evaluate(dst, {}, fields)
+    if residual is None:
+        return (), dst
+    return tuple(residual.chunks), None
+
+
+@dataclass(frozen=True)
+class PlannedJob:
+    """A job with its destination split into literal and field chunks.
+
+    A destination template that can not be split is kept in `dst_template`
+    and rendered for each project instead. A job with `fan_out` set to a list
+    argument and a variable name is repeated for every value of the list.
+    """
+
+    src: str
+    is_template: bool
+    dst: Chunks
+    dst_template: Optional[str] = None
+    fan_out: Optional[Tuple[str, str]] = None
+
+    def bindings(self, args: "TemplateArgs") -> List[Optional["JobVariables"]]:
+        """Variables of each repetition of the job for a project with `args`."""
+        if self.fan_out is None:
+            return [None]
+        over, variable = self.fan_out
+        values = args.get(over)
+        if not isinstance(values, list) or not all(
+            isinstance(value, str) for value in values
+        ):
+            raise ValueError(f"Job {self.src} fans out over '{over}', not a list")
+        return [{variable: value} for value in values]
+
+
+@dataclass(frozen=True)
+class PlannedTree:
+    """A directory tree of sources mirrored into a destination folder.
+
+    Files ending with `template_suffix`, stripped from their destination, or
+    matching one of the `template_globs` are templates, the rest are copied.
+    Paths inside the tree are literal, only `dst` itself can hold fields.
+    """
+
+    src: str
+    dst: Chunks
+    dst_template: Optional[str] = None
+    template_suffix: str = ""
+    template_globs: Tuple[str, ...] = ()
+
+    def jobs(self, files: Iterable[str]) -> Iterator[PlannedJob]:
+        """A job for each of the `files` of the tree, relative to its root."""
+        prefix = self.dst_template
+        if prefix is None:
+            prefix = self.dst[-1][0]
+        sep = "/" if prefix or self.dst[:-1] else ""
+        for rel in files:
+            out, is_template = rel, False
+            if self.template_suffix and rel.endswith(self.template_suffix):
+                end = len(rel) - len(self.template_suffix)
+                out, is_template = rel[:end], True
+            elif any(fnmatch.fnmatchcase(rel, glob) for glob in self.template_globs):
+                is_template = True
+            src = f"{self.src}/{rel}"
+            if self.dst_template is not None:
+                yield PlannedJob(src, is_template, (), f"{prefix}{sep}{out}")
+            else:
+                dst = (*self.dst[:-1], (f"{prefix}{sep}{out}", None))
+                yield PlannedJob(src, is_template, dst)
+
+
+@dataclass(frozen=True)
+class JobPlan:
+    """Everything in a config that does not depend on the project.
+
+    The `trees` are listed into jobs by `load_plan`, as their files can change
+    without the config changing, their sources are then kept in `listed`.
+    """
+
+    dev_dependencies: Tuple[str, ...]
+    jobs: Tuple[PlannedJob, ...]
+    trees: Tuple[PlannedTree, ...] = ()
+    listed: Tuple[str, ...] = ()
+
+    @classmethod
+    async def from_config(cls, data: Any) -> "JobPlan":
+        """Validate a parsed config and resolve its jobs."""
+        validate_config(data)
+        jobs = []
+        for job in data["jobs"]:
+            fan_out = None
+            if "fan_out" in job:
+                fan_out = (job["fan_out"]["over"], job["fan_out"]["as"])
+            fields = _PATH_FIELDS if fan_out is None else (*_PATH_FIELDS, fan_out[1])
+            dst, dst_template = await _split_dst(
+                job["dst"], job["path_is_template"], fields
+            )
+            jobs.append(
+                PlannedJob(job["src"], job["is_template"], dst, dst_template, fan_out)
+            )
+        trees = []
+        for tree in data.get("trees", []):
+            dst, dst_template = await _split_dst(
+                tree["dst"].rstrip("/"), tree["path_is_template"]
+            )
+            trees.append(
+                PlannedTree(
+                    tree["src"].rstrip("/"),
+                    dst,
+                    dst_template,
+                    tree.get("template_suffix", ""),
+                    tuple(tree.get("templates", [])),
+                )
+            )
+        return cls(tuple(data["dev-dependencies"]), tuple(jobs), tuple(trees))
+
+    def dumps(self) -> bytes:
+        """Compact serialization, only readable by the same python version."""
+        jobs = [
+            (job.src, job.is_template, job.dst, job.dst_template, job.fan_out)
+            for job in self.jobs
+        ]
+        trees = [
+            (
+                tree.src,
+                tree.dst,
+                tree.dst_template,
+                tree.template_suffix,
+                tree.template_globs,
+            )
+            for tree in self.trees
+        ]
+        return marshal.dumps((_PLAN_VERSION, self.dev_dependencies, jobs, trees))
+
+    @classmethod
+    def loads(cls, data: bytes) -> "JobPlan":
+        """Deserialize a plan written by `dumps`."""
+        version, dev, jobs, trees = marshal.loads(data)
+        if version != _PLAN_VERSION:
+            raise ValueError("Unsupported plan version")
+        return cls(
+            tuple(dev),
+            tuple(PlannedJob(*job) for job in jobs),
+            tuple(PlannedTree(*tree) for tree in trees),
+        )
+
+    async def with_trees(self, cache_dir: Optional[pathlib.Path] = None) -> "JobPlan":
+        """The plan with the files of its trees listed as jobs after the others.
+
+        Trees are indexed in `cache_dir` if given, see `discovery.discover`.
+        """
+        if not self.trees:
+            return self
+        jobs = list(self.jobs)
+        for tree in self.trees:
+            files = await discover(path_from_root(tree.src), cache_dir)
+            jobs.extend(tree.jobs(files))
+        listed = tuple(tree.src for tree in self.trees)
+        return JobPlan(self.dev_dependencies, tuple(jobs), listed=listed)
+
+    async def bind(self, args: "TemplateArgs") -> JobTable:
+        """Resolve the jobs of a project, destinations relative to its root.
+
+        Fan-out jobs are expanded in place, so the jobs sharing a template
+        stay next to each other and are rendered in the same batch.
+        """
+        table = JobTable()
+        for job in self.jobs:
+            residual = ResidualTemplate(job.dst)
+            for variables in job.bindings(args):
+                dst_args = args if variables is None else {**args, **variables}
+                if job.dst_template is not None:
+                    dst = await template_from_string(job.dst_template, dst_args)
+                else:
+                    dst = residual.render(dst_args)
+                table.append(job.src, dst, job.is_template, variables)
+        return table
+
+
+def _plan_key(content: bytes) -> str:
+    digest = hashlib.sha256(
+        f"{_PLAN_VERSION}\x00{__version__}\x00{sys.version_info[:2]}\x00".encode()
+    )
+    digest.update(content)
+    return digest.hexdigest()
+
+
+async def load_plan(
+    config: pathlib.Path, cache_dir: Optional[pathlib.Path] = None
+) -> JobPlan:
+    """The job plan of `config`, validated and resolved once per content.
+
+    Plans are kept for the life of the process and, with a `cache_dir`, on
+    disk keyed by a digest of the config. Their trees are listed on every
+    call, from an index that is only rebuilt when a directory changes.
+    """
+    content = read_bytes(config)
+    key = _plan_key(content)
+    plan = _plans.get(key)
+    if plan is None and cache_dir is not None:
+        plan = read_cached(cache_dir.joinpath(f"{key}.plan"), JobPlan.loads)
+    if plan is None:
+        plan = await JobPlan.from_config(json.loads(content))
+        if cache_dir is not None:
+            await asyncio.get_running_loop().run_in_executor(
+                None, write_cached, cache_dir.joinpath(f"{key}.plan"), plan.dumps()
+            )
+    _plans[key] = plan
+    return await plan.with_trees(cache_dir)
+
+
+def clear() -> None:
+    """Forget the plans kept in memory."""
+    _plans.clear()
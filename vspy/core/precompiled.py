@@ -0,0 +1,86 @@
+import hashlib
+import importlib
+import json
+import pathlib
+from typing import Iterable, List, Optional
+
+import jinja2
+from jinja2 import Environment, Template
+
+from vspy.core.loader import PackLoader, fragment
+
+PACKAGE = "vspy._compiled"
+
+
+def environment() -> Environment:
+    """The environment templates are rendered, and so compiled, with.
+
+    Templates can include and import others of the pack, see `PackLoader`,
+    and call `fragment` to render a memoised block.
+    """
+    env = Environment(
+        loader=PackLoader(), enable_async=True, keep_trailing_newline=True
+    )
+    env.globals["fragment"] = fragment
+    return env
+
+
+def module_name(source: str) -> str:
+    """Name of the module holding `source` compiled by the installed jinja2.
+
+    The name is a digest of both, so an edited template or a jinja2 upgrade
+    simply misses and falls back to compiling from source.
+    """
+    key = f"{jinja2.__version__}\x00{source}".encode("utf-8")
+    return f"t_{hashlib.sha1(key).hexdigest()}"
+
+
+def load(env: Environment, source: str) -> Optional[Template]:
+    """The precompiled template for `source`, if there is one."""
+    try:
+        module = importlib.import_module(f"{PACKAGE}.{module_name(source)}")
+    except ImportError:
+        return None
+    return env.template_class.from_module_dict(
+        env, module.__dict__, env.make_globals(None)
+    )
+
+
+def write(
+    env: Environment, sources: Iterable[str], directory: pathlib.Path
+) -> List[pathlib.Path]:
+    """Compile `sources` into modules of a `vspy._compiled` package at `directory`.
+
+    `env` must be configured like the one rendering the templates at runtime.
+    """
+    directory.mkdir(parents=True, exist_ok=True)
+    directory.joinpath("__init__.py").touch()
+    modules = []
+    for source in sources:
+        module = directory.joinpath(f"{module_name(source)}.py")
+        module.write_text(
+            env.compile(source, raw=True, defer_init=True), encoding="utf-8"
+        )
+        modules.append(module)
+    for stale in set(directory.glob("t_*.py")).difference(modules):
+        stale.unlink()
+    return modules
+
+
+def pack_sources(root: pathlib.Path, config: pathlib.Path) -> List[str]:
+    """Every template of the pack in `config`, sources and templated paths."""
+    jobs = json.loads(config.read_text(encoding="utf-8"))["jobs"]
+    sources = {
+        root.joinpath(job["src"]).read_text(encoding="utf-8")
+        for job in jobs
+        if job["is_template"]
+    }
+    sources.update(job["dst"] for job in jobs if job["path_is_template"])
+    return sorted(sources)
+
+
+def compile_pack(
+    root: pathlib.Path, config: pathlib.Path, directory: pathlib.Path
+) -> List[pathlib.Path]:
+    """Compile the pack in `config`, whose sources are relative to `root`."""
+    return write(environment(), pack_sources(root, config), directory)
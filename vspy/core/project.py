@@ -1,44 +1,111 @@
 import pathlib
-from typing import TYPE_CHECKING, Dict, Iterable, List, Tuple, Union
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Dict, Iterable, List, Optional, Tuple, Union
 
-from vspy.core.args import Arguments
-from vspy.core.clients import fetch_all_requests_data
-from vspy.core.file_io import FileWriteJob, process_file_write_jobs
+from vspy.core import metrics
+from vspy.core.args import Arguments, ProjectSpec
+from vspy.core.context import RenderContext
+from vspy.core.file_io import FileWriteJob
+from vspy.core.table import JobTable
 
 if TYPE_CHECKING:
+    from vspy.core.clients import AsyncClient
     from vspy.core.type_hints import TemplateArgs
 
 
 class Project:
     """The project creation class."""
 
-    def __init__(self, args: Arguments) -> None:
-        self._args: "TemplateArgs" = self._args_from_input(args)
-        self._target_root = pathlib.Path(args.target)
+    def __init__(
+        self,
+        args: Union[Arguments, ProjectSpec],
+        client: Optional["AsyncClient"] = None,
+    ) -> None:
+        spec = args.spec if isinstance(args, Arguments) else args
+        self._args: "TemplateArgs" = self._args_from_input(spec)
+        self._client = client
+
+    @property
+    def template_args(self) -> "TemplateArgs":
+        """A copy of the current template arguments."""
+        return dict(self._args)
 
     async def create_project(self, template_jobs: Iterable[FileWriteJob]) -> None:
         """Create template project."""
-        await process_file_write_jobs(*template_jobs, args=self._args)
+        jobs = JobTable(
+            (
+                job.source.as_posix(),
+                job.destination.as_posix(),
+                job.is_template,
+                job.variables,
+            )
+            for job in template_jobs
+        )
+        # Destinations are complete paths, they ignore the target joined to.
+        await self.render_context(jobs).render(pathlib.Path())
+
+    def render_context(self, template_jobs: "JobTable") -> RenderContext:
+        """Capture the current template arguments and jobs for replaying."""
+        return RenderContext(dict(self._args), template_jobs)
+
+    async def set_versions(
+        self,
+        dev_dependencies: List[str],
+        context: Optional["VersionContext"] = None,
+    ) -> None:
+        """Get versions for dev dependencies and python interpreters.
 
-    async def set_versions(self, dev_dependencies: List[str]) -> None:
-        """Get versions for dev dependencies and python interpreters."""
-        dev_packages, py_versions = await fetch_all_requests_data(dev_dependencies)
-        py_versions.sort(key=Project._version_comparator)
-        self._args["py_versions"] = py_versions
-        self._args["dependencies"] = dev_packages
+        Nothing is fetched if a pre-resolved `context` is given.
+        """
+        if context is None:
+            context = await VersionContext.resolve(dev_dependencies, self._client)
+            metrics.inc("vspy_version_contexts_total", origin="fetched")
+        else:
+            metrics.inc("vspy_version_contexts_total", origin="provided")
+        self._args.update(context.template_args())
 
     def _args_from_input(
-        self, args: Arguments
+        self, spec: ProjectSpec
     ) -> Dict[str, Union[str, List[str], Dict[str, str]]]:
         return {
-            "author": args.author,
-            "description": args.description,
-            "email": args.email,
-            "keywords": args.keywords,
-            "name": args.name,
-            "repository": args.repository,
+            "author": spec.author,
+            "description": spec.description,
+            "email": spec.email,
+            "keywords": spec.keywords,
+            "name": spec.name,
+            "packages": list(spec.packages),
+            "repository": spec.repository,
         }
 
+
+@dataclass(frozen=True)
+class VersionContext:
+    """Versions of dev dependencies and python interpreters for a project."""
+
+    dependencies: Dict[str, str]
+    py_versions: List[str]
+
+    @classmethod
+    async def resolve(
+        cls, packages: Iterable[str], client: Optional["AsyncClient"] = None
+    ) -> "VersionContext":
+        """Fetch the latest versions of `packages` and active python versions."""
+        # httpx and bs4 are only needed when versions are actually fetched.
+        from vspy.core.clients import (  # pylint: disable=import-outside-toplevel
+            fetch_all_requests_data,
+        )
+
+        dependencies, py_versions = await fetch_all_requests_data(packages, client)
+        py_versions.sort(key=cls._version_comparator)
+        return cls(dependencies, py_versions)
+
     @staticmethod
     def _version_comparator(version: str) -> Tuple[int, ...]:
         return tuple(map(int, version.split(".")))
+
+    def template_args(self) -> "TemplateArgs":
+        """Template arguments shared by every project using this context."""
+        return {
+            "py_versions": list(self.py_versions),
+            "dependencies": dict(self.dependencies),
+        }
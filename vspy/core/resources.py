@@ -0,0 +1,39 @@
+import importlib.resources
+import pathlib
+import pkgutil
+import sys
+from typing import Optional
+
+_ROOT_DIR = pathlib.Path(__file__).parent.parent.parent
+
+_PACKAGE_DIR = _ROOT_DIR.joinpath("vspy")
+
+# Within a zipapp the package files are members of the archive, not files.
+_ZIPPED = not _PACKAGE_DIR.is_dir()
+
+
+def read_packaged(file: pathlib.Path) -> Optional[bytes]:
+    """Content of a file shipped within a vspy zipapp, `None` otherwise."""
+    if not _ZIPPED:
+        return None
+    try:
+        name = file.relative_to(_PACKAGE_DIR).as_posix()
+    except ValueError:
+        return None
+    if sys.version_info >= (3, 9):
+        return importlib.resources.files("vspy").joinpath(name).read_bytes()
+    data = pkgutil.get_data("vspy", name)
+    if data is None:
+        raise FileNotFoundError(file)
+    return data
+
+
+def read_bytes(file: pathlib.Path) -> bytes:
+    """Synchronous binary file reading."""
+    data = read_packaged(file)
+    return file.read_bytes() if data is None else data
+
+
+def path_from_root(*args: str) -> pathlib.Path:
+    """Get file relative to project root."""
+    return _ROOT_DIR.joinpath(*args)
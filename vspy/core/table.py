@@ -0,0 +1,176 @@
+import pathlib
+from array import array
+from typing import (
+    TYPE_CHECKING,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+    overload,
+)
+
+from vspy.core.file_io import FileWriteJob
+from vspy.core.resources import path_from_root
+
+if TYPE_CHECKING:
+    from vspy.core.type_hints import JobJson, JobVariables
+
+_IS_TEMPLATE = 1
+
+Row = Tuple[str, str, bool, Optional["JobVariables"]]
+
+
+class JobTable(Sequence["JobJson"]):  # pylint: disable=too-many-instance-attributes
+    """Columnar table of jobs, sources and destinations as posix strings.
+
+    Paths are stored as runs of ids into a table of interned segments and the
+    flags as bytes, so a pack of 100k jobs costs a few arrays rather than two
+    `Path` objects and a dict per job. The variables of fan-out jobs are
+    interned as well, one id per job with 0 for none. Indexing gives the json
+    form of a job, `rows` and `write_jobs` are the fast ways to iterate.
+    """
+
+    __slots__ = (
+        "_segments",
+        "_segment_ids",
+        "_parts",
+        "_offsets",
+        "_flags",
+        "_variables",
+        "_variable_ids",
+        "_bindings",
+    )
+
+    def __init__(self, rows: Iterable[Row] = ()) -> None:
+        self._segments: List[str] = []
+        self._segment_ids: Dict[str, int] = {}
+        self._parts = array("I")
+        self._offsets = array("I", [0])
+        self._flags = array("B")
+        self._variables: List[Optional["JobVariables"]] = [None]
+        self._variable_ids: Dict[Tuple[Tuple[str, str], ...], int] = {}
+        self._bindings = array("I")
+        for src, dst, is_template, variables in rows:
+            self.append(src, dst, is_template, variables)
+
+    @classmethod
+    def from_json(cls, jobs: Iterable["JobJson"]) -> "JobTable":
+        """Table of jobs in the json form of a render context."""
+        if isinstance(jobs, JobTable):
+            return jobs
+        table = cls()
+        for job in jobs:
+            variables = job.get("variables")
+            table.append(
+                str(job["src"]),
+                str(job["dst"]),
+                bool(job["is_template"]),
+                dict(variables) if isinstance(variables, dict) else None,
+            )
+        return table
+
+    def append(
+        self,
+        src: str,
+        dst: str,
+        is_template: bool,
+        variables: Optional["JobVariables"] = None,
+    ) -> None:
+        """Add a job, rendered with `variables` on top of the project's."""
+        for path in (src, dst):
+            for segment in path.split("/"):
+                segment_id = self._segment_ids.get(segment)
+                if segment_id is None:
+                    segment_id = self._segment_ids[segment] = len(self._segments)
+                    self._segments.append(segment)
+                self._parts.append(segment_id)
+            self._offsets.append(len(self._parts))
+        self._flags.append(_IS_TEMPLATE if is_template else 0)
+        self._bindings.append(self._variable_id(variables) if variables else 0)
+
+    def rows(self) -> Iterator[Row]:
+        """Source, destination, template flag and variables of every job."""
+        for i, flags in enumerate(self._flags):
+            yield (
+                self._path(2 * i),
+                self._path(2 * i + 1),
+                bool(flags & _IS_TEMPLATE),
+                self._variables[self._bindings[i]],
+            )
+
+    def write_jobs(self, target: pathlib.Path) -> Iterator[FileWriteJob]:
+        """Jobs bound to `target`, created one at a time as they are consumed."""
+        for src, dst, is_template, variables in self.rows():
+            yield FileWriteJob(
+                path_from_root(src), target.joinpath(dst), is_template, variables
+            )
+
+    def destinations(self, target: pathlib.Path) -> Iterator[pathlib.Path]:
+        """Output file of every job in `target`."""
+        return (target.joinpath(row[1]) for row in self.rows())
+
+    def __len__(self) -> int:
+        return len(self._flags)
+
+    @overload
+    def __getitem__(self, index: int) -> "JobJson":
+        ...
+
+    @overload
+    def __getitem__(self, index: slice) -> List["JobJson"]:
+        ...
+
+    def __getitem__(
+        self, index: Union[int, slice]
+    ) -> Union["JobJson", List["JobJson"]]:
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("job index out of range")
+        return _json(
+            self._path(2 * index),
+            self._path(2 * index + 1),
+            bool(self._flags[index] & _IS_TEMPLATE),
+            self._variables[self._bindings[index]],
+        )
+
+    def __iter__(self) -> Iterator["JobJson"]:
+        for row in self.rows():
+            yield _json(*row)
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, JobTable):
+            return list(self.rows()) == list(other.rows())
+        if isinstance(other, list):
+            return list(self) == other
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return f"JobTable({len(self)} jobs)"
+
+    def _path(self, run: int) -> str:
+        start, end = self._offsets[run], self._offsets[run + 1]
+        return "/".join([self._segments[j] for j in self._parts[start:end]])
+
+    def _variable_id(self, variables: "JobVariables") -> int:
+        key = tuple(sorted(variables.items()))
+        variable_id = self._variable_ids.get(key)
+        if variable_id is None:
+            variable_id = self._variable_ids[key] = len(self._variables)
+            self._variables.append(dict(key))
+        return variable_id
+
+
+def _json(
+    src: str, dst: str, is_template: bool, variables: Optional["JobVariables"]
+) -> "JobJson":
+    job: "JobJson" = {"src": src, "dst": dst, "is_template": is_template}
+    if variables:
+        job["variables"] = dict(variables)
+    return job
@@ -0,0 +1,111 @@
+import asyncio
+import json
+import os
+import pathlib
+import time
+from contextlib import contextmanager, nullcontext
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import ContextManager, Dict, Iterator, List, Optional
+
+_NULL_SPAN: ContextManager[None] = nullcontext()
+
+_current: "ContextVar[Optional[Tracer]]" = ContextVar("vspy_tracer", default=None)
+
+
+@dataclass
+class Span:
+    """A finished, timed section of a run."""
+
+    name: str
+    start: float
+    duration: float
+    lane: int
+    args: Dict[str, str] = field(default_factory=dict)
+
+
+class Tracer:
+    """Collects spans of a run for a chrome trace and a summary table."""
+
+    def __init__(self) -> None:
+        self._origin = time.perf_counter()
+        self._lanes: Dict[int, int] = {}
+        self.spans: List[Span] = []
+
+    @contextmanager
+    def span(self, name: str, **args: str) -> Iterator[None]:
+        """Time the enclosed block."""
+        lane = self._lane()
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            end = time.perf_counter()
+            self.spans.append(Span(name, start - self._origin, end - start, lane, args))
+
+    def chrome_trace(self) -> Dict[str, List[Dict[str, object]]]:
+        """Spans in the Chrome trace event format, also read by Perfetto."""
+        pid = os.getpid()
+        return {
+            "traceEvents": [
+                {
+                    "name": recorded.name,
+                    "cat": recorded.name.split(".", 1)[0],
+                    "ph": "X",
+                    "ts": round(recorded.start * 1e6, 3),
+                    "dur": round(recorded.duration * 1e6, 3),
+                    "pid": pid,
+                    "tid": recorded.lane,
+                    "args": recorded.args,
+                }
+                for recorded in sorted(self.spans, key=lambda recorded: recorded.start)
+            ]
+        }
+
+    def write(self, path: pathlib.Path) -> None:
+        """Write the chrome trace to `path`."""
+        path.write_text(json.dumps(self.chrome_trace()), encoding="utf-8")
+
+    def summary(self) -> str:
+        """Table of count, total, mean and max duration per span name."""
+        groups: Dict[str, List[float]] = {}
+        for recorded in self.spans:
+            groups.setdefault(recorded.name, []).append(recorded.duration)
+        rows = [
+            f"{'span':<20} {'count':>6} {'total ms':>10} {'mean ms':>10} "
+            f"{'max ms':>10}"
+        ]
+        for name, durations in sorted(
+            groups.items(), key=lambda item: sum(item[1]), reverse=True
+        ):
+            total = sum(durations)
+            rows.append(
+                f"{name:<20} {len(durations):>6} {total * 1e3:>10.2f} "
+                f"{total / len(durations) * 1e3:>10.2f} {max(durations) * 1e3:>10.2f}"
+            )
+        return "\n".join(rows)
+
+    def _lane(self) -> int:
+        try:
+            task: Optional[asyncio.Task] = asyncio.current_task()
+        except RuntimeError:
+            task = None
+        return self._lanes.setdefault(id(task), len(self._lanes))
+
+
+def span(name: str, **args: str) -> ContextManager[None]:
+    """Time the enclosed block if a tracer is active, otherwise do nothing."""
+    tracer = _current.get()
+    if tracer is None:
+        return _NULL_SPAN
+    return tracer.span(name, **args)
+
+
+@contextmanager
+def tracing(tracer: Optional[Tracer]) -> Iterator[Optional[Tracer]]:
+    """Activate `tracer` for the enclosed block and tasks created within it."""
+    token = _current.set(tracer)
+    try:
+        yield tracer
+    finally:
+        _current.reset(token)
@@ -1,10 +1,10 @@
 from asyncio.proactor_events import _ProactorBasePipeTransport, _WarnCallbackProtocol
-from typing import TYPE_CHECKING, Callable, Dict, Iterable, List, Tuple, Union
+from typing import TYPE_CHECKING, Callable, Dict, List, Tuple, Union
 
 from mypy_extensions import DefaultArg
 
 if TYPE_CHECKING:
-    from vspy.core.file_io import FileWriteJob
+    from vspy.core.table import JobTable
 
 ProactorDelType = Callable[
     [_ProactorBasePipeTransport, DefaultArg(_WarnCallbackProtocol)], None
@@ -17,6 +17,8 @@ ArgMap = Dict[str, Union[str, bool]]
 
 WarnCallback = _WarnCallbackProtocol
 
-ConfigData = Tuple[List[str], Iterable["FileWriteJob"]]
+ConfigData = Tuple[List[str], "JobTable"]
 
-JobJson = Dict[str, Union[str, bool]]
+JobVariables = Dict[str, str]
+
+JobJson = Dict[str, Union[str, bool, JobVariables]]
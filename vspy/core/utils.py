@@ -1,17 +1,22 @@
 import os
 import pathlib
 import shutil
+import uuid
 import warnings
-from asyncio.proactor_events import _ProactorBasePipeTransport
 from functools import wraps
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Callable, Optional, TypeVar
 
 if TYPE_CHECKING:
     from vspy.core.type_hints import ProactorDelType, WarnCallback
 
+_T = TypeVar("_T")
+
 
 def silence_event_loop_closed() -> None:
     """Silence the `Event loop is closed` bug."""
+    from asyncio.proactor_events import (  # pylint: disable=import-outside-toplevel
+        _ProactorBasePipeTransport,
+    )
 
     def _do_nothing(_self: _ProactorBasePipeTransport) -> None:
         pass
@@ -50,6 +55,14 @@ def is_empty_folder(path: str) -> bool:
         return not any(iterator)
 
 
+def mtime_ns(path: pathlib.Path) -> int:
+    """Modification time of `path` in nanoseconds, -1 if it can not be stat'ed."""
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return -1
+
+
 def clean_dir(path: pathlib.Path) -> None:
     """Remove all children of a given directory."""
     for name in path.iterdir():
@@ -57,3 +70,19 @@ def clean_dir(path: pathlib.Path) -> None:
             shutil.rmtree(name.as_posix())
         else:
             name.unlink()
+
+
+def read_cached(file: pathlib.Path, loads: Callable[[bytes], _T]) -> Optional[_T]:
+    """`loads` of a cache file, `None` if it is missing or unreadable."""
+    try:
+        return loads(file.read_bytes())
+    except (OSError, ValueError, EOFError, TypeError):
+        return None
+
+
+def write_cached(file: pathlib.Path, data: bytes) -> None:
+    """Replace a cache file with `data` atomically, concurrent readers included."""
+    file.parent.mkdir(parents=True, exist_ok=True)
+    tmp = file.with_name(f".{file.name}.{uuid.uuid4().hex}")
+    tmp.write_bytes(data)
+    os.replace(tmp, file)
@@ -0,0 +1,167 @@
+import asyncio
+import pathlib
+import time
+from typing import TYPE_CHECKING, Dict, Iterable, List, Optional, Set, Tuple
+
+from vspy.core import discovery, loader
+from vspy.core.args import ProjectSpec
+from vspy.core.file_io import FileWriteJob, process_file_write_stream
+from vspy.core.plan import load_plan
+from vspy.core.project import Project, VersionContext
+from vspy.core.resources import path_from_root
+from vspy.core.trace import span
+from vspy.core.utils import is_empty_folder, mtime_ns
+
+if TYPE_CHECKING:
+    from vspy.core.clients import AsyncClient
+    from vspy.core.type_hints import TemplateArgs
+
+
+async def template_dependencies(source: pathlib.Path) -> Set[pathlib.Path]:
+    """Templates included, imported or rendered as fragments by `source`.
+
+    Followed recursively, see `loader.dependencies`.
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(None, loader.dependencies, source)
+
+
+class Watcher:  # pylint: disable=too-many-instance-attributes
+    """Keep a target in sync with the template pack while it is edited.
+
+    Every output is rendered once, after which the config, the sources and
+    the templates they include are polled, and only the outputs depending on
+    a changed file are rendered again. The directories of the config's trees
+    are polled too, listing the trees again once a file is added or removed.
+    Outputs dropped from the config are removed. Versions are only resolved
+    again when the dev dependencies of the config change, or never if a
+    `context` is given. The target must be empty or missing unless `force`
+    is set, as its files are overwritten and removed.
+    """
+
+    def __init__(
+        self,
+        spec: ProjectSpec,
+        config_path: pathlib.Path,
+        *,
+        context: Optional[VersionContext] = None,
+        client: Optional["AsyncClient"] = None,
+        interval: float = 0.1,
+        force: bool = False,
+    ) -> None:
+        self._spec = spec
+        self._config = config_path
+        self._fixed_context = context
+        self._client = client
+        self._interval = interval
+        self._force = force
+        self._target = pathlib.Path(spec.target)
+        self._context = context
+        self._dev: Optional[Tuple[str, ...]] = None
+        self._args: "TemplateArgs" = {}
+        self._jobs: Dict[pathlib.Path, FileWriteJob] = {}
+        self._includes: Dict[pathlib.Path, Set[pathlib.Path]] = {}
+        self._dependents: Dict[pathlib.Path, Set[pathlib.Path]] = {}
+        self._mtimes: Dict[pathlib.Path, int] = {}
+        self._tree_dirs: Set[pathlib.Path] = set()
+
+    async def start(self) -> List[pathlib.Path]:
+        """Render every output of the config into the target."""
+        if not self._force and self._target.exists():
+            if not is_empty_folder(str(self._target)):
+                raise ValueError(f"Target {self._target} is not an empty folder")
+        self._mtimes[self._config] = mtime_ns(self._config)
+        await self._reload()
+        return await self._render(self._jobs)
+
+    async def update(self) -> List[pathlib.Path]:
+        """Render the outputs affected by the files changed since last call."""
+        changed = set()
+        for path, mtime in self._mtimes.items():
+            current = mtime_ns(path)
+            if current != mtime:
+                self._mtimes[path] = current
+                changed.add(path)
+        if not changed:
+            return []
+        with span("watch.update", files=str(len(changed))):
+            stale = {
+                source
+                for source, includes in self._includes.items()
+                if source in changed or not includes.isdisjoint(changed)
+            }
+            dirty = set().union(*(self._dependents.get(path, ()) for path in changed))
+            if self._config in changed or not changed.isdisjoint(self._tree_dirs):
+                dirty.update(await self._reload())
+            await self._track(stale)
+            return await self._render(dirty)
+
+    async def run(self, stop: Optional[asyncio.Event] = None) -> None:
+        """Render everything, then keep the target updated until `stop` is set."""
+        print(f"Rendered {len(await self.start())} files into {self._target}")
+        while stop is None or not stop.is_set():
+            await asyncio.sleep(self._interval)
+            start = time.perf_counter()
+            try:
+                updated = await self.update()
+            except Exception as exc:  # pylint: disable=broad-except
+                print(f"Update failed: {exc}")
+                continue
+            if updated:
+                elapsed = (time.perf_counter() - start) * 1e3
+                print(f"Updated {len(updated)} files in {elapsed:.1f} ms")
+
+    async def _reload(self) -> Set[pathlib.Path]:
+        """Bind the config again, giving the outputs whose job changed."""
+        plan = await load_plan(self._config)
+        if self._fixed_context is None and plan.dev_dependencies != self._dev:
+            self._context = await VersionContext.resolve(
+                plan.dev_dependencies, self._client
+            )
+        self._dev = plan.dev_dependencies
+        self._tree_dirs = set()
+        for tree in plan.listed:
+            self._tree_dirs.update(await discovery.directories(path_from_root(tree)))
+        project = Project(self._spec, self._client)
+        table = await plan.bind(project.template_args)
+        await project.set_versions(list(plan.dev_dependencies), self._context)
+        args = project.template_args
+        jobs = {job.destination: job for job in table.write_jobs(self._target)}
+        for dropped in self._jobs.keys() - jobs.keys():
+            try:
+                dropped.unlink()
+            except FileNotFoundError:
+                pass
+        dirty = {
+            dst
+            for dst, job in jobs.items()
+            if args != self._args or self._jobs.get(dst) != job
+        }
+        self._args, self._jobs = args, jobs
+        await self._track(
+            job.source
+            for job in jobs.values()
+            if job.is_template and job.source not in self._includes
+        )
+        return dirty
+
+    async def _track(self, sources: Iterable[pathlib.Path]) -> None:
+        """Rescan the includes of `sources` and map every file to its outputs."""
+        for source in set(sources):
+            self._includes[source] = await template_dependencies(source)
+        self._dependents = {}
+        for job in self._jobs.values():
+            self._dependents.setdefault(job.source, set()).add(job.destination)
+            if job.is_template:
+                for include in self._includes.get(job.source, ()):
+                    self._dependents.setdefault(include, set()).add(job.destination)
+        watched = (self._config, *self._dependents, *self._tree_dirs)
+        self._mtimes = {
+            path: self._mtimes[path] if path in self._mtimes else mtime_ns(path)
+            for path in watched
+        }
+
+    async def _render(self, destinations: Iterable[pathlib.Path]) -> List[pathlib.Path]:
+        jobs = [self._jobs[dst] for dst in sorted(destinations) if dst in self._jobs]
+        await process_file_write_stream(jobs, args=self._args)
+        return [job.destination for job in jobs]
@@ -0,0 +1,276 @@
+import asyncio
+import ctypes
+import os
+import pathlib
+import queue
+import sys
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Set, Tuple, Type
+
+import aiofiles
+
+_FLAGS = os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, "O_BINARY", 0)
+
+DURABILITY = ("none", "batch", "file")
+
+_current: "ContextVar[Optional[Writer]]" = ContextVar("vspy_writer", default=None)
+
+
+def _encode(content: str) -> bytes:
+    """Bytes of `content` as text mode would write them on this platform."""
+    if os.linesep != "\n":
+        content = content.replace("\n", os.linesep)
+    return content.encode("utf-8")
+
+
+def _write(file: pathlib.Path, data: bytes, fsync: bool = False) -> None:
+    descriptor = os.open(file, _FLAGS, 0o666)
+    try:
+        view = memoryview(data)
+        while view:
+            written = os.write(descriptor, view)
+            view = view[written:]
+        if fsync:
+            os.fsync(descriptor)
+    finally:
+        os.close(descriptor)
+
+
+def fsync_path(path: pathlib.Path) -> None:
+    """Flush the file or directory at `path` to disk."""
+    descriptor = os.open(path, os.O_RDONLY)
+    try:
+        os.fsync(descriptor)
+    finally:
+        os.close(descriptor)
+
+
+def _fsync_files(files: Iterable[pathlib.Path]) -> None:
+    for file in files:
+        fsync_path(file)
+
+
+def _libc_syncfs() -> Optional[Callable[[int], int]]:
+    if not sys.platform.startswith("linux"):
+        return None
+    try:
+        syncfs: Callable[[int], int] = ctypes.CDLL(None, use_errno=True).syncfs
+    except (OSError, AttributeError):
+        return None
+    return syncfs
+
+
+def _syncfs(directories: Iterable[pathlib.Path]) -> bool:
+    """Flush each filesystem holding one of `directories` in a single call."""
+    syncfs = _libc_syncfs()
+    if syncfs is None:
+        return False
+    devices: Set[int] = set()
+    for directory in directories:
+        if directory.stat().st_dev in devices:
+            continue
+        descriptor = os.open(directory, os.O_RDONLY)
+        try:
+            if syncfs(descriptor) != 0:
+                errno = ctypes.get_errno()
+                raise OSError(errno, os.strerror(errno), str(directory))
+            devices.add(os.fstat(descriptor).st_dev)
+        finally:
+            os.close(descriptor)
+    return True
+
+
+class Writer:
+    """How rendered files are written, one of `WRITERS`.
+
+    With `durability` "file" every file is fsynced as it is written, with
+    "batch" everything written is flushed at once when the writer is
+    closed, with a syncfs per filesystem where there is one. Either way the
+    directories holding the files are fsynced on close, so the tree is on
+    disk once `close` returns.
+    """
+
+    # Whether `write` puts files where they are named, needing their folders.
+    on_disk = True
+
+    def __init__(self, durability: str = "none") -> None:
+        if durability not in DURABILITY:
+            raise ValueError(f"Unknown durability {durability}")
+        self._durability = durability
+        self._written: Set[pathlib.Path] = set()
+
+    async def write(self, file: pathlib.Path, content: str) -> None:
+        """Write `content` to `file` as utf-8 text."""
+        await self._write(file, content, self._durability == "file")
+        if self._durability != "none":
+            self._written.add(file)
+
+    async def track(self, files: Iterable[pathlib.Path]) -> None:
+        """Persist `files` placed by other means as if this writer wrote them."""
+        if self._durability == "none":
+            return
+        files = list(files)
+        if self._durability == "file":
+            loop = asyncio.get_running_loop()
+            await loop.run_in_executor(None, _fsync_files, files)
+        self._written.update(files)
+
+    def close(self) -> None:
+        """Release anything held by the writer, then persist what it wrote."""
+        self._release()
+        if self._written:
+            self.sync()
+
+    def discard(self) -> None:
+        """Release anything held by the writer, after a failed run."""
+        self._release()
+        self._written = set()
+
+    def sync(self) -> None:
+        """Persist every file written so far according to the durability."""
+        written, self._written = self._written, set()
+        directories = {file.parent for file in written}
+        if self._durability == "batch" and not _syncfs(directories):
+            for file in written:
+                fsync_path(file)
+        if os.name != "nt":  # directories can not be opened on windows
+            for directory in directories:
+                fsync_path(directory)
+
+    async def _write(self, file: pathlib.Path, content: str, fsync: bool) -> None:
+        raise NotImplementedError
+
+    def _release(self) -> None:
+        pass
+
+
+class AiofilesWriter(Writer):
+    """Each file written through aiofiles on the default executor."""
+
+    async def _write(self, file: pathlib.Path, content: str, fsync: bool) -> None:
+        async with aiofiles.open(file.as_posix(), "w", encoding="utf-8") as file_ctx:
+            await file_ctx.write(content)
+            if fsync:
+                await file_ctx.flush()
+                await asyncio.get_running_loop().run_in_executor(
+                    None, os.fsync, file_ctx.fileno()
+                )
+
+
+class SyncWriter(Writer):
+    """Files written within the event loop, cheapest for small files."""
+
+    async def _write(self, file: pathlib.Path, content: str, fsync: bool) -> None:
+        _write(file, _encode(content), fsync)
+
+
+_Item = Tuple[pathlib.Path, bytes, bool, "asyncio.Future[None]"]
+
+
+class ThreadWriter(Writer):
+    """Files written by one dedicated thread draining a queue.
+
+    The thread takes every queued file at once and resolves all of their
+    futures with a single call into the loop, so a batch of files costs one
+    round-trip instead of an open, write and close hop each.
+    """
+
+    def __init__(self, durability: str = "none") -> None:
+        super().__init__(durability)
+        self._queue: "queue.SimpleQueue[Optional[_Item]]" = queue.SimpleQueue()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    async def _write(self, file: pathlib.Path, content: str, fsync: bool) -> None:
+        future = asyncio.get_running_loop().create_future()
+        self._start()
+        self._queue.put((file, _encode(content), fsync, future))
+        await future
+
+    def _release(self) -> None:
+        with self._lock:
+            if self._thread is None:
+                return
+            self._queue.put(None)
+            self._thread.join()
+            self._thread = None
+
+    def _start(self) -> None:
+        if self._thread is None or not self._thread.is_alive():
+            with self._lock:
+                if self._thread is None or not self._thread.is_alive():
+                    self._thread = threading.Thread(
+                        target=self._drain, name="vspy-writer", daemon=True
+                    )
+                    self._thread.start()
+
+    def _drain(self) -> None:
+        while True:
+            batch = [self._queue.get()]
+            while not self._queue.empty():
+                batch.append(self._queue.get())
+            items = [item for item in batch if item is not None]
+            results: List[Tuple["asyncio.Future[None]", Optional[BaseException]]] = []
+            for file, data, fsync, future in items:
+                try:
+                    _write(file, data, fsync)
+                    results.append((future, None))
+                except Exception as exc:  # pylint: disable=broad-except
+                    results.append((future, exc))
+            loops: Dict[asyncio.AbstractEventLoop, list] = {}
+            for future, error in results:
+                loops.setdefault(future.get_loop(), []).append((future, error))
+            for loop, done in loops.items():
+                try:
+                    loop.call_soon_threadsafe(_resolve, done)
+                except RuntimeError:  # the loop is closed, nobody is waiting
+                    pass
+            if len(items) < len(batch):
+                return
+
+
+def _resolve(
+    done: List[Tuple["asyncio.Future[None]", Optional[BaseException]]]
+) -> None:
+    for future, exc in done:
+        if future.cancelled():
+            continue
+        if exc is None:
+            future.set_result(None)
+        else:
+            future.set_exception(exc)
+
+
+WRITERS: Dict[str, Type[Writer]] = {
+    "aiofiles": AiofilesWriter,
+    "thread": ThreadWriter,
+    "sync": SyncWriter,
+}
+
+_DEFAULT = AiofilesWriter()
+
+
+def current() -> Writer:
+    """The writer of the enclosing `writing` block, aiofiles by default."""
+    return _current.get() or _DEFAULT
+
+
+@contextmanager
+def writing(writer: Optional[Writer]) -> Iterator[Optional[Writer]]:
+    """Write files with `writer` in the enclosed block and tasks created in it.
+
+    The writer is closed on exit, or discarded if the block raised.
+    """
+    token = _current.set(writer)
+    try:
+        yield writer
+    except BaseException:
+        _current.reset(token)
+        if writer is not None:
+            writer.discard()
+        raise
+    _current.reset(token)
+    if writer is not None:
+        writer.close()
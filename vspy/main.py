@@ -1,25 +1,204 @@
-import asyncio
+import argparse
+import os
+import pathlib
+import sys
+from typing import TYPE_CHECKING, Any, Coroutine, List, Optional, TextIO
 
-from vspy.core import App
 from vspy.core.args import Arguments
-from vspy.core.file_io import path_from_root
-from vspy.core.utils import is_empty_folder, is_windows, silence_event_loop_closed
+from vspy.core.utils import (
+    clean_dir,
+    is_empty_folder,
+    is_windows,
+    silence_event_loop_closed,
+)
+
+if TYPE_CHECKING:
+    from vspy.core.monitor import LoopMonitor
+    from vspy.core.trace import Tracer
+    from vspy.core.writers import Writer
+
+# The generation modules are imported within the functions using them, only
+# once the arguments are known to be valid, keeping `--help` and input errors
+# fast. `tests/test_main.py` holds the import time budget.
+# pylint: disable=import-outside-toplevel
+
+
+def _optional_path(path: Optional[str]) -> Optional[pathlib.Path]:
+    return pathlib.Path(path) if path else None
+
+
+def _generation(args: Arguments) -> Coroutine[Any, Any, object]:
+    from vspy.core.api import default_config_path, replay
+    from vspy.core.app import App
+    from vspy.core.cache import TreeCache
+    from vspy.core.dedup import BlobStore
+
+    target = pathlib.Path(args.target)
+    cache_dir = _optional_path(args.cache_dir)
+    cache = TreeCache(cache_dir, args.cache_hardlink) if cache_dir else None
+    dedup_dir = _optional_path(args.dedup_dir)
+    store = BlobStore(dedup_dir, args.dedup_mode) if dedup_dir else None
+    context = _optional_path(args.context)
+    if context is not None:
+        return replay(context, target, cache, store)
+    app = App(
+        args,
+        default_config_path(),
+        emit_context=_optional_path(args.emit_context),
+        cache=cache,
+        store=store,
+        plan_dir=cache_dir.joinpath("plans") if cache_dir else None,
+    )
+    return app.start()
+
+
+def _monitor(args: Arguments) -> Optional["LoopMonitor"]:
+    if not args.monitor_loop:
+        return None
+    from vspy.core.monitor import LoopMonitor
+
+    return LoopMonitor()
+
+
+def _tracer(args: Arguments) -> Optional["Tracer"]:
+    if not args.debug and not args.profile:
+        return None
+    from vspy.core.trace import Tracer
+
+    return Tracer()
+
+
+def _writer(args: Arguments) -> "Writer":
+    if args.output_format == "dir":
+        from vspy.core.writers import WRITERS
+
+        return WRITERS[args.write_backend](args.durability)
+    from vspy.core.archive import ArchiveWriter
+
+    return ArchiveWriter(
+        pathlib.Path(args.target), args.target, args.output_format, args.durability
+    )
+
+
+def _check_target(args: Arguments) -> Optional[str]:
+    """Why generating to the target of `args` is refused, if it is."""
+    if args.output_format == "dir":
+        if not is_empty_folder(args.target):
+            return "Target is either not a folder or nonempty."
+        if (args.cache_dir or args.dedup_dir) and args.write_backend != "aiofiles":
+            return "Outputs of a cache or dedup store are not written by a backend."
+        return None
+    if args.cache_dir or args.dedup_dir:
+        return "Archives can not be generated through a cache or dedup store."
+    from vspy.core.archive import unavailable
+
+    return unavailable(args.output_format)
+
+
+def compile_templates(argv: List[str]) -> None:
+    """Precompile the template pack, `vspy compile [--output DIR]`."""
+    from vspy.core import precompiled
+    from vspy.core.api import default_config_path
+    from vspy.core.resources import path_from_root
+
+    parser = argparse.ArgumentParser(
+        prog="vspy compile", description="Precompile the packaged templates."
+    )
+    parser.add_argument(
+        "-o",
+        "--output",
+        default=path_from_root(*precompiled.PACKAGE.split(".")).as_posix(),
+        help="Folder of the compiled package, defaults to within vspy.",
+    )
+    args = parser.parse_args(argv)
+    modules = precompiled.compile_pack(
+        path_from_root(), default_config_path(), pathlib.Path(args.output)
+    )
+    print(f"Compiled {len(modules)} templates into {args.output}")
+
+
+def watch(argv: List[str]) -> None:
+    """Keep a target in sync with the template pack, `vspy watch [options]`.
+
+    Takes the options of a generation along with `--interval`, the seconds
+    between checks for changed files, and `--force` to watch a nonempty
+    target, whose files may then be overwritten or removed.
+    """
+    import asyncio
+
+    from vspy.core.api import default_config_path
+    from vspy.core.watch import Watcher
+    from vspy.core.writers import writing
+
+    parser = argparse.ArgumentParser(prog="vspy watch", add_help=False)
+    parser.add_argument("--interval", type=float, default=0.1)
+    parser.add_argument("--force", action="store_true")
+    known, rest = parser.parse_known_args(argv)
+    args = Arguments.parse(rest)
+    if args.output_format != "dir":
+        print("Only a folder can be kept in sync.")
+        return
+    if not known.force and os.path.exists(args.target):
+        if not is_empty_folder(args.target):
+            print("Target is either not a folder or nonempty, see --force.")
+            return
+    if is_windows():
+        silence_event_loop_closed()
+    watcher = Watcher(
+        args.spec, default_config_path(), interval=known.interval, force=known.force
+    )
+    try:
+        with writing(_writer(args)):
+            asyncio.run(watcher.run())
+    except KeyboardInterrupt:
+        print("Stopped watching")
 
 
 def main() -> None:
     """Starting point."""
+    if sys.argv[1:2] == ["compile"]:
+        compile_templates(sys.argv[2:])
+        return
+    if sys.argv[1:2] == ["watch"]:
+        watch(sys.argv[2:])
+        return
     args = Arguments.parse()
-    if not is_empty_folder(args.target):
-        print("Target is either not a folder or nonempty.")
+    refused = _check_target(args)
+    if refused is not None:
+        print(refused)
         return
+    import asyncio
+
+    from vspy.core import metrics
+    from vspy.core.trace import tracing
+    from vspy.core.writers import writing
+
     if is_windows():
         silence_event_loop_closed()
-    app = App(args, path_from_root("vspy", "resources", "data.json"))
+    run = _generation(args)
+    monitor = _monitor(args)
+    if monitor is not None:
+        run = monitor.run(run)
+    tracer = _tracer(args)
+    metrics_file = _optional_path(args.metrics_textfile)
+    registry = metrics.enable() if metrics_file else None
+    # An archive streamed to stdout must not be mixed with the reports.
+    out: TextIO = sys.stderr if args.target == "-" else sys.stdout
     try:
-        asyncio.run(app.start())
+        with tracing(tracer), writing(_writer(args)):
+            asyncio.run(run)
     except KeyboardInterrupt:
-        print("Cancelled")
-        app.cleanup()
+        print("Cancelled", file=out)
+        if args.output_format == "dir":
+            clean_dir(pathlib.Path(args.target))
+    if registry is not None and metrics_file is not None:
+        registry.write_textfile(metrics_file)
+    if monitor is not None:
+        print(monitor.report(), file=out)
+    if tracer is not None:
+        print(tracer.summary(), file=out)
+        if args.profile:
+            tracer.write(pathlib.Path(args.profile))
 
 
 if __name__ == "__main__":